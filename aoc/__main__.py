@@ -0,0 +1,642 @@
+import argparse
+import ast
+import itertools
+import os
+import sys
+import time
+from pathlib import Path
+
+from aoc import (
+    backend,
+    cache,
+    checkpoint,
+    difftest,
+    history,
+    instrument,
+    output,
+    render,
+    scaling,
+)
+from aoc.batch import format_file_result, run_batch
+from aoc.bench import (
+    BACKEND_SCALES,
+    DEFAULT_SCALES,
+    format_bench_header,
+    format_bench_result,
+    has_backends,
+    run_backend_ladders,
+    run_ladder,
+    write_results,
+)
+from aoc.generators import GENERATORS, generate
+from aoc.history import format_comparisons
+from aoc.instrument import PROFILE_DIR, ProfileSettings, format_phases
+from aoc.memo import format_memo_stats
+from aoc.parallel import run_parallel, save_estimates
+from aoc.runner import (
+    PARTS,
+    PartResult,
+    default_input,
+    discover_days,
+    format_ms,
+    format_results,
+    load_day,
+    parts_of,
+    run_part,
+)
+from aoc.search import format_search_stats
+from aoc.session import session
+
+
+def parse_kwarg(s: str) -> tuple[str, object]:
+    # Solver keyword arguments, e.g. `-k dim=6` or `-k "dim=(7, 11)"`
+    name, sep, value = s.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected name=value, got {s!r}")
+    try:
+        return (name, ast.literal_eval(value))
+    except (ValueError, SyntaxError):
+        return (name, value)
+
+
+def add_selection_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--day", "-d", type=int, help="day to run (default: all)")
+    parser.add_argument(
+        "--part", "-p", type=int, choices=PARTS, help="part to run (default: both)"
+    )
+    parser.add_argument("--input", "-i", help="input file (default: dayN/input.txt)")
+    parser.add_argument(
+        "--kwarg",
+        "-k",
+        type=parse_kwarg,
+        action="append",
+        default=[],
+        help="extra solver keyword argument as name=value",
+    )
+
+
+def selected_jobs(args) -> list[tuple[int, int]]:
+    days = [args.day] if args.day else discover_days()
+    jobs = []
+    for day in days:
+        parts = parts_of(load_day(day))
+        for part in [args.part] if args.part else parts:
+            jobs.append((day, part))
+    return jobs
+
+
+def cmd_run(args) -> int:
+    if args.input and not args.day:
+        print("--input requires --day", file=sys.stderr)
+        return 2
+
+    if args.no_cache:
+        os.environ[cache.ENV_VAR] = "0"
+    if args.quiet:
+        os.environ[output.ENV_VAR] = "1"
+    if args.checkpoint:
+        os.environ[checkpoint.ENV_VAR] = "1"
+
+    profile = ProfileSettings.from_env()
+    if args.profile or args.cprofile or args.tracemalloc:
+        profile = ProfileSettings(args.cprofile, args.tracemalloc or 0)
+
+    jobs = []
+    for day, part in selected_jobs(args):
+        if not args.input and not default_input(day).exists():
+            print(f"day{day}: missing {default_input(day)}, skipping", file=sys.stderr)
+            continue
+        jobs.append((day, part))
+
+    start = time.perf_counter()
+    if args.jobs is not None:
+        results = run_parallel(
+            jobs,
+            args.input,
+            dict(args.kwarg),
+            trace_memory=args.trace_memory,
+            workers=args.jobs if args.jobs > 0 else None,
+            timeout=args.timeout,
+            profile=profile,
+            search_stats=args.search_stats,
+            memo_stats=args.memo_stats,
+            on_result=lambda r: print(
+                f"day{r.day} part{r.part}: "
+                + (r.error or f"{format_ms(r.total.wall)} ms"),
+                file=sys.stderr,
+            ),
+        )
+    else:
+        # Parts of the same day share a session, so steps both need run once. A
+        # failing part is reported like it would be from --jobs, without
+        # losing the parts already run.
+        results = []
+        for day, day_jobs in itertools.groupby(jobs, key=lambda job: job[0]):
+            with session():
+                for _, part in day_jobs:
+                    try:
+                        result = run_part(
+                            day,
+                            part,
+                            args.input,
+                            dict(args.kwarg),
+                            trace_memory=args.trace_memory,
+                            profile=profile,
+                            search_stats=args.search_stats,
+                            memo_stats=args.memo_stats,
+                        )
+                    except Exception as e:
+                        result = PartResult.failed(
+                            day, part, f"{type(e).__name__}: {e}"
+                        )
+                    results.append(result)
+    elapsed = time.perf_counter() - start
+
+    # Only the real inputs say anything about how long a job will take next time
+    if not args.input:
+        save_estimates(results)
+
+    memory_label = "peak traced" if args.trace_memory else "peak rss"
+    print(format_results(results, memory_label))
+    for r in results:
+        if r.phases:
+            top = profile.top_allocations if profile else 0
+            print(f"\nday{r.day} part{r.part} phases:")
+            print(format_phases(r.phases, top))
+        for path in r.profile_files:
+            print(f"  wrote {path}")
+        if r.search_stats:
+            print(f"\nday{r.day} part{r.part} searches:")
+            print(format_search_stats(r.search_stats))
+        if r.memo_stats:
+            print(f"\nday{r.day} part{r.part} memoized:")
+            print(format_memo_stats(r.memo_stats))
+
+    if args.jobs is not None:
+        busy = sum(r.total.wall for r in results)
+        print(f"\n{len(results)} parts in {elapsed:.2f}s wall, {busy:.2f}s of solving")
+    return 1 if any(r.error for r in results) else 0
+
+
+def cmd_batch(args) -> int:
+    module = load_day(args.day)
+    parts = [args.part] if args.part else parts_of(module)
+    width = max(len(str(path)) for path in args.inputs)
+
+    start = time.perf_counter()
+    print(f"{'input':<{width}}  {'part':>4}  {'answer':<20}  {'total ms':>10}")
+    results = run_batch(
+        args.day,
+        args.inputs,
+        parts,
+        dict(args.kwarg),
+        workers=args.jobs or None,
+        on_result=lambda r: print(format_file_result(r, width), flush=True),
+    )
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in results if r.failed)
+    print(
+        f"\n{len(results)} inputs in {elapsed:.2f}s wall"
+        + (f", {failed} with errors" if failed else "")
+    )
+    return 1 if failed else 0
+
+
+def cmd_clear_cache(args) -> int:
+    print(f"removed {cache.clear()} cached inputs from {cache.CACHE_DIR}")
+    print(f"removed {checkpoint.clear()} checkpoints from {checkpoint.CHECKPOINT_DIR}")
+    return 0
+
+
+def parse_scales(s: str) -> list[float]:
+    return [float(scale) for scale in s.split(",")]
+
+
+def cmd_generate(args) -> int:
+    text, kwargs = generate(args.day, args.scale, args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+
+    # Solver arguments that go with this input, in the form `run` accepts
+    if kwargs:
+        flags = " ".join(f'-k "{k}={v!r}"' for k, v in kwargs.items())
+        print(f"solver arguments: {flags}", file=sys.stderr)
+    return 0
+
+
+def cmd_bench_backends(args, jobs: list[tuple[int, int]]) -> int:
+    jobs = [(day, part) for day, part in jobs if has_backends(day, part)]
+    if not jobs:
+        print("no parts with a choice of backend", file=sys.stderr)
+        return 2
+
+    print(f"{format_bench_header()}  backend")
+    thresholds = {}
+    for day, part in jobs:
+        _, threshold = run_backend_ladders(
+            day,
+            part,
+            args.scales or BACKEND_SCALES,
+            seed=args.seed,
+            repeat=args.repeat,
+            timeout=args.timeout,
+            on_result=lambda r, b: print(f"{format_bench_result(r)}  {b}", flush=True),
+        )
+        thresholds[f"{day}-{part}"] = threshold
+
+    print()
+    for key, threshold in thresholds.items():
+        when = "never" if threshold is None else f"from {threshold} bytes"
+        print(f"day {key.replace('-', ' part ')}: numpy {when}")
+
+    backend.save_thresholds(thresholds)
+    print(f"saved to {backend.THRESHOLDS_FILE}")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    days = [args.day] if args.day else sorted(GENERATORS)
+    jobs = [
+        (day, part)
+        for day in days
+        for part in ([args.part] if args.part else parts_of(load_day(day)))
+    ]
+    if args.backends:
+        return cmd_bench_backends(args, jobs)
+
+    print(format_bench_header())
+    results = []
+    for day, part in jobs:
+        results.extend(
+            run_ladder(
+                day,
+                part,
+                args.scales or DEFAULT_SCALES,
+                seed=args.seed,
+                repeat=args.repeat,
+                timeout=args.timeout,
+                on_result=lambda r: print(format_bench_result(r), flush=True),
+            )
+        )
+
+    if args.output:
+        write_results(results, args.output)
+    if not args.no_history:
+        history.record(results, args.history)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    comparisons = history.compare(args.baseline, args.day, args.history)
+    if not comparisons:
+        print(f"nothing to compare in {args.history}", file=sys.stderr)
+        return 0
+
+    min_delta = args.min_delta_ms / 1000
+    print(format_comparisons(comparisons, args.threshold, min_delta))
+
+    regressions = [c for c in comparisons if c.regressed(args.threshold, min_delta)]
+    if regressions:
+        print(
+            f"\n{len(regressions)} of {len(comparisons)} benchmarks regressed "
+            f"(failing, or over {args.threshold:.0%} slower)"
+        )
+    return 1 if regressions else 0
+
+
+def cmd_difftest(args) -> int:
+    cases = difftest.CASES
+    if args.day:
+        cases = [c for c in cases if c.day == args.day]
+    if not cases:
+        print("no differential tests for that day", file=sys.stderr)
+        return 2
+
+    seeds = range(args.seed, args.seed + args.seeds)
+    failed = False
+    print(difftest.format_case_header())
+    for case in cases:
+        result = difftest.run_case(case, seeds, args.scale)
+        print(difftest.format_case_result(result), flush=True)
+        failed = failed or bool(result.mismatches)
+    return 1 if failed else 0
+
+
+def cmd_scaling(args) -> int:
+    days = [args.day] if args.day else sorted(GENERATORS)
+    scales = args.scales or scaling.geometric_ladder(
+        args.start, args.factor, args.steps
+    )
+
+    print(scaling.format_scaling_header())
+    results = []
+    if not args.cases_only:
+        for day in days:
+            for part in [args.part] if args.part else parts_of(load_day(day)):
+                result = scaling.scale_part(
+                    day, part, scales, args.seed, args.repeat, args.timeout
+                )
+                print(scaling.format_scaling(result, args.tolerance), flush=True)
+                results.append(result)
+
+    if args.cases or args.cases_only:
+        for case in difftest.CASES:
+            if args.day and case.day != args.day:
+                continue
+            for result in scaling.scale_case(
+                case, scales, args.seed, args.repeat, args.timeout
+            ):
+                print(scaling.format_scaling(result, args.tolerance), flush=True)
+                results.append(result)
+
+    worse = [r for r in results if r.exceeds(args.tolerance)]
+    if worse:
+        print(
+            f"\n{len(worse)} of {len(results)} solvers grew faster than expected: "
+            + ", ".join(r.name for r in worse)
+        )
+    return 1 if worse else 0
+
+
+def cmd_play(args) -> int:
+    try:
+        render.play(args.recording, args.speed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout.write(render.SHOW_CURSOR + "\n")
+    return 0
+
+
+def add_history_arg(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=history.HISTORY_FILE,
+        help="benchmark history database (default: .cache/bench-history.sqlite)",
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="aoc", description="Advent of Code 2024")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="solve puzzles and report timings")
+    add_selection_args(run)
+    run.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="report peak traced Python allocations per part instead of process RSS "
+        "(slows down solving)",
+    )
+    run.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        nargs="?",
+        const=0,
+        help="run parts concurrently on N worker processes, slowest first "
+        "(default N: one per CPU)",
+    )
+    run.add_argument(
+        "--timeout",
+        type=float,
+        help="with --jobs, seconds before a part is stopped and reported as failed",
+    )
+    run.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"time each solver phase (also on with {instrument.ENV_VAR}=1)",
+    )
+    run.add_argument(
+        "--cprofile",
+        type=Path,
+        nargs="?",
+        const=PROFILE_DIR,
+        metavar="DIR",
+        help="write cProfile stats for each phase to DIR " "(default: .cache/profiles)",
+    )
+    run.add_argument(
+        "--tracemalloc",
+        type=int,
+        nargs="?",
+        const=10,
+        metavar="N",
+        help="show the N allocation sites that grew most in each phase (default: 10)",
+    )
+    run.add_argument(
+        "--search-stats",
+        action="store_true",
+        help="count what each search does: nodes expanded, queue pushes and pops, "
+        "cache hits and misses, largest frontier",
+    )
+    run.add_argument(
+        "--memo-stats",
+        action="store_true",
+        help="report calls, hit rate and size of each memoized function",
+    )
+    run.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="silence diagnostic output from solvers "
+        f"(also on with {output.ENV_VAR}=1)",
+    )
+    run.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="periodically save long searches and resume them where a previous "
+        f"run stopped (also on with {checkpoint.ENV_VAR}=1)",
+    )
+    run.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="parse inputs from scratch instead of using the parse cache",
+    )
+    run.set_defaults(func=cmd_run)
+
+    batch = commands.add_parser(
+        "batch", help="solve one day for many input files, streaming results"
+    )
+    batch.add_argument("--day", "-d", type=int, required=True)
+    batch.add_argument(
+        "--part", "-p", type=int, choices=PARTS, help="part to run (default: both)"
+    )
+    batch.add_argument("inputs", type=Path, nargs="+", metavar="INPUT")
+    batch.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=0,
+        help="worker processes, 1 to solve in this process (default: one per CPU)",
+    )
+    batch.add_argument(
+        "--kwarg",
+        "-k",
+        type=parse_kwarg,
+        action="append",
+        default=[],
+        help="extra solver keyword argument as name=value",
+    )
+    batch.set_defaults(func=cmd_batch)
+
+    clear = commands.add_parser(
+        "clear-cache", help="delete cached parsed inputs and search checkpoints"
+    )
+    clear.set_defaults(func=cmd_clear_cache)
+
+    gen = commands.add_parser("generate", help="write a synthetic puzzle input")
+    gen.add_argument("--day", "-d", type=int, required=True)
+    gen.add_argument(
+        "--scale", "-s", type=float, default=1.0, help="multiple of puzzle size"
+    )
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--output", "-o", help="output file (default: stdout)")
+    gen.set_defaults(func=cmd_generate)
+
+    bench = commands.add_parser(
+        "bench", help="time solvers over a ladder of synthetic input sizes"
+    )
+    bench.add_argument("--day", "-d", type=int, help="day to run (default: all)")
+    bench.add_argument(
+        "--part", "-p", type=int, choices=PARTS, help="part to run (default: both)"
+    )
+    bench.add_argument(
+        "--scales",
+        type=parse_scales,
+        help="comma-separated multiples of puzzle size "
+        f"(default: {','.join(f'{s:g}' for s in DEFAULT_SCALES)}, or "
+        f"{','.join(f'{s:g}' for s in BACKEND_SCALES)} with --backends)",
+    )
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--repeat", "-r", type=int, default=1)
+    bench.add_argument(
+        "--timeout",
+        type=float,
+        default=10.0,
+        help="seconds before a run is stopped, which also ends its ladder",
+    )
+    bench.add_argument("--output", "-o", help="write results as JSON")
+    bench.add_argument(
+        "--backends",
+        action="store_true",
+        help="time each backend of the parts that have a choice, and save the input "
+        "sizes from which numpy wins as the thresholds for backend=auto",
+    )
+    bench.add_argument(
+        "--no-history", action="store_true", help="don't record results in history"
+    )
+    add_history_arg(bench)
+    bench.set_defaults(func=cmd_bench)
+
+    compare = commands.add_parser(
+        "compare",
+        help="compare the latest benchmarks with a baseline and flag regressions",
+    )
+    compare.add_argument("--day", "-d", type=int, help="day to compare (default: all)")
+    compare.add_argument(
+        "--baseline",
+        "-b",
+        metavar="REV",
+        help="compare against the latest runs at this commit (default: each "
+        "benchmark's previous run)",
+    )
+    compare.add_argument(
+        "--threshold",
+        "-t",
+        type=float,
+        default=0.2,
+        help="fraction slower than the baseline that counts as a regression "
+        "(default: 0.2)",
+    )
+    compare.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=1.0,
+        help="ignore slowdowns smaller than this many milliseconds (default: 1)",
+    )
+    add_history_arg(compare)
+    compare.set_defaults(func=cmd_compare)
+
+    diff = commands.add_parser(
+        "difftest",
+        help="check optimized solvers against their reference implementations",
+    )
+    diff.add_argument("--day", "-d", type=int, help="day to test (default: all)")
+    diff.add_argument(
+        "--scale",
+        "-s",
+        type=float,
+        help="input size as a multiple of puzzle size (default: per case)",
+    )
+    diff.add_argument(
+        "--seeds", type=int, default=5, help="random inputs per case (default: 5)"
+    )
+    diff.add_argument("--seed", type=int, default=0, help="first seed (default: 0)")
+    diff.set_defaults(func=cmd_difftest)
+
+    scale = commands.add_parser(
+        "scaling",
+        help="fit how solve time grows with input size and flag solvers that grow "
+        "faster than expected",
+    )
+    scale.add_argument("--day", "-d", type=int, help="day to run (default: all)")
+    scale.add_argument(
+        "--part", "-p", type=int, choices=PARTS, help="part to run (default: both)"
+    )
+    scale.add_argument(
+        "--start", type=float, default=0.25, help="smallest scale (default: 0.25)"
+    )
+    scale.add_argument(
+        "--factor", type=float, default=2.0, help="ratio between scales (default: 2)"
+    )
+    scale.add_argument(
+        "--steps", type=int, default=6, help="number of scales (default: 6)"
+    )
+    scale.add_argument(
+        "--scales",
+        type=parse_scales,
+        help="comma-separated scales, in place of --start, --factor and --steps",
+    )
+    scale.add_argument("--seed", type=int, default=0)
+    scale.add_argument("--repeat", "-r", type=int, default=1)
+    scale.add_argument(
+        "--timeout",
+        type=float,
+        default=10.0,
+        help="seconds before a run is stopped, which also ends its ladder",
+    )
+    scale.add_argument(
+        "--tolerance",
+        type=float,
+        default=scaling.DEFAULT_TOLERANCE,
+        help="how far over its expected exponent a solver may grow "
+        f"(default: {scaling.DEFAULT_TOLERANCE:g})",
+    )
+    scale.add_argument(
+        "--cases",
+        action="store_true",
+        help="also fit the reference and optimized functions of the difftest cases",
+    )
+    scale.add_argument(
+        "--cases-only", action="store_true", help="fit only the difftest cases"
+    )
+    scale.set_defaults(func=cmd_scaling)
+
+    play = commands.add_parser("play", help="replay a recorded animation")
+    play.add_argument("recording", type=Path)
+    play.add_argument(
+        "--speed", type=float, default=1.0, help="playback speed (default: 1)"
+    )
+    play.set_defaults(func=cmd_play)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import json
+import os
+from pathlib import Path
+
+BACKENDS = ("python", "numpy")
+
+THRESHOLDS_FILE = Path(__file__).resolve().parent.parent / ".cache" / "backends.json"
+
+# Input size in bytes from which a part's numpy backend beats its pure Python
+# one, keyed "day-part". Below it, numpy's call overhead costs more than it saves.
+# `python -m aoc bench --backends` measures these on the current machine and saves
+# them to THRESHOLDS_FILE, which takes precedence. None means numpy never won,
+# and 0 that it won at every size measured, down to a single line.
+DEFAULT_THRESHOLDS: dict[str, int | None] = {
+    "1-1": 42_000,
+    "1-2": 42_000,
+    "13-1": None,
+    "13-2": 63_000,
+    "14-1": 8_300,
+    "14-2": 0,
+    # Each vectorized step of the 2000 costs the same however few buyers there
+    # are, so the streaming pure Python backend wins on small inputs
+    "22-1": 600,
+    "22-2": 100,
+}
+
+_thresholds: dict[str, int | None] | None = None
+
+
+def thresholds(path: Path = THRESHOLDS_FILE) -> dict[str, int | None]:
+    global _thresholds
+    if _thresholds is None:
+        _thresholds = dict(DEFAULT_THRESHOLDS)
+        try:
+            with open(path, "r") as file:
+                _thresholds.update(json.load(file))
+        except (OSError, ValueError):
+            pass
+    return _thresholds
+
+
+def save_thresholds(measured: dict[str, int | None], path: Path = THRESHOLDS_FILE):
+    global _thresholds
+    saved = {}
+    try:
+        with open(path, "r") as file:
+            saved = json.load(file)
+    except (OSError, ValueError):
+        pass
+    saved.update(measured)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(saved, file, indent=2, sort_keys=True)
+    _thresholds = None
+
+
+def choose(day: int, part: int, f: str, backend: str = "auto") -> str:
+    # The backend a part should run with: the one asked for, or with "auto", numpy
+    # once the input file is at least the part's threshold
+    if backend == "auto":
+        threshold = thresholds().get(f"{day}-{part}")
+        if threshold is None:
+            return "python"
+        return "numpy" if os.path.getsize(f) >= threshold else "python"
+
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown backend {backend!r}, expected auto, {' or '.join(BACKENDS)}"
+        )
+    return backend
@@ -0,0 +1,103 @@
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from aoc import output
+from aoc.parallel import pool_context
+from aoc.runner import PartResult, format_ms, load_day, parts_of, run_part
+from aoc.session import session
+
+
+class FileResult:
+    def __init__(self, path: Path, results: list[PartResult]):
+        self.path = path
+        self.results = results
+
+    @property
+    def failed(self) -> bool:
+        return any(r.error for r in self.results)
+
+
+def solve_file(
+    day: int, path: str, parts: list[int], kwargs: dict[str, Any]
+) -> list[PartResult]:
+    # Both parts of one file share a session. Diagnostics from many files at once
+    # would be unreadable, so they're silenced.
+    results = []
+    with (
+        output.quiet(),
+        open(os.devnull, "w") as devnull,
+        contextlib.redirect_stdout(devnull),
+        session(),
+    ):
+        for part in parts:
+            try:
+                results.append(run_part(day, part, path, kwargs))
+            except Exception as e:
+                results.append(PartResult.failed(day, part, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def run_batch(
+    day: int,
+    paths: list[Path],
+    parts: list[int] | None = None,
+    kwargs: dict[str, Any] | None = None,
+    workers: int | None = None,
+    on_result=None,
+) -> list[FileResult]:
+    # Solve one day for every input file, calling on_result with each file's
+    # results as soon as they're done. workers=1 solves in this process.
+    kwargs = kwargs or {}
+    module = load_day(day)
+    parts = parts or parts_of(module)
+
+    results = []
+
+    def done(result: FileResult):
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    if workers == 1:
+        for path in paths:
+            done(FileResult(path, solve_file(day, str(path), parts, kwargs)))
+        return results
+
+    # Workers are reused across files, so each one only imports the day once even
+    # where fork isn't available
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=pool_context(),
+        initializer=load_day,
+        initargs=(day,),
+    ) as pool:
+        futures = {
+            pool.submit(solve_file, day, str(path), parts, kwargs): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                done(FileResult(path, future.result()))
+            except Exception as e:
+                # The worker itself died, e.g. killed for running out of memory
+                error = f"{type(e).__name__}: {e}"
+                done(
+                    FileResult(path, [PartResult.failed(day, p, error) for p in parts])
+                )
+
+    return results
+
+
+def format_file_result(result: FileResult, path_width: int = 0) -> str:
+    lines = []
+    for r in result.results:
+        answer = f"error: {r.error}" if r.error else str(r.answer)
+        lines.append(
+            f"{str(result.path):<{path_width}}  {r.part:>4}  {answer:<20}  "
+            f"{format_ms(r.total.wall):>10}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,286 @@
+import contextlib
+import inspect
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import tempfile
+from pathlib import Path
+
+from aoc import cache, output
+from aoc.backend import BACKENDS
+from aoc.generators import generate
+from aoc.runner import PARSE_IN_SOLVE, format_memory, format_ms, load_day, run_part
+
+DEFAULT_SCALES = (0.1, 1, 10, 100, 1000)
+
+# Finer and smaller, since the backends usually cross over below a real input's size
+BACKEND_SCALES = (0.01, 0.03, 0.1, 0.3, 1, 3)
+
+
+class BenchResult:
+    def __init__(
+        self,
+        day: int,
+        part: int,
+        scale: float,
+        input_bytes: int,
+        parse_times: list[float],
+        solve_times: list[float],
+        peak_memory: int,
+        error: str | None = None,
+        seed: int = 0,
+        streamed: bool = False,
+    ):
+        self.day = day
+        self.part = part
+        self.scale = scale
+        self.input_bytes = input_bytes
+        self.parse_times = parse_times
+        self.solve_times = solve_times
+        self.peak_memory = peak_memory
+        self.error = error
+        self.seed = seed
+        # Parsing is counted in the solve times, see PartResult.streamed
+        self.streamed = streamed
+
+    @property
+    def total_times(self) -> list[float]:
+        return [p + s for p, s in zip(self.parse_times, self.solve_times)]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.total_times) if self.total_times else 0.0
+
+    @property
+    def p95(self) -> float:
+        # Nearest-rank percentile, so with few repeats it is the slowest run
+        times = sorted(self.total_times)
+        if not times:
+            return 0.0
+        return times[math.ceil(0.95 * len(times)) - 1]
+
+    @property
+    def throughput(self) -> float:
+        # Input bytes processed per second, parse and solve included
+        return self.input_bytes / self.median if self.median > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "day": self.day,
+            "part": self.part,
+            "scale": self.scale,
+            "seed": self.seed,
+            "input_bytes": self.input_bytes,
+            "parse_times": self.parse_times,
+            "streamed": self.streamed,
+            "solve_times": self.solve_times,
+            "median": self.median,
+            "p95": self.p95,
+            "throughput": self.throughput,
+            "peak_memory": self.peak_memory,
+            "error": self.error,
+        }
+
+
+def measure(conn, day: int, part: int, path: str, kwargs: dict):
+    # Repeats would otherwise time loading the parse cache, not parsing
+    os.environ[cache.ENV_VAR] = "0"
+    # Solver diagnostics would drown out the results table, and formatting them
+    # isn't what's being timed
+    os.environ[output.ENV_VAR] = "1"
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = run_part(day, part, path, kwargs)
+        # No parse time at all for a streamed part, rather than a misleading 0
+        parse = None if result.streamed else result.parse.wall
+        conn.send((parse, result.solve.wall, result.peak_memory, None))
+    except Exception as e:
+        conn.send((0.0, 0.0, 0, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_isolated(day: int, part: int, path: str, kwargs: dict, timeout: float):
+    # Each run gets a fresh process so caches don't carry over between runs, peak
+    # RSS belongs to that run alone, and runaway solvers can be killed
+    recv, send = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=measure, args=(send, day, part, path, kwargs)
+    )
+    process.start()
+    send.close()
+
+    try:
+        if not recv.poll(timeout):
+            return (0.0, 0.0, 0, f"timed out after {timeout:g}s")
+        return recv.recv()
+    except EOFError:
+        return (0.0, 0.0, 0, f"worker exited with code {process.exitcode}")
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        recv.close()
+
+
+def bench_part(
+    day: int,
+    part: int,
+    scale: float,
+    seed: int = 0,
+    repeat: int = 1,
+    timeout: float = 10.0,
+    kwargs: dict | None = None,
+) -> BenchResult:
+    text, generated = generate(day, scale, seed)
+    kwargs = {**generated, **(kwargs or {})}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"day{day}-{scale}.txt"
+        path.write_text(text)
+
+        parse_times, solve_times, peak_memory = [], [], 0
+        streamed = False
+        for _ in range(repeat):
+            parse, solve, memory, error = run_isolated(
+                day, part, str(path), kwargs, timeout
+            )
+            if error:
+                return BenchResult(
+                    day,
+                    part,
+                    scale,
+                    len(text),
+                    parse_times,
+                    solve_times,
+                    peak_memory,
+                    error=error,
+                    seed=seed,
+                    streamed=streamed,
+                )
+
+            if parse is None:
+                streamed, parse = True, 0.0
+            parse_times.append(parse)
+            solve_times.append(solve)
+            peak_memory = max(peak_memory, memory)
+
+    return BenchResult(
+        day,
+        part,
+        scale,
+        len(text),
+        parse_times,
+        solve_times,
+        peak_memory,
+        seed=seed,
+        streamed=streamed,
+    )
+
+
+def run_ladder(
+    day: int,
+    part: int,
+    scales=DEFAULT_SCALES,
+    seed: int = 0,
+    repeat: int = 1,
+    timeout: float = 10.0,
+    on_result=None,
+    kwargs: dict | None = None,
+) -> list[BenchResult]:
+    # Climb the ladder until a size fails or times out. Larger sizes would only
+    # take longer.
+    results = []
+    for scale in sorted(scales):
+        result = bench_part(day, part, scale, seed, repeat, timeout, kwargs)
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+        if result.error:
+            break
+
+    return results
+
+
+def has_backends(day: int, part: int) -> bool:
+    solve = getattr(load_day(day), f"part{part}")
+    return "backend" in inspect.signature(solve).parameters
+
+
+def crossover(ladders: dict[str, list[BenchResult]]) -> int | None:
+    # The smallest input size in bytes from which the numpy backend solved faster
+    # than the python one at every size measured, or None if it wasn't faster at
+    # the largest. A backend that failed or timed out loses at that size.
+    def solve_time(r: BenchResult) -> float:
+        return math.inf if r.error else statistics.median(r.solve_times)
+
+    python = {r.scale: r for r in ladders["python"]}
+    numpy = {r.scale: r for r in ladders["numpy"]}
+    threshold = None
+    for scale in sorted(python.keys() | numpy.keys(), reverse=True):
+        p, n = python.get(scale), numpy.get(scale)
+        # Ladders stop at the first failure, so a missing size failed too
+        p_time = solve_time(p) if p else math.inf
+        n_time = solve_time(n) if n else math.inf
+        if n_time == p_time == math.inf:
+            continue
+        if n_time >= p_time:
+            break
+        threshold = (n or p).input_bytes
+
+    return threshold
+
+
+def run_backend_ladders(
+    day: int,
+    part: int,
+    scales=BACKEND_SCALES,
+    seed: int = 0,
+    repeat: int = 1,
+    timeout: float = 10.0,
+    on_result=None,
+) -> tuple[dict[str, list[BenchResult]], int | None]:
+    # Run the same ladder with each backend, and where numpy starts winning
+    ladders = {}
+    for backend in BACKENDS:
+        ladders[backend] = run_ladder(
+            day,
+            part,
+            scales,
+            seed,
+            repeat,
+            timeout,
+            on_result=on_result and (lambda r: on_result(r, backend)),
+            kwargs={"backend": backend},
+        )
+    return (ladders, crossover(ladders))
+
+
+def format_bench_header() -> str:
+    return (
+        f"{'day':>3}  {'part':>4}  {'scale':>7}  {'bytes':>11}  "
+        f"{'parse ms':>10}  {'solve ms':>11}  {'KiB/s':>10}  {'peak rss':>10}"
+    )
+
+
+def format_bench_result(r: BenchResult) -> str:
+    line = f"{r.day:>3}  {r.part:>4}  {r.scale:>7g}  {r.input_bytes:>11}  "
+    if r.error:
+        return line + f"error: {r.error}"
+
+    parse = (
+        PARSE_IN_SOLVE if r.streamed else format_ms(statistics.median(r.parse_times))
+    )
+    solve = format_ms(statistics.median(r.solve_times))
+    return line + (
+        f"{parse:>10}  {solve:>11}  {r.throughput / 1024:>10.1f}  "
+        f"{format_memory(r.peak_memory):>10}"
+    )
+
+
+def write_results(results: list[BenchResult], path: str | Path):
+    with open(path, "w") as file:
+        json.dump([r.to_dict() for r in results], file, indent=2)
@@ -0,0 +1,80 @@
+import functools
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "parse"
+
+# Set to 0 to always parse from scratch, e.g. when timing parsers
+ENV_VAR = "AOC_PARSE_CACHE"
+
+# Pickled results already loaded by this process, so parsing the same file again
+# skips the disk as well as the tokenizing
+_loaded: dict[str, bytes] = {}
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_VAR, "1") != "0"
+
+
+def file_digest(f: str | Path) -> str:
+    with open(f, "rb") as file:
+        return hashlib.file_digest(file, "blake2b").hexdigest()[:32]
+
+
+def cached_parse(version: int = 1):
+    # Cache a day's parse_input(f) on disk, keyed by the file's contents and the
+    # parser's version. Changing the input picks a new key on its own; bump the
+    # version when the parser's output changes.
+    #
+    # Every call returns a freshly unpickled copy, so solvers that mutate what
+    # they parsed can't affect each other.
+    def decorate(parse):
+        name = f"{parse.__module__}.{parse.__qualname__}-v{version}"
+
+        @functools.wraps(parse)
+        def wrapper(f, *args, **kwargs):
+            if args or kwargs or not enabled():
+                return parse(f, *args, **kwargs)
+
+            key = f"{name}-{file_digest(f)}"
+            data = _loaded.get(key)
+            if data is None:
+                data = load(key)
+            if data is None:
+                data = pickle.dumps(parse(f), protocol=pickle.HIGHEST_PROTOCOL)
+                store(key, data)
+
+            _loaded[key] = data
+            return pickle.loads(data)
+
+        wrapper.uncached = parse
+        return wrapper
+
+    return decorate
+
+
+def load(key: str) -> bytes | None:
+    try:
+        return (CACHE_DIR / f"{key}.pickle").read_bytes()
+    except OSError:
+        return None
+
+
+def store(key: str, data: bytes):
+    # Write then rename, so concurrent runs never read a partial file
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / f"{key}.pickle"
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def clear() -> int:
+    removed = 0
+    for path in CACHE_DIR.glob("*.pickle"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    _loaded.clear()
+    return removed
@@ -0,0 +1,88 @@
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any
+
+from aoc.cache import file_digest
+
+CHECKPOINT_DIR = Path(__file__).resolve().parent.parent / ".cache" / "checkpoints"
+
+# Set to 1 to save and resume long searches. Off by default, so timed runs never
+# pick up where an earlier one left off.
+ENV_VAR = "AOC_CHECKPOINT"
+
+# Seconds between saves
+INTERVAL = 10.0
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_VAR, "0") != "0"
+
+
+class Checkpoint:
+    # Saved state of a long search, so a run that is killed can be restarted where
+    # it left off. A search loads its state once, checks due() as it goes and saves
+    # whatever it needs to continue (current candidate, best so far, iterator
+    # position, ...) when it is, then clears the checkpoint once it finishes:
+    #
+    #     checkpoint = Checkpoint("day17-part2", f)
+    #     count, step = checkpoint.load((start, 1))
+    #     while ...:
+    #         if checkpoint.due():
+    #             checkpoint.save((count, step))
+    #     checkpoint.clear()
+    #
+    # Checkpoints are keyed by name and the input file's contents. When
+    # checkpointing is off, load() returns the default and due() is always False.
+    def __init__(
+        self,
+        name: str,
+        f: str | Path | None = None,
+        interval: float = INTERVAL,
+        on: bool | None = None,
+    ):
+        self.on = enabled() if on is None else on
+        key = f"{name}-{file_digest(f)}" if f and self.on else name
+        self.path = CHECKPOINT_DIR / f"{key}.pickle"
+        self.interval = interval
+        self.last_save = time.monotonic()
+        self.resumed = False
+
+    def load(self, default: Any = None) -> Any:
+        if not self.on:
+            return default
+
+        try:
+            state = pickle.loads(self.path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return default
+
+        self.resumed = True
+        return state
+
+    def due(self) -> bool:
+        return self.on and time.monotonic() - self.last_save >= self.interval
+
+    def save(self, state: Any):
+        if not self.on:
+            return
+
+        # Write then rename, so a run killed mid-save keeps the previous state
+        CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp, self.path)
+        self.last_save = time.monotonic()
+
+    def clear(self):
+        if self.on:
+            self.path.unlink(missing_ok=True)
+
+
+def clear() -> int:
+    removed = 0
+    for path in CHECKPOINT_DIR.glob("*.pickle"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
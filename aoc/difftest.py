@@ -0,0 +1,192 @@
+import os
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+from aoc.generators import generate
+from aoc.runner import format_ms, load_day
+
+# Builds the arguments both implementations are called with from a day module,
+# the path of a generated input and the solver arguments generated with it
+type Prepare = Callable[[Any, str, dict], tuple]
+# Turns an answer into something comparable across inputs parsed separately
+type Normalize = Callable[[Any], Any]
+
+
+class Case:
+    # A slow reference implementation kept as an oracle for a faster one. Both
+    # live in the day's module and must return equal answers for the same input.
+    def __init__(
+        self,
+        day: int,
+        reference: str,
+        optimized: str,
+        prepare: Prepare,
+        normalize: Normalize | None = None,
+        scale: float = 1.0,
+    ):
+        self.day = day
+        self.reference = reference
+        self.optimized = optimized
+        self.prepare = prepare
+        self.normalize = normalize
+        # Default input scale, small enough for the reference to finish quickly
+        self.scale = scale
+
+    @property
+    def name(self) -> str:
+        return f"day{self.day}.{self.optimized}"
+
+
+def parse(module, path: str):
+    # Parse from scratch, so neither side is timed on a cache hit
+    parse_input = getattr(module.parse_input, "uncached", module.parse_input)
+    return parse_input(path)
+
+
+def prepare_day9(module, path: str, kwargs: dict) -> tuple:
+    disk_map = parse(module, path)
+    return (disk_map, module.get_blocks(disk_map))
+
+
+def prepare_day12(module, path: str, kwargs: dict) -> tuple:
+    return (parse(module, path),)
+
+
+def prepare_day16(module, path: str, kwargs: dict) -> tuple:
+    grid, start, end = parse(module, path)
+    return (grid, start, end, module.Direction.EAST)
+
+
+def prepare_day18(module, path: str, kwargs: dict) -> tuple:
+    return (parse(module, path), kwargs["dim"])
+
+
+def prepare_day23(module, path: str, kwargs: dict) -> tuple:
+    return (module.build_graph(parse(module, path)), 3)
+
+
+def region_cells(regions: dict) -> dict:
+    # Regions are found in the same order either way, but their cells aren't
+    return {id: [sorted(region) for region in found] for id, found in regions.items()}
+
+
+def cycle_names(cycles: set[frozenset]) -> set[frozenset[str]]:
+    return {frozenset(node.value for node in cycle) for cycle in cycles}
+
+
+CASES = [
+    Case(9, "defrag_files_reference", "defrag_files", prepare_day9, scale=0.1),
+    Case(
+        12,
+        "find_regions_reference",
+        "find_regions",
+        prepare_day12,
+        normalize=region_cells,
+    ),
+    Case(
+        16,
+        "find_all_shortest_path_nodes_reference",
+        "find_all_shortest_path_nodes",
+        prepare_day16,
+    ),
+    Case(
+        18,
+        "first_blocking_byte_reference",
+        "first_blocking_byte",
+        prepare_day18,
+    ),
+    Case(
+        23,
+        "get_cycles_of_length_reference",
+        "get_cycles_of_length",
+        prepare_day23,
+        normalize=cycle_names,
+    ),
+]
+
+
+class CaseResult:
+    def __init__(self, case: Case, scale: float):
+        self.case = case
+        self.scale = scale
+        self.seeds = 0
+        self.reference_times: list[float] = []
+        self.optimized_times: list[float] = []
+        # Seeds the implementations disagreed or failed on, with what went wrong
+        self.mismatches: list[tuple[int, str]] = []
+
+    @property
+    def speedup(self) -> float:
+        optimized = statistics.median(self.optimized_times)
+        if optimized <= 0:
+            return float("inf")
+        return statistics.median(self.reference_times) / optimized
+
+
+def timed(func, args: tuple) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args)
+    return (result, time.perf_counter() - start)
+
+
+def run_case(case: Case, seeds: range, scale: float | None = None) -> CaseResult:
+    scale = case.scale if scale is None else scale
+    module = load_day(case.day)
+    reference = getattr(module, case.reference)
+    optimized = getattr(module, case.optimized)
+
+    result = CaseResult(case, scale)
+    for seed in seeds:
+        result.seeds += 1
+        text, kwargs = generate(case.day, scale, seed)
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+            file.write(text)
+        try:
+            # Each side gets its own copy of the input, in case either modifies it
+            expected, reference_time = timed(
+                reference, case.prepare(module, file.name, kwargs)
+            )
+            actual, optimized_time = timed(
+                optimized, case.prepare(module, file.name, kwargs)
+            )
+        except Exception as e:
+            result.mismatches.append((seed, f"{type(e).__name__}: {e}"))
+            continue
+        finally:
+            os.unlink(file.name)
+
+        result.reference_times.append(reference_time)
+        result.optimized_times.append(optimized_time)
+        if case.normalize:
+            expected, actual = case.normalize(expected), case.normalize(actual)
+        if actual != expected:
+            result.mismatches.append((seed, "answers differ"))
+
+    return result
+
+
+def format_case_header() -> str:
+    return (
+        f"{'case':<40}  {'scale':>7}  {'seeds':>5}  {'reference ms':>12}  "
+        f"{'optimized ms':>12}  {'speedup':>8}  result"
+    )
+
+
+def format_case_result(r: CaseResult) -> str:
+    line = f"{r.case.name:<40}  {r.scale:>7g}  {r.seeds:>5}  "
+    if r.reference_times and r.optimized_times:
+        line += (
+            f"{format_ms(statistics.median(r.reference_times)):>12}  "
+            f"{format_ms(statistics.median(r.optimized_times)):>12}  "
+            f"{r.speedup:>7.1f}x  "
+        )
+    else:
+        line += f"{'':>12}  {'':>12}  {'':>8}  "
+
+    if not r.mismatches:
+        return line + "ok"
+    details = ", ".join(f"seed {seed}: {reason}" for seed, reason in r.mismatches)
+    return line + f"MISMATCH ({details})"
@@ -0,0 +1,137 @@
+import numpy as np
+from numpy.typing import NDArray
+
+
+class DisjointSet:
+    # Disjoint sets of the integer ids 0..size-1, stored as a parent array where
+    # each set's root is its own parent.
+    #
+    # find() and union() work an id at a time, with path halving and union by
+    # rank, and go through memoryviews of the arrays like Grid.view does, which
+    # is much faster than indexing NumPy per element. union_all() joins many
+    # pairs at once with whole-array passes, for building sets up front.
+    def __init__(self, size: int):
+        self.parent = np.arange(size, dtype=np.intp)
+        self.rank = np.zeros(size, dtype=np.uint8)
+        self.parent_view = memoryview(self.parent)
+        self.rank_view = memoryview(self.rank)
+        self.sets = size
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, x: int) -> int:
+        parent = self.parent_view
+        while parent[x] != x:
+            # Point x at its grandparent as we go, halving the path each find
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        # Join the sets of a and b, returning False if they were already one
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+
+        rank = self.rank_view
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self.parent_view[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        self.sets -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def compress(self) -> NDArray[np.intp]:
+        # Point every id straight at its root, doubling how far each one jumps
+        # every pass, and return the parent array
+        parent = self.parent
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                return parent
+            parent[:] = grandparent
+
+    def union_all(self, a: NDArray[np.intp], b: NDArray[np.intp]):
+        # union(a[i], b[i]) for every i. Each pass hooks the larger root of every
+        # pair still apart under the smaller one (the smallest where several
+        # pairs share a root, so no cycles form) and compresses, so each pass
+        # leaves fewer sets until every pair is joined.
+        a, b = np.asarray(a, dtype=np.intp), np.asarray(b, dtype=np.intp)
+        while len(a):
+            parent = self.compress()
+            root_a, root_b = parent[a], parent[b]
+            apart = root_a != root_b
+            if not apart.any():
+                break
+
+            a, b = a[apart], b[apart]
+            root_a, root_b = root_a[apart], root_b[apart]
+            np.minimum.at(
+                parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b)
+            )
+
+        # Trees are flat now, so any root with children has a rank of at least 1
+        parent = self.compress()
+        ids = np.arange(len(parent))
+        roots = parent == ids
+        self.rank[parent[~roots]] = np.maximum(self.rank[parent[~roots]], 1)
+        self.sets = int(np.count_nonzero(roots))
+
+    def roots(self) -> NDArray[np.intp]:
+        return self.compress().copy()
+
+    def labels(self) -> NDArray[np.intp]:
+        # Each id's set numbered 0..sets-1, in order of the sets' smallest ids
+        return number_by_first(self.compress())
+
+
+def number_by_first(values: NDArray) -> NDArray[np.intp]:
+    # Replace each value by how many distinct values first appear before it
+    _, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.empty(len(first), dtype=np.intp)
+    order[np.argsort(first)] = np.arange(len(first))
+    return order[inverse.ravel()]
+
+
+def grid_pairs(
+    cells: NDArray, mask: NDArray[np.bool_] | None = None
+) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    # Flat indices (row * cols + col) of every pair of orthogonal neighbors with
+    # equal values, both in the mask if there is one
+    rows, cols = cells.shape
+    ids = np.arange(rows * cols, dtype=np.intp).reshape(rows, cols)
+    across = cells[:, :-1] == cells[:, 1:]
+    down = cells[:-1] == cells[1:]
+    if mask is not None:
+        across &= mask[:, :-1] & mask[:, 1:]
+        down &= mask[:-1] & mask[1:]
+
+    return (
+        np.concatenate((ids[:, :-1][across], ids[:-1][down])),
+        np.concatenate((ids[:, 1:][across], ids[1:][down])),
+    )
+
+
+def grid_sets(cells: NDArray, mask: NDArray[np.bool_] | None = None) -> DisjointSet:
+    # Sets of orthogonally connected cells with equal values, by flat index.
+    # Cells outside the mask are left on their own, to be joined later.
+    sets = DisjointSet(cells.size)
+    sets.union_all(*grid_pairs(cells, mask))
+    return sets
+
+
+def label_grid(cells: NDArray, mask: NDArray[np.bool_] | None = None) -> NDArray:
+    # Number each region of connected equal cells 0, 1, ... in the (row, col)
+    # order of their first cells. Cells outside the mask are labeled -1.
+    labels = grid_sets(cells, mask).compress().reshape(cells.shape)
+    if mask is None:
+        return number_by_first(labels.ravel()).reshape(cells.shape)
+
+    numbered = np.full(cells.shape, -1, dtype=np.intp)
+    numbered[mask] = number_by_first(labels[mask])
+    return numbered
@@ -0,0 +1,582 @@
+import math
+import random
+import string
+from collections.abc import Callable
+from typing import Any
+
+# Each generator produces a valid puzzle input for its day at a given scale.
+# A scale of 1 is roughly the size of a real puzzle input; the scale multiplies
+# the amount of data (lines, grid cells, graph nodes, ...), so grid sides grow
+# with the square root of the scale.
+#
+# Generators return the input text along with any keyword arguments the day's
+# solvers need for that input (e.g. grid dimensions).
+
+type Generated = tuple[str, dict[str, Any]]
+type Generator = Callable[[float, random.Random], Generated]
+
+GENERATORS: dict[int, Generator] = {}
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+def generator(day: int):
+    def register(fn: Generator) -> Generator:
+        GENERATORS[day] = fn
+        return fn
+
+    return register
+
+
+def generate(day: int, scale: float = 1.0, seed: int = 0) -> Generated:
+    if day not in GENERATORS:
+        raise ValueError(f"No generator for day {day}")
+    return GENERATORS[day](scale, random.Random(seed))
+
+
+def scaled(base: int, scale: float, minimum: int = 1) -> int:
+    return max(minimum, round(base * scale))
+
+
+def scaled_side(base: int, scale: float, minimum: int = 4) -> int:
+    return max(minimum, round(base * math.sqrt(scale)))
+
+
+def grid_text(grid: list[list[str]]) -> str:
+    return "".join("".join(row) + "\n" for row in grid)
+
+
+def unique_names(count: int, rng: random.Random, exclude: str = "") -> list[str]:
+    letters = [c for c in string.ascii_lowercase if c not in exclude]
+    length = 2
+    while len(letters) ** length < count * 2:
+        length += 1
+
+    # A dict rather than a set keeps the order independent of string hashing, so
+    # a seed always gives the same input
+    names: dict[str, None] = {}
+    while len(names) < count:
+        names["".join(rng.choices(letters, k=length))] = None
+    return list(names)
+
+
+def carve_maze(size: int, rng: random.Random) -> list[list[str]]:
+    # Randomized depth-first search over odd cells produces a perfect maze (a tree)
+    size = size if size % 2 == 1 else size + 1
+    grid = [["#"] * size for _ in range(size)]
+    start = (1, 1)
+    grid[1][1] = "."
+    stack = [start]
+    while stack:
+        r, c = stack[-1]
+        options = []
+        for dr, dc in DIRECTIONS:
+            nr, nc = r + 2 * dr, c + 2 * dc
+            if 0 < nr < size - 1 and 0 < nc < size - 1 and grid[nr][nc] == "#":
+                options.append((nr, nc, dr, dc))
+
+        if not options:
+            stack.pop()
+            continue
+
+        nr, nc, dr, dc = rng.choice(options)
+        grid[r + dr][c + dc] = "."
+        grid[nr][nc] = "."
+        stack.append((nr, nc))
+
+    return grid
+
+
+def bfs_parents(grid: list[list[str]], start: tuple[int, int]):
+    parents = {start: None}
+    queue = [start]
+    for r, c in queue:
+        for dr, dc in DIRECTIONS:
+            n = (r + dr, c + dc)
+            if n not in parents and grid[n[0]][n[1]] != "#":
+                parents[n] = (r, c)
+                queue.append(n)
+    return parents, queue[-1]
+
+
+def corner_to_corner(dim: int, blocked: set[tuple[int, int]]) -> bool:
+    # Whether (dim, dim) can be reached from (0, 0) without stepping on blocked
+    seen = {(0, 0)}
+    queue = [(0, 0)]
+    for x, y in queue:
+        for dx, dy in DIRECTIONS:
+            n = (x + dx, y + dy)
+            in_bounds = 0 <= n[0] <= dim and 0 <= n[1] <= dim
+            if in_bounds and n not in seen and n not in blocked:
+                seen.add(n)
+                queue.append(n)
+    return (dim, dim) in seen
+
+
+@generator(1)
+def day1(scale: float, rng: random.Random) -> Generated:
+    # Draw both lists from a shared pool so the right list repeats left values
+    num_lines = scaled(1000, scale)
+    pool = [rng.randint(10000, 99999) for _ in range(max(1, num_lines // 2))]
+    lines = [f"{rng.choice(pool)}   {rng.choice(pool)}" for _ in range(num_lines)]
+    return ("\n".join(lines) + "\n", {})
+
+
+@generator(2)
+def day2(scale: float, rng: random.Random) -> Generated:
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        sign = rng.choice([-1, 1])
+        level = rng.randint(10, 90)
+        report = [level]
+        for _ in range(rng.randint(4, 7)):
+            diff = sign * rng.randint(1, 3)
+            # Occasionally break the rules so both parts have unsafe reports
+            if rng.random() < 0.1:
+                diff = rng.choice([0, -diff, sign * rng.randint(4, 6)])
+            level += diff
+            report.append(level)
+        lines.append(" ".join(str(r) for r in report))
+    return ("\n".join(lines) + "\n", {})
+
+
+@generator(3)
+def day3(scale: float, rng: random.Random) -> Generated:
+    junk = "!@#$%^&*()[]{}<>?/+-~' ,;:_"
+
+    def token() -> str:
+        roll = rng.random()
+        a, b = rng.randint(1, 999), rng.randint(1, 999)
+        if roll < 0.35:
+            return f"mul({a},{b})"
+        if roll < 0.4:
+            return "do()"
+        if roll < 0.45:
+            return "don't()"
+        if roll < 0.6:
+            corrupted = [
+                f"mul({a}, {b})",
+                f"mul[{a},{b}]",
+                f"mul({a},{b}",
+                f"mul ( {a},{b})",
+            ]
+            return rng.choice(corrupted)
+        return "".join(rng.choices(junk + "muldont", k=rng.randint(1, 8)))
+
+    lines = []
+    for _ in range(scaled(6, scale)):
+        line = ""
+        while len(line) < 3000:
+            line += token()
+        lines.append(line)
+    return ("\n".join(lines) + "\n", {})
+
+
+@generator(4)
+def day4(scale: float, rng: random.Random) -> Generated:
+    side = scaled_side(140, scale)
+    grid = [rng.choices("XMAS", k=side) for _ in range(side)]
+    return (grid_text(grid), {})
+
+
+@generator(5)
+def day5(scale: float, rng: random.Random) -> Generated:
+    # A total order over the pages, with a rule for every pair
+    pages = rng.sample(range(10, 100), 49)
+    rules = [
+        (pages[i], pages[j])
+        for i in range(len(pages))
+        for j in range(i + 1, len(pages))
+    ]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(scaled(200, scale)):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(str(u) for u in update))
+
+    text = "\n".join(f"{a}|{b}" for a, b in rules) + "\n\n" + "\n".join(updates) + "\n"
+    return (text, {})
+
+
+@generator(6)
+def day6(scale: float, rng: random.Random) -> Generated:
+    side = scaled_side(130, scale)
+
+    def guard_exits(grid, start) -> bool:
+        (r, c), d = start, 3
+        seen = set()
+        while 0 <= r < side and 0 <= c < side:
+            if (r, c, d) in seen:
+                return False
+            seen.add((r, c, d))
+            nr, nc = r + DIRECTIONS[d][0], c + DIRECTIONS[d][1]
+            if 0 <= nr < side and 0 <= nc < side and grid[nr][nc] == "#":
+                d = (d + 1) % 4
+            else:
+                r, c = nr, nc
+        return True
+
+    # Re-roll until the guard leaves the map, otherwise part 1 never finishes
+    while True:
+        grid = [
+            ["#" if rng.random() < 0.012 else "." for _ in range(side)]
+            for _ in range(side)
+        ]
+        start = (rng.randrange(side // 4, side - side // 4), rng.randrange(side))
+        grid[start[0]][start[1]] = "^"
+        if guard_exits(grid, start):
+            return (grid_text(grid), {})
+
+
+@generator(7)
+def day7(scale: float, rng: random.Random) -> Generated:
+    lines = []
+    for _ in range(scaled(850, scale)):
+        nums = [rng.randint(1, 999) for _ in range(rng.randint(2, 12))]
+        total = nums[0]
+        for n in nums[1:]:
+            op = rng.choice("+*|")
+            total = (
+                total + n
+                if op == "+"
+                else total * n if op == "*" else int(f"{total}{n}")
+            )
+        if rng.random() < 0.5:
+            total += rng.randint(1, 1000)
+        lines.append(f"{total}: {' '.join(str(n) for n in nums)}")
+    return ("\n".join(lines) + "\n", {})
+
+
+@generator(8)
+def day8(scale: float, rng: random.Random) -> Generated:
+    side = scaled_side(50, scale)
+    frequencies = string.digits + string.ascii_letters
+    grid = [["." for _ in range(side)] for _ in range(side)]
+    for _ in range(max(2, round(side * side * 0.08))):
+        grid[rng.randrange(side)][rng.randrange(side)] = rng.choice(frequencies)
+    return (grid_text(grid), {})
+
+
+@generator(9)
+def day9(scale: float, rng: random.Random) -> Generated:
+    # Alternating file and free space lengths, always ending with a file
+    num_files = scaled(10000, scale)
+    digits = []
+    for i in range(num_files):
+        digits.append(str(rng.randint(1, 9)))
+        if i < num_files - 1:
+            digits.append(str(rng.randint(0, 9)))
+    return ("".join(digits) + "\n", {})
+
+
+@generator(10)
+def day10(scale: float, rng: random.Random) -> Generated:
+    side = scaled_side(55, scale)
+    grid = [[str(rng.randint(0, 9)) for _ in range(side)] for _ in range(side)]
+
+    # Lay down random trails climbing from 0 to 9
+    for _ in range(max(1, side * side // 40)):
+        r, c = rng.randrange(side), rng.randrange(side)
+        trail = {(r, c)}
+        for height in range(10):
+            grid[r][c] = str(height)
+            options = [
+                (r + dr, c + dc)
+                for dr, dc in DIRECTIONS
+                if 0 <= r + dr < side
+                and 0 <= c + dc < side
+                and (r + dr, c + dc) not in trail
+            ]
+            if not options:
+                break
+            r, c = rng.choice(options)
+            trail.add((r, c))
+    return (grid_text(grid), {})
+
+
+@generator(11)
+def day11(scale: float, rng: random.Random) -> Generated:
+    stones = [str(rng.randint(0, 10_000_000)) for _ in range(scaled(8, scale))]
+    return (" ".join(stones) + "\n", {})
+
+
+@generator(12)
+def day12(scale: float, rng: random.Random) -> Generated:
+    side = scaled_side(140, scale)
+    block = 7
+    blocks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(side // block + 1)]
+        for _ in range(side // block + 1)
+    ]
+    grid = []
+    for r in range(side):
+        row = []
+        for c in range(side):
+            # Jitter block edges so regions have ragged sides
+            br = (r + rng.randint(-2, 2)) // block
+            bc = (c + rng.randint(-2, 2)) // block
+            br, bc = min(max(br, 0), len(blocks) - 1), min(max(bc, 0), len(blocks) - 1)
+            row.append(blocks[br][bc])
+        grid.append(row)
+    return (grid_text(grid), {})
+
+
+@generator(13)
+def day13(scale: float, rng: random.Random) -> Generated:
+    machines = []
+    for _ in range(scaled(320, scale)):
+        while True:
+            ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+            if ax * by != ay * bx:
+                break
+        if rng.random() < 0.5:
+            na, nb = rng.randint(0, 100), rng.randint(0, 100)
+            px, py = na * ax + nb * bx, na * ay + nb * by
+        else:
+            px, py = rng.randint(1000, 20000), rng.randint(1000, 20000)
+        machines.append(
+            f"Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={px}, Y={py}\n"
+        )
+    return ("\n".join(machines), {})
+
+
+@generator(14)
+def day14(scale: float, rng: random.Random) -> Generated:
+    rows, cols = 103, 101
+    lines = [
+        f"p={rng.randrange(cols)},{rng.randrange(rows)} "
+        f"v={rng.randint(-99, 99)},{rng.randint(-99, 99)}"
+        for _ in range(scaled(500, scale))
+    ]
+    return ("\n".join(lines) + "\n", {"dim": (rows, cols)})
+
+
+@generator(15)
+def day15(scale: float, rng: random.Random) -> Generated:
+    side = scaled_side(50, scale, minimum=5)
+    grid = [["#"] * side for _ in range(side)]
+    for r in range(1, side - 1):
+        for c in range(1, side - 1):
+            roll = rng.random()
+            grid[r][c] = "#" if roll < 0.05 else "O" if roll < 0.3 else "."
+    grid[side // 2][side // 2] = "@"
+
+    moves = "".join(rng.choices("<>^v", k=scaled(20000, scale)))
+    move_lines = "\n".join(moves[i : i + 1000] for i in range(0, len(moves), 1000))
+    return (grid_text(grid) + "\n" + move_lines + "\n", {})
+
+
+@generator(16)
+def day16(scale: float, rng: random.Random) -> Generated:
+    grid = carve_maze(scaled_side(141, scale, minimum=5), rng)
+    size = len(grid)
+
+    # Knock out extra walls so there are multiple best paths
+    for _ in range(size * size // 50):
+        r, c = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        if (r % 2) != (c % 2):
+            grid[r][c] = "."
+
+    grid[size - 2][1] = "S"
+    grid[1][size - 2] = "E"
+    return (grid_text(grid), {})
+
+
+@generator(17)
+def day17(scale: float, rng: random.Random) -> Generated:
+    # Programs follow the shape of the real puzzle: output one octal digit of a
+    # scrambled A per loop, then shift A right by 3. Constants are chosen so a
+    # self-reproducing value of A exists for part 2.
+    def output_digit(a: int, k1: int, k2: int) -> int:
+        b = (a % 8) ^ k1
+        return (b ^ k2 ^ (a >> b)) % 8
+
+    def has_quine(program: list[int], k1: int, k2: int) -> bool:
+        candidates = [0]
+        for digit in reversed(program):
+            candidates = [
+                a * 8 + d
+                for a in candidates
+                for d in range(8)
+                if (a * 8 + d) > 0 and output_digit(a * 8 + d, k1, k2) == digit
+            ]
+        return bool(candidates)
+
+    constants = [(k1, k2) for k1 in range(8) for k2 in range(8)]
+    rng.shuffle(constants)
+    for k1, k2 in constants:
+        program = [2, 4, 1, k1, 7, 5, 1, k2, 4, rng.randint(0, 7), 5, 5, 0, 3, 3, 0]
+        if has_quine(program, k1, k2):
+            break
+
+    digits = scaled(16, scale)
+    a = rng.randrange(8 ** (digits - 1), 8**digits)
+    text = (
+        f"Register A: {a}\nRegister B: 0\nRegister C: 0\n\n"
+        f"Program: {','.join(str(p) for p in program)}\n"
+    )
+    return (text, {})
+
+
+@generator(18)
+def day18(scale: float, rng: random.Random) -> Generated:
+    dim = scaled_side(70, scale)
+    cells = [(x, y) for x in range(dim + 1) for y in range(dim + 1)]
+    cells.remove((0, 0))
+    cells.remove((dim, dim))
+    rng.shuffle(cells)
+
+    num_positions = round(len(cells) * 0.68)
+    num_bytes = round(len(cells) * 0.2)
+    # Part 1 needs a way through after num_bytes have fallen, which random bytes
+    # don't promise on a small grid
+    while not corner_to_corner(dim, set(cells[:num_bytes])):
+        num_bytes -= 1
+    text = "".join(f"{x},{y}\n" for x, y in cells[:num_positions])
+    return (text, {"dim": dim, "num_bytes": num_bytes})
+
+
+@generator(19)
+def day19(scale: float, rng: random.Random) -> Generated:
+    patterns: set[str] = set()
+    while len(patterns) < 447:
+        patterns.add("".join(rng.choices("wubrg", k=rng.randint(1, 8))))
+    # Drop one single-stripe towel so some designs can't be made
+    patterns.discard(rng.choice("wubrg"))
+    pattern_list = sorted(patterns)
+
+    designs = []
+    for _ in range(scaled(400, scale)):
+        length = rng.randint(40, 60)
+        if rng.random() < 0.7:
+            design = ""
+            while len(design) < length:
+                design += rng.choice(pattern_list)
+        else:
+            design = "".join(rng.choices("wubrg", k=length))
+        designs.append(design)
+
+    # No trailing newline, since the solver splits designs on "\n"
+    return (", ".join(pattern_list) + "\n\n" + "\n".join(designs), {})
+
+
+@generator(20)
+def day20(scale: float, rng: random.Random) -> Generated:
+    # Carve a maze and keep only the track between S and E, which makes a single
+    # winding path with thin walls to cheat through
+    maze = carve_maze(scaled_side(141, scale, minimum=5), rng)
+    size = len(maze)
+    start = (size - 2, 1)
+    parents, end = bfs_parents(maze, start)
+
+    grid = [["#"] * size for _ in range(size)]
+    node = end
+    while node is not None:
+        grid[node[0]][node[1]] = "."
+        node = parents[node]
+    grid[start[0]][start[1]] = "S"
+    grid[end[0]][end[1]] = "E"
+    return (grid_text(grid), {})
+
+
+@generator(21)
+def day21(scale: float, rng: random.Random) -> Generated:
+    codes = [f"{rng.randint(1, 999):03d}A" for _ in range(scaled(5, scale))]
+    return ("\n".join(codes) + "\n", {})
+
+
+@generator(22)
+def day22(scale: float, rng: random.Random) -> Generated:
+    secrets = [str(rng.randint(1, 0xFFFFFF)) for _ in range(scaled(2400, scale))]
+    return ("\n".join(secrets) + "\n", {})
+
+
+@generator(23)
+def day23(scale: float, rng: random.Random) -> Generated:
+    num_nodes = scaled(520, scale, minimum=16)
+    names = unique_names(num_nodes, rng)
+    edges: dict[tuple[str, str], None] = {}
+
+    def connect(a: str, b: str):
+        if a != b and (b, a) not in edges:
+            edges[a, b] = None
+
+    for name in names:
+        for other in rng.sample(names, 6):
+            connect(name, other)
+
+    # Plant a clique for part 2
+    clique = rng.sample(names, 13)
+    for i, a in enumerate(clique):
+        for b in clique[i + 1 :]:
+            connect(a, b)
+
+    lines = [f"{a}-{b}" for a, b in edges]
+    rng.shuffle(lines)
+    return ("\n".join(lines) + "\n", {})
+
+
+@generator(24)
+def day24(scale: float, rng: random.Random) -> Generated:
+    # A ripple-carry adder with randomly named internal wires and four pairs of
+    # gate outputs swapped, each within one bit so no loops form. Part 2 searches
+    # for one swap among the lowest six bits and is told the other three.
+    bits = scaled(45, scale, minimum=10)
+    width = max(2, len(str(bits)))
+    names = iter(unique_names(bits * 5, rng, exclude="xyz"))
+
+    def wire(prefix: str, i: int) -> str:
+        return f"{prefix}{i:0{width}d}"
+
+    signals = [f"{wire(p, i)}: {rng.randint(0, 1)}" for p in "xy" for i in range(bits)]
+    gates = []
+    # The sum and carry wires that can be swapped in each bit
+    swappable = {}
+
+    def gate(a: str, op: str, b: str, out: str):
+        a, b = (a, b) if rng.random() < 0.5 else (b, a)
+        gates.append((a, op, b, out))
+
+    carry = next(names)
+    gate(wire("x", 0), "XOR", wire("y", 0), wire("z", 0))
+    gate(wire("x", 0), "AND", wire("y", 0), carry)
+    for i in range(1, bits):
+        half_sum, half_carry, carry_through = next(names), next(names), next(names)
+        next_carry = wire("z", bits) if i == bits - 1 else next(names)
+        gate(wire("x", i), "XOR", wire("y", i), half_sum)
+        gate(half_sum, "XOR", carry, wire("z", i))
+        gate(wire("x", i), "AND", wire("y", i), half_carry)
+        gate(half_sum, "AND", carry, carry_through)
+        gate(half_carry, "OR", carry_through, next_carry)
+        swappable[i] = [(wire("z", i), carry_through), (half_sum, half_carry)]
+        carry = next_carry
+
+    # Either swap breaks 63 + 1 in the lowest bits, which is how part 2 finds it
+    found = rng.choice(swappable[rng.randint(1, 5)])
+    given = [rng.choice(swappable[i]) for i in rng.sample(range(6, bits), 3)]
+    swapped = {}
+    for a, b in [found, *given]:
+        swapped[a], swapped[b] = b, a
+
+    lines = [f"{a} {op} {b} -> {swapped.get(out, out)}" for a, op, b, out in gates]
+    rng.shuffle(lines)
+    text = "\n".join(signals) + "\n\n" + "\n".join(lines) + "\n"
+    return (text, {"swaps": given})
+
+
+@generator(25)
+def day25(scale: float, rng: random.Random) -> Generated:
+    schematics = []
+    for _ in range(scaled(500, scale, minimum=2)):
+        is_lock = rng.random() < 0.5
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        rows = []
+        for r in range(7):
+            # Locks fill down from the top row, keys fill up from the bottom row
+            level = r if is_lock else 6 - r
+            rows.append("".join("#" if level <= h else "." for h in heights))
+        schematics.append("\n".join(rows))
+    return ("\n\n".join(schematics) + "\n", {})
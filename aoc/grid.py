@@ -0,0 +1,172 @@
+import mmap
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from numpy.typing import NDArray
+
+type Point = tuple[int, int]
+type Offset = tuple[int, int]
+
+# (row, col) offsets in the order most days use: right, down, left, up
+ORTHOGONAL: list[Offset] = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+DIAGONAL: list[Offset] = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+CR = ord("\r")
+LF = ord("\n")
+
+
+class Grid:
+    # Characters of a puzzle map stored in a contiguous (rows, cols) uint8 array.
+    #
+    # Whole-grid work (masks, counts, neighbor shifts) goes through `cells` with
+    # NumPy. Scalar loops should index `view`, a 2-D memoryview over the same
+    # memory, with `(row, col)` tuples and compare against byte values, e.g.
+    # `grid.view[pos] == WALL` with `WALL = ord("#")`. That is as fast as indexing
+    # a list of lists, where going through NumPy per element is several times slower.
+    #
+    # Cells may also be a strided view, as with `map_file`, which is used as is
+    # rather than copied.
+    def __init__(self, cells: NDArray[np.uint8]):
+        self.cells = np.asarray(cells, dtype=np.uint8)
+        self.rows, self.cols = self.cells.shape
+        self.view = memoryview(self.cells)
+        # The same memory indexed by `index(pos)`, for loops over packed positions.
+        # Only contiguous grids have one; `copy()` a strided grid to get it.
+        self.flat = self.view.cast("B") if self.cells.flags.c_contiguous else None
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "Grid":
+        lines = [line.rstrip("\r\n") for line in lines]
+        lines = [line for line in lines if line]
+        data = "".join(lines).encode()
+        cells = np.frombuffer(bytearray(data), dtype=np.uint8).reshape(len(lines), -1)
+        return cls(cells)
+
+    @classmethod
+    def from_text(cls, text: str) -> "Grid":
+        return cls.from_lines(text.splitlines())
+
+    @classmethod
+    def from_file(cls, f: str) -> "Grid":
+        with open(f, "r") as file:
+            return cls.from_text(file.read())
+
+    @classmethod
+    def map_file(cls, f: str) -> "Grid":
+        # Zero-copy load: map the file and view its bytes as (rows, cols) with a row
+        # stride that steps over each line ending, so there are no per-line or
+        # per-cell objects. Pages are mapped copy-on-write, so writes to the grid
+        # never reach the file.
+        with open(f, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return cls(np.zeros((0, 0), dtype=np.uint8))
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        cols = buffer.find(b"\n")
+        if cols < 0:
+            return cls(data.reshape(1, -1))
+
+        newline = 1
+        if cols > 0 and buffer[cols - 1] == CR:
+            cols, newline = cols - 1, 2
+
+        stride = cols + newline
+        # Every line takes a full stride, except that the last one's line ending is
+        # optional
+        size = len(data) - newline if data[-1] == LF else len(data)
+        rows, ragged = divmod(size + newline, stride)
+        if ragged or np.any(data[cols:size:stride] != data[cols]):
+            raise ValueError(f"{f} is not a rectangular grid")
+
+        return cls(as_strided(data, shape=(rows, cols), strides=(stride, 1)))
+
+    @classmethod
+    def full(cls, shape: tuple[int, int], char: str) -> "Grid":
+        return cls(np.full(shape, ord(char), dtype=np.uint8))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.rows, self.cols)
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells.copy())
+
+    def __getitem__(self, pos: Point) -> str:
+        return chr(self.view[pos])
+
+    def __setitem__(self, pos: Point, char: str):
+        self.view[pos] = ord(char)
+
+    def __reduce__(self):
+        # memoryviews can't be pickled; rebuild them from the cells
+        return (Grid, (self.cells,))
+
+    def __eq__(self, other):
+        if not isinstance(other, Grid):
+            return NotImplemented
+
+        return np.array_equal(self.cells, other.cells)
+
+    def __str__(self):
+        lines = self.cells.view(f"S{self.cols}").ravel()
+        return "".join(line.decode() + "\n" for line in lines)
+
+    def in_bounds(self, pos: Point) -> bool:
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def in_bounds_mask(self, points: NDArray) -> NDArray[np.bool_]:
+        # Vectorized bounds check for an (n, 2) array of (row, col) points
+        r, c = points[..., 0], points[..., 1]
+        return (0 <= r) & (r < self.rows) & (0 <= c) & (c < self.cols)
+
+    def index(self, pos: Point) -> int:
+        return pos[0] * self.cols + pos[1]
+
+    def point(self, index: int) -> Point:
+        return divmod(index, self.cols)
+
+    def mask(self, chars: str) -> NDArray[np.bool_]:
+        if len(chars) == 1:
+            return self.cells == ord(chars)
+        return np.isin(self.cells, np.frombuffer(chars.encode(), dtype=np.uint8))
+
+    def shifted(self, offset: Offset, fill: int = 0) -> NDArray[np.uint8]:
+        # out[r, c] = cells[r + dr, c + dc], or `fill` where that is out of bounds
+        return shift(self.cells, offset, fill)
+
+    def neighbor_bits(
+        self, passable: NDArray[np.bool_], offsets: list[Offset] = ORTHOGONAL
+    ) -> NDArray[np.uint8]:
+        # Bit k is set where the neighbor at offsets[k] is in bounds and passable
+        bits = np.zeros(self.shape, dtype=np.uint8)
+        for k, offset in enumerate(offsets):
+            bits |= shift(passable, offset, False).astype(np.uint8) << k
+        return bits
+
+    def find(self, char: str) -> Point | None:
+        hits = self.cells == ord(char)
+        first = int(np.argmax(hits))
+        return self.point(first) if hits.flat[first] else None
+
+    def find_all(self, char: str) -> list[Point]:
+        return [(int(r), int(c)) for r, c in np.argwhere(self.cells == ord(char))]
+
+    def count(self, chars: str) -> int:
+        return int(np.count_nonzero(self.mask(chars)))
+
+
+def shift(a: NDArray, offset: Offset, fill=0) -> NDArray:
+    dr, dc = offset
+    rows, cols = a.shape
+    out = np.full_like(a, fill)
+    if abs(dr) >= rows or abs(dc) >= cols:
+        return out
+
+    dst_r = slice(max(0, -dr), rows - max(0, dr))
+    dst_c = slice(max(0, -dc), cols - max(0, dc))
+    src_r = slice(max(0, dr), rows - max(0, -dr))
+    src_c = slice(max(0, dc), cols - max(0, -dc))
+    out[dst_r, dst_c] = a[src_r, src_c]
+    return out
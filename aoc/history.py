@@ -0,0 +1,180 @@
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+
+from aoc.bench import BenchResult
+from aoc.runner import ROOT, format_memory, format_ms
+
+HISTORY_FILE = ROOT / ".cache" / "bench-history.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    git_sha TEXT,
+    git_dirty INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    scale REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    input_bytes INTEGER NOT NULL,
+    repeat INTEGER NOT NULL,
+    median REAL NOT NULL,
+    p95 REAL NOT NULL,
+    peak_memory INTEGER NOT NULL,
+    error TEXT,
+    streamed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (day, part, scale, seed);
+"""
+
+
+def git_revision() -> tuple[str | None, bool]:
+    # Commit the tree was at and whether tracked files had changed since
+    def git(*args) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        sha = git("rev-parse", "HEAD")
+        dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+        return (sha, dirty)
+    except (OSError, subprocess.CalledProcessError):
+        return (None, False)
+
+
+def connect(path: str | Path = HISTORY_FILE) -> sqlite3.Connection:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    # Histories recorded before parts were marked as streamed
+    columns = {row["name"] for row in db.execute("PRAGMA table_info(runs)")}
+    if "streamed" not in columns:
+        db.execute("ALTER TABLE runs ADD COLUMN streamed INTEGER NOT NULL DEFAULT 0")
+    return db
+
+
+def record(results: list[BenchResult], path: str | Path = HISTORY_FILE):
+    sha, dirty = git_revision()
+    now = time.time()
+    with connect(path) as db:
+        db.executemany(
+            "INSERT INTO runs (timestamp, git_sha, git_dirty, day, part, scale, seed, "
+            "input_bytes, repeat, median, p95, peak_memory, error, streamed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    now,
+                    sha,
+                    dirty,
+                    r.day,
+                    r.part,
+                    r.scale,
+                    r.seed,
+                    r.input_bytes,
+                    len(r.total_times),
+                    r.median,
+                    r.p95,
+                    r.peak_memory,
+                    r.error,
+                    r.streamed,
+                )
+                for r in results
+            ],
+        )
+    db.close()
+
+
+class Comparison:
+    def __init__(self, baseline: sqlite3.Row, current: sqlite3.Row):
+        self.baseline = baseline
+        self.current = current
+
+    @property
+    def ratio(self) -> float:
+        if self.baseline["median"] <= 0:
+            return 1.0
+        return self.current["median"] / self.baseline["median"]
+
+    def regressed(self, threshold: float, min_delta: float) -> bool:
+        # A run that now fails or times out has regressed whatever its timings.
+        # Otherwise it has to be slower by more than `threshold` as a fraction of
+        # the baseline, and by at least `min_delta` seconds, so timer noise on
+        # tiny runs isn't flagged
+        if self.current["error"]:
+            return True
+
+        delta = self.current["median"] - self.baseline["median"]
+        return self.ratio > 1 + threshold and delta >= min_delta
+
+
+def compare(
+    baseline_rev: str | None = None,
+    day: int | None = None,
+    path: str | Path = HISTORY_FILE,
+) -> list[Comparison]:
+    # Compare the latest run of every (day, part, scale, seed) against the last
+    # successful run before it, or against the latest one at `baseline_rev` (a
+    # commit SHA or prefix) when given
+    with connect(path) as db:
+        rows = db.execute("SELECT * FROM runs ORDER BY id").fetchall()
+    db.close()
+
+    history: dict[tuple, list[sqlite3.Row]] = {}
+    for row in rows:
+        if day is None or row["day"] == day:
+            key = (row["day"], row["part"], row["scale"], row["seed"])
+            history.setdefault(key, []).append(row)
+
+    comparisons = []
+    for key in sorted(history):
+        runs = history[key]
+        current = runs[-1]
+        candidates = [r for r in runs[:-1] if not r["error"]]
+        if baseline_rev:
+            candidates = [
+                r
+                for r in candidates
+                if r["git_sha"] and r["git_sha"].startswith(baseline_rev)
+            ]
+
+        if candidates:
+            comparisons.append(Comparison(candidates[-1], current))
+
+    return comparisons
+
+
+def short_sha(row: sqlite3.Row) -> str:
+    if not row["git_sha"]:
+        return "unknown"
+    return row["git_sha"][:8] + ("+" if row["git_dirty"] else "")
+
+
+def format_comparisons(
+    comparisons: list[Comparison], threshold: float, min_delta: float
+) -> str:
+    lines = [
+        f"{'day':>3}  {'part':>4}  {'scale':>7}  {'baseline':>9}  {'current':>9}  "
+        f"{'base ms':>10}  {'now ms':>10}  {'ratio':>6}  {'peak rss':>10}"
+    ]
+    for c in comparisons:
+        b, n = c.baseline, c.current
+        line = (
+            f"{n['day']:>3}  {n['part']:>4}  {n['scale']:>7g}  {short_sha(b):>9}  "
+            f"{short_sha(n):>9}  {format_ms(b['median']):>10}  "
+        )
+        if n["error"]:
+            line += f"error: {n['error']}"
+        else:
+            line += (
+                f"{format_ms(n['median']):>10}  {c.ratio:>6.2f}  "
+                f"{format_memory(n['peak_memory']):>10}"
+            )
+
+        if c.regressed(threshold, min_delta):
+            line += "  REGRESSION"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,208 @@
+import contextlib
+import cProfile
+import functools
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+# Any value other than 0 turns on phase timers. Add `cprofile` and/or
+# `tracemalloc`, comma-separated, to also capture those per phase, e.g.
+# AOC_PROFILE=cprofile,tracemalloc
+ENV_VAR = "AOC_PROFILE"
+PROFILE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "profiles"
+
+# Snapshots cost time proportional to everything allocated so far, so phases
+# called in a loop only compare allocations over their first few calls
+SNAPSHOT_CALLS = 10
+IGNORED_FILES = (tracemalloc.__file__, __file__)
+
+# The profiler phases report to, if one is running
+_profiler: "Profiler | None" = None
+
+
+class ProfileSettings:
+    def __init__(self, cprofile_dir: Path | None = None, top_allocations: int = 0):
+        # cProfile stats are written to cprofile_dir, one .prof file per phase
+        self.cprofile_dir = cprofile_dir
+        # Number of allocation sites to keep per phase, 0 to skip tracemalloc
+        self.top_allocations = top_allocations
+
+    @classmethod
+    def from_env(cls) -> "ProfileSettings | None":
+        value = os.environ.get(ENV_VAR, "")
+        if value in ("", "0"):
+            return None
+
+        options = value.split(",")
+        return cls(
+            PROFILE_DIR if "cprofile" in options else None,
+            10 if "tracemalloc" in options else 0,
+        )
+
+
+class PhaseStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        # Net bytes and blocks allocated per "file:line" over the first
+        # `snapshot_calls` calls
+        self.allocations: dict[str, tuple[int, int]] = {}
+        self.snapshot_calls = 0
+
+    def top_allocations(self, n: int) -> list[tuple[str, int, int]]:
+        sites = sorted(self.allocations.items(), key=lambda item: -abs(item[1][0]))
+        return [(site, size, count) for site, (size, count) in sites[:n]]
+
+
+class Profiler:
+    # Phases can nest. Times are inclusive, so a phase's time includes the phases
+    # it calls, but each cProfile capture only covers time spent outside nested
+    # phases, so a hot inner phase doesn't show up in all of its callers' stats.
+    def __init__(self, settings: ProfileSettings | None = None):
+        self.settings = settings or ProfileSettings()
+        self.phases: dict[str, PhaseStats] = {}
+        self.profiles: dict[str, cProfile.Profile] = {}
+        self.depths: dict[str, int] = {}
+        self.stack: list[tuple[str, float, float, tracemalloc.Snapshot | None]] = []
+
+    def start(self, name: str):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats(name)
+        stats.calls += 1
+
+        if self.settings.cprofile_dir:
+            if self.stack:
+                self.profiles[self.stack[-1][0]].disable()
+            self.profiles.setdefault(name, cProfile.Profile()).enable()
+
+        snapshot = None
+        if self.settings.top_allocations and stats.snapshot_calls < SNAPSHOT_CALLS:
+            stats.snapshot_calls += 1
+            snapshot = tracemalloc.take_snapshot()
+
+        self.depths[name] = self.depths.get(name, 0) + 1
+        self.stack.append((name, time.perf_counter(), time.process_time(), snapshot))
+
+    def stop(self):
+        name, wall, cpu, snapshot = self.stack.pop()
+        stats = self.phases[name]
+
+        # Recursive calls of a phase are already inside its outermost call
+        self.depths[name] -= 1
+        if self.depths[name] == 0:
+            stats.wall += time.perf_counter() - wall
+            stats.cpu += time.process_time() - cpu
+
+        if snapshot is not None:
+            for diff in tracemalloc.take_snapshot().compare_to(snapshot, "lineno"):
+                frame = diff.traceback[0]
+                # Skip the snapshots themselves. Filtering the diff is much cheaper
+                # than filtering every trace in the snapshots.
+                if frame.filename in IGNORED_FILES:
+                    continue
+                if diff.size_diff or diff.count_diff:
+                    site = f"{frame.filename}:{frame.lineno}"
+                    size, count = stats.allocations.get(site, (0, 0))
+                    stats.allocations[site] = (
+                        size + diff.size_diff,
+                        count + diff.count_diff,
+                    )
+
+        if self.settings.cprofile_dir:
+            self.profiles[name].disable()
+            if self.stack:
+                self.profiles[self.stack[-1][0]].enable()
+
+    def dump(self, prefix: str) -> list[Path]:
+        # Write each phase's cProfile stats, for pstats or a viewer like snakeviz
+        directory = self.settings.cprofile_dir
+        if not directory:
+            return []
+
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name, profile in self.profiles.items():
+            path = directory / f"{prefix}-{name}.prof"
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+
+
+class phase:
+    # Times a named phase of a solver, as a context manager or a decorator:
+    #
+    #     @phase("find_regions")
+    #     def find_regions(grid): ...
+    #
+    #     with phase("compute_sides"):
+    #         ...
+    #
+    # Phases do nothing unless a profiler is running, so they can stay in solvers.
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        if _profiler is not None:
+            _profiler.start(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        if _profiler is not None:
+            _profiler.stop()
+        return False
+
+    def __call__(self, func):
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            profiler.start(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.stop()
+
+        return wrapper
+
+
+@contextlib.contextmanager
+def profiling(settings: ProfileSettings | None = None):
+    # Record every phase entered inside the block
+    global _profiler
+    profiler = Profiler(settings)
+    previous, _profiler = _profiler, profiler
+
+    started_tracing = False
+    if profiler.settings.top_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = True
+
+    try:
+        yield profiler
+    finally:
+        _profiler = previous
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def format_phases(phases: list[PhaseStats], top_allocations: int = 0) -> str:
+    width = max([len("phase")] + [len(p.name) for p in phases])
+    lines = [f"  {'phase':<{width}}  {'calls':>8}  {'wall ms':>10}  {'cpu ms':>10}"]
+    for p in phases:
+        lines.append(
+            f"  {p.name:<{width}}  {p.calls:>8}  {p.wall * 1000:>10.2f}  "
+            f"{p.cpu * 1000:>10.2f}"
+        )
+        if top_allocations and p.snapshot_calls < p.calls:
+            lines.append(f"      allocations over the first {p.snapshot_calls} calls")
+        for site, size, count in p.top_allocations(top_allocations):
+            lines.append(f"      {size / 1024:>+10.1f} KiB  {count:>+8} blocks  {site}")
+    return "\n".join(lines)
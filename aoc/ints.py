@@ -0,0 +1,108 @@
+import gc
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+NEWLINE = ord("\n")
+MINUS = ord("-")
+ZERO = ord("0")
+NINE = ord("9")
+
+# int64 holds any 18 digit number
+MAX_DIGITS = 18
+
+
+class IntRows:
+    # Every integer in a file in order, and the lines they came from: line i holds
+    # values[offsets[i] : offsets[i + 1]]. Lines without any integers, like blank
+    # ones, are kept as empty rows so line numbers stay true to the file.
+    def __init__(self, values: NDArray[np.int64], offsets: NDArray[np.intp]):
+        self.values = values
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> NDArray[np.int64]:
+        return self.values[self.offsets[i] : self.offsets[i + 1]]
+
+    @property
+    def lengths(self) -> NDArray[np.intp]:
+        return np.diff(self.offsets)
+
+    def table(self, width: int) -> NDArray[np.int64]:
+        # The integers as a (lines, width) array, for inputs with the same number
+        # on every line. Empty lines are left out.
+        lengths = self.lengths
+        if np.any(lengths[lengths > 0] != width):
+            raise ValueError(f"Expected {width} integers on every non-empty line")
+        return self.values.reshape(-1, width)
+
+    def lists(self) -> list[list[int]]:
+        # Each non-empty line's integers as a list of Python ints. Building
+        # millions of small lists would set off the cyclic garbage collector over
+        # and over, though none of them can be part of a cycle.
+        values, offsets = self.values.tolist(), self.offsets.tolist()
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            return [
+                values[start:end]
+                for start, end in zip(offsets, offsets[1:])
+                if end > start
+            ]
+        finally:
+            if collecting:
+                gc.enable()
+
+
+def parse_ints(data: bytes | NDArray[np.uint8]) -> IntRows:
+    # Pull every integer out of a buffer in one pass over it. An integer is a run
+    # of digits, negative if a "-" comes right before it; everything else
+    # separates them.
+    buffer = np.frombuffer(data, dtype=np.uint8) if isinstance(data, bytes) else data
+
+    is_digit = (buffer >= ZERO) & (buffer <= NINE)
+    after_digit = np.zeros_like(is_digit)
+    after_digit[1:] = is_digit[:-1]
+    before_digit = np.zeros_like(is_digit)
+    before_digit[:-1] = is_digit[1:]
+
+    starts = np.flatnonzero(is_digit & ~after_digit)
+    ends = np.flatnonzero(is_digit & ~before_digit)
+    lengths = ends - starts + 1
+    if len(lengths) and lengths.max() > MAX_DIGITS:
+        raise ValueError(f"Integers longer than {MAX_DIGITS} digits don't fit int64")
+
+    # Build every integer a digit at a time, all of them at once: the first
+    # digit of each, then the second of those that have one, and so on
+    values = np.zeros(len(starts), dtype=np.int64)
+    shortest = int(lengths.min()) if len(lengths) else 0
+    longest = int(lengths.max()) if len(lengths) else 0
+    for place in range(longest):
+        if place < shortest:
+            values = values * 10 + (buffer[starts + place] - ZERO)
+        else:
+            longer = np.flatnonzero(lengths > place)
+            values[longer] = values[longer] * 10 + (
+                buffer[starts[longer] + place] - ZERO
+            )
+
+    signed = starts > 0
+    signed[signed] = buffer[starts[signed] - 1] == MINUS
+    values[signed] *= -1
+
+    # A line's integers start from the first one after the line does. A last
+    # line without a trailing newline is still a line.
+    line_starts = np.flatnonzero(buffer == NEWLINE) + 1
+    line_starts = np.concatenate(([0], line_starts[line_starts < len(buffer)]))
+    if not len(buffer):
+        line_starts = line_starts[:0]
+    offsets = np.append(np.searchsorted(starts, line_starts), len(starts))
+
+    return IntRows(values, offsets)
+
+
+def read_ints(f: str | Path) -> IntRows:
+    return parse_ints(np.fromfile(f, dtype=np.uint8))
@@ -0,0 +1,169 @@
+import contextlib
+import functools
+
+# unbounded: keep every result until clear() is called
+# lru: keep the max_size most recently used results
+# scoped: keep results only until the scope() around the outermost call ends, for
+#   recursions whose results are no use to the next call
+POLICIES = ("unbounded", "lru", "scoped")
+
+
+class MemoStats:
+    def __init__(self, name: str, policy: str, max_size: int | None = None):
+        self.name = name
+        self.policy = policy
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # Entries held now, and the most seen held at once
+        self.size = 0
+        self.peak_size = 0
+
+    @property
+    def calls(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+    def copy(self) -> "MemoStats":
+        stats = MemoStats(self.name, self.policy, self.max_size)
+        stats.hits, stats.misses = self.hits, self.misses
+        stats.size, stats.peak_size = self.size, self.peak_size
+        return stats
+
+    def __sub__(self, earlier: "MemoStats") -> "MemoStats":
+        # Calls made since the earlier stats of the same cache
+        stats = self.copy()
+        stats.hits -= earlier.hits
+        stats.misses -= earlier.misses
+        return stats
+
+    def __repr__(self):
+        return (
+            f"MemoStats({self.name}, hits={self.hits}, misses={self.misses}, "
+            f"size={self.size})"
+        )
+
+
+class Memo:
+    # Everything cached under one name. Functions memoized inside another are
+    # decorated again on every call; each new cache replaces the last one here,
+    # whose counts are kept in the totals.
+    def __init__(self, name: str, policy: str, max_size: int | None):
+        self.totals = MemoStats(name, policy, max_size)
+        self.cached = None
+        # scope() blocks currently open
+        self.depth = 0
+
+    def clear(self):
+        if self.cached is None:
+            return
+
+        info = self.cached.cache_info()
+        self.totals.hits += info.hits
+        self.totals.misses += info.misses
+        self.totals.peak_size = max(self.totals.peak_size, info.currsize)
+        self.cached.cache_clear()
+
+    @contextlib.contextmanager
+    def scope(self):
+        # Clear the cache as the outermost scope ends
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.clear()
+
+    def stats(self) -> MemoStats:
+        stats = self.totals.copy()
+        if self.cached is not None:
+            info = self.cached.cache_info()
+            stats.hits += info.hits
+            stats.misses += info.misses
+            stats.size = info.currsize
+            stats.peak_size = max(stats.peak_size, info.currsize)
+        return stats
+
+
+_memos: dict[str, Memo] = {}
+
+
+def memoize(policy: str = "unbounded", max_size: int | None = None, name=None):
+    # Cache a function's results by its (hashable) arguments:
+    #
+    #     @memoize(policy="lru", max_size=4096)
+    #     def apply_rules(stone: int) -> list[int]: ...
+    #
+    # The decorated function also has clear(), to drop everything cached, and
+    # stats(), for the hits, misses and size of every cache under its name. The
+    # name defaults to the function's module and qualified name.
+    #
+    # A scoped function also has scope(), to wrap around its outermost call:
+    #
+    #     with recurse.scope():
+    #         return recurse(design)
+    #
+    # Recursive calls go straight to the cache, with no wrapper in between, and
+    # the cache is emptied as the block ends.
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}, expected {', '.join(POLICIES)}")
+    if policy == "lru" and not max_size:
+        raise ValueError("The lru policy needs a max_size")
+
+    def decorate(func):
+        key = name or f"{func.__module__}.{func.__qualname__.replace('<locals>.', '')}"
+        memo = _memos.get(key)
+        if memo is None:
+            memo = _memos[key] = Memo(key, policy, max_size)
+        memo.clear()
+
+        # functools' C implementation does the caching and counting, so hits cost
+        # no more than with functools.cache
+        cached = functools.lru_cache(maxsize=max_size if policy == "lru" else None)(
+            func
+        )
+        memo.cached = cached
+
+        cached.clear = memo.clear
+        cached.stats = memo.stats
+        if policy == "scoped":
+            cached.scope = memo.scope
+        return cached
+
+    return decorate
+
+
+def snapshot() -> dict[str, MemoStats]:
+    return {name: memo.stats() for name, memo in _memos.items()}
+
+
+def changes(
+    after: dict[str, MemoStats], before: dict[str, MemoStats]
+) -> dict[str, MemoStats]:
+    # Stats of the caches that were called between two snapshots
+    changed = {}
+    for name, stats in after.items():
+        earlier = before.get(name)
+        delta = stats - earlier if earlier else stats
+        if delta.calls:
+            changed[name] = delta
+    return changed
+
+
+def format_memo_stats(stats: dict[str, MemoStats]) -> str:
+    width = max([len("cache")] + [len(name) for name in stats])
+    lines = [
+        f"  {'cache':<{width}}  {'policy':>9}  {'calls':>10}  {'hits':>10}  "
+        f"{'misses':>10}  {'hit rate':>8}  {'size':>8}  {'peak':>8}  {'max':>8}"
+    ]
+    for name, s in stats.items():
+        lines.append(
+            f"  {name:<{width}}  {s.policy:>9}  {s.calls:>10}  {s.hits:>10}  "
+            f"{s.misses:>10}  {s.hit_rate:>8.1%}  {s.size:>8}  {s.peak_size:>8}  "
+            f"{s.max_size or '':>8}"
+        )
+    return "\n".join(lines)
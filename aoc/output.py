@@ -0,0 +1,46 @@
+import contextlib
+import os
+from collections.abc import Callable
+
+# Set to 1 to silence the diagnostic output solvers print along the way: grids,
+# regions, expressions, ... Answers and the runner's own output are unaffected.
+ENV_VAR = "AOC_QUIET"
+
+# Overrides the environment when set, see quiet()
+_enabled: bool | None = None
+
+
+def enabled() -> bool:
+    if _enabled is not None:
+        return _enabled
+    return os.environ.get(ENV_VAR, "0") == "0"
+
+
+def emit(message: str | Callable[..., object] | object, *args):
+    # Print a diagnostic message, formatting it only if output is on:
+    #
+    #     emit("{}: {} * {} = {}", region_id, area, perimeter, price)
+    #     emit(grid_str, grid, path)  # calls grid_str(grid, path)
+    #     emit(grid)  # str(grid)
+    #
+    # Hot loops that would build the arguments themselves can check enabled()
+    # first.
+    if not enabled():
+        return
+
+    if callable(message):
+        message = message(*args)
+    elif args:
+        message = message.format(*args)
+    print(message)
+
+
+@contextlib.contextmanager
+def quiet(on: bool = True):
+    # Silence (or with on=False, force on) diagnostic output inside the block
+    global _enabled
+    previous, _enabled = _enabled, not on
+    try:
+        yield
+    finally:
+        _enabled = previous
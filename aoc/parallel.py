@@ -0,0 +1,162 @@
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from aoc import output
+from aoc.instrument import ProfileSettings
+from aoc.runner import ROOT, PartResult, run_part
+
+# Solve times from previous runs of the real inputs, used to start the slowest
+# jobs first
+ESTIMATES_FILE = ROOT / ".cache" / "run-times.json"
+
+
+class JobTimeout(BaseException):
+    # A BaseException so solvers catching Exception can't swallow it
+    pass
+
+
+def load_estimates(path: Path = ESTIMATES_FILE) -> dict[str, float]:
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_estimates(results: list[PartResult], path: Path = ESTIMATES_FILE):
+    estimates = load_estimates(path)
+    for r in results:
+        if not r.error:
+            estimates[f"{r.day}-{r.part}"] = r.total.wall
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(estimates, file, indent=2, sort_keys=True)
+
+
+def pool_context():
+    # Forked workers start with the day already imported, along with any tables
+    # it builds at import (like day21's paths), instead of each importing it again
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def default_workers(env_var: str) -> int:
+    # The number of workers set in env_var, or one for each CPU this process may
+    # run on
+    workers = os.environ.get(env_var)
+    if workers:
+        return max(1, int(workers))
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def schedule(
+    jobs: list[tuple[int, int]], estimates: dict[str, float]
+) -> list[tuple[int, int]]:
+    # Longest first, so a slow job doesn't start last and leave the other workers
+    # idle. Jobs never timed before could be anything, so they go first too.
+    return sorted(jobs, key=lambda job: -estimates.get(f"{job[0]}-{job[1]}", math.inf))
+
+
+def run_job(
+    day: int,
+    part: int,
+    input_path: str | None,
+    kwargs: dict[str, Any],
+    trace_memory: bool,
+    timeout: float | None,
+    profile: ProfileSettings | None = None,
+    search_stats: bool = False,
+    memo_stats: bool = False,
+) -> PartResult:
+    def on_alarm(signum, frame):
+        raise JobTimeout()
+
+    # The pool can't kill a single job, so the job times itself out. SIGALRM is
+    # Unix only; elsewhere jobs run to completion.
+    alarm = timeout and hasattr(signal, "setitimer")
+    if alarm:
+        signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        # Interleaved solver output from every worker would be unreadable
+        with (
+            output.quiet(),
+            open(os.devnull, "w") as devnull,
+            contextlib.redirect_stdout(devnull),
+        ):
+            return run_part(
+                day,
+                part,
+                input_path,
+                kwargs,
+                trace_memory,
+                profile,
+                search_stats,
+                memo_stats,
+            )
+    except JobTimeout:
+        return PartResult.failed(day, part, f"timed out after {timeout:g}s")
+    except Exception as e:
+        return PartResult.failed(day, part, f"{type(e).__name__}: {e}")
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def run_parallel(
+    jobs: list[tuple[int, int]],
+    input_path: str | None = None,
+    kwargs: dict[str, Any] | None = None,
+    trace_memory: bool = False,
+    workers: int | None = None,
+    timeout: float | None = None,
+    profile: ProfileSettings | None = None,
+    search_stats: bool = False,
+    memo_stats: bool = False,
+    on_result=None,
+) -> list[PartResult]:
+    kwargs = kwargs or {}
+    estimates = load_estimates()
+
+    # One process per job, so peak RSS belongs to that job alone and no state
+    # carries over between days
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = {
+            pool.submit(
+                run_job,
+                day,
+                part,
+                input_path,
+                kwargs,
+                trace_memory,
+                timeout,
+                profile,
+                search_stats,
+                memo_stats,
+            ): (day, part)
+            for day, part in schedule(jobs, estimates)
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died, e.g. killed for running out of memory
+                result = PartResult.failed(*futures[future], f"{type(e).__name__}: {e}")
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    return sorted(results, key=lambda r: (r.day, r.part))
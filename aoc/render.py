@@ -0,0 +1,130 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from aoc.grid import Grid
+
+CLEAR = "\x1b[2J\x1b[H"
+CLEAR_LINE = "\x1b[K"
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+
+# Changed cells at most this far apart are rewritten as one run, which is
+# shorter than the cursor move needed to skip the unchanged cells between them
+RUN_GAP = 4
+
+# Frame rate of recordings made without drawing to the terminal
+RECORD_FPS = 30
+
+
+def move_to(row: int, col: int) -> str:
+    return f"\x1b[{row + 1};{col + 1}H"
+
+
+class Renderer:
+    # Animates a grid in the terminal by keeping the previous frame and writing
+    # only the cells that changed, with ANSI cursor moves between runs.
+    #
+    # `fps` > 0 draws live, dropping frames that come sooner than 1 / fps after the
+    # last one, so a fast simulation isn't slowed down to the terminal's speed.
+    # `record` writes every frame that is drawn to an asciicast v2 file, which
+    # `python -m aoc play` or asciinema can replay. When recording without
+    # drawing live, no frames are dropped.
+    #
+    # A renderer with neither is disabled and falsy, so solvers can keep it in
+    # their loops behind `if renderer:`.
+    def __init__(self, fps: float = 0, record: str | Path | None = None, stream=None):
+        self.fps = fps
+        self.live = fps > 0
+        self.stream = stream or sys.stdout
+        self.record = open(record, "w") if record else None
+        self.previous: NDArray[np.uint8] | None = None
+        self.status = ""
+        self.frames = 0
+        self.start = time.perf_counter()
+        self.last_draw = -float("inf")
+
+    def __bool__(self):
+        return self.live or self.record is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def draw(self, frame: Grid | NDArray[np.uint8], status: str = "", force=False):
+        if not self:
+            return
+
+        now = time.perf_counter()
+        if self.live and not force and now - self.last_draw < 1 / self.fps:
+            return
+        self.last_draw = now
+
+        cells = frame.cells if isinstance(frame, Grid) else frame
+        out = self.diff(cells)
+        if status != self.status or self.frames == 0:
+            out += move_to(cells.shape[0], 0) + status + CLEAR_LINE
+            self.status = status
+
+        self.previous = cells.copy()
+        self.emit(out, now)
+        self.frames += 1
+
+    def diff(self, cells: NDArray[np.uint8]) -> str:
+        if self.previous is None or self.previous.shape != cells.shape:
+            rows = (row.tobytes().decode("latin-1") for row in cells)
+            return HIDE_CURSOR + CLEAR + "\r\n".join(rows)
+
+        changed = cells != self.previous
+        parts = []
+        for r in np.flatnonzero(changed.any(axis=1)):
+            cols = np.flatnonzero(changed[r])
+            for run in np.split(cols, np.flatnonzero(np.diff(cols) > RUN_GAP) + 1):
+                start, end = int(run[0]), int(run[-1]) + 1
+                text = cells[r, start:end].tobytes().decode("latin-1")
+                parts.append(move_to(r, start) + text)
+        return "".join(parts)
+
+    def emit(self, out: str, now: float):
+        if self.live:
+            self.stream.write(out)
+            self.stream.flush()
+
+        if self.record:
+            if self.frames == 0:
+                rows, cols = self.previous.shape
+                header = {"version": 2, "width": cols, "height": rows + 1}
+                self.record.write(json.dumps(header) + "\n")
+
+            elapsed = now - self.start if self.live else self.frames / RECORD_FPS
+            self.record.write(json.dumps([round(elapsed, 4), "o", out]) + "\n")
+
+    def close(self):
+        if self.frames:
+            rows = self.previous.shape[0]
+            self.emit(move_to(rows + 1, 0) + SHOW_CURSOR, time.perf_counter())
+        if self.record:
+            self.record.close()
+            self.record = None
+
+
+def play(path: str | Path, speed: float = 1.0, stream=None):
+    # Replay an asciicast recording at its recorded pace, scaled by `speed`
+    stream = stream or sys.stdout
+    start = time.perf_counter()
+    with open(path, "r") as file:
+        file.readline()  # header
+        for line in file:
+            elapsed, _, out = json.loads(line)
+            delay = elapsed / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+            stream.write(out)
+            stream.flush()
@@ -0,0 +1,278 @@
+import contextlib
+import importlib
+import inspect
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from aoc import memo, search
+from aoc.instrument import PhaseStats, ProfileSettings, phase, profiling
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = Path(__file__).resolve().parent.parent
+PARTS = (1, 2)
+
+# Shown for the parse time of parts that stream their input, whose parsing is
+# counted as solve time
+PARSE_IN_SOLVE = "in solve"
+
+
+class Timing:
+    def __init__(self, wall: float = 0.0, cpu: float = 0.0):
+        self.wall = wall
+        self.cpu = cpu
+
+    def __sub__(self, other):
+        return Timing(self.wall - other.wall, self.cpu - other.cpu)
+
+    def __repr__(self):
+        return f"Timing(wall={self.wall:.6f}, cpu={self.cpu:.6f})"
+
+
+class PartResult:
+    def __init__(
+        self,
+        day: int,
+        part: int,
+        answer: Any,
+        parse: Timing,
+        solve: Timing,
+        peak_memory: int,
+        error: str | None = None,
+        streamed: bool = False,
+    ):
+        self.day = day
+        self.part = part
+        self.answer = answer
+        self.parse = parse
+        self.solve = solve
+        self.peak_memory = peak_memory
+        self.error = error
+        # Read its input through stream_input rather than parse_input, so its
+        # parsing is counted in its solve time
+        self.streamed = streamed
+        # Filled in when the part runs with profiling on
+        self.phases: list[PhaseStats] = []
+        self.profile_files: list[Path] = []
+        # Filled in when the part runs with search stats on
+        self.search_stats: dict[str, search.SearchStats] = {}
+        # Filled in when the part runs with memo stats on
+        self.memo_stats: dict[str, memo.MemoStats] = {}
+
+    @classmethod
+    def failed(cls, day: int, part: int, error: str) -> "PartResult":
+        return cls(day, part, None, Timing(), Timing(), 0, error)
+
+    @property
+    def total(self) -> Timing:
+        return Timing(
+            self.parse.wall + self.solve.wall, self.parse.cpu + self.solve.cpu
+        )
+
+    def __repr__(self):
+        return f"day{self.day} part{self.part}: {self.answer}"
+
+
+class ParseTimer:
+    # Wraps a day's parse_input so time spent parsing can be split from solving.
+    # Only the outermost call is timed, so parsers that call each other aren't counted twice.
+    def __init__(self, parse):
+        self.parse = parse
+        self.timing = Timing()
+        self.depth = 0
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        self.depth += 1
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return self.parse(*args, **kwargs)
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.timing.wall += time.perf_counter() - wall
+                self.timing.cpu += time.process_time() - cpu
+
+
+def day_dir(day: int) -> Path:
+    return ROOT / f"day{day}"
+
+
+def default_input(day: int) -> Path:
+    return day_dir(day) / "input.txt"
+
+
+def discover_days() -> list[int]:
+    days = []
+    for path in ROOT.glob("day*/day*.py"):
+        match = re.fullmatch(r"day(\d+)", path.stem)
+        if match and path.parent.name == path.stem:
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def load_day(day: int) -> ModuleType:
+    directory = day_dir(day)
+    if not (directory / f"day{day}.py").exists():
+        raise ValueError(f"No solver found for day {day}")
+
+    # Each day is imported as dayN.dayN, the module `python -m dayN.dayN` runs, so
+    # it imports its helpers relative to itself (e.g. `from .paths import ...`) and
+    # same-named helpers of different days never clash
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+    return importlib.import_module(f"day{day}.day{day}")
+
+
+def parts_of(module: ModuleType) -> list[int]:
+    return [p for p in PARTS if hasattr(module, f"part{p}")]
+
+
+def peak_rss() -> int:
+    if resource is None:
+        return 0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_part(
+    day: int,
+    part: int,
+    input_path: str | Path | None = None,
+    kwargs: dict[str, Any] | None = None,
+    trace_memory: bool = False,
+    profile: ProfileSettings | None = None,
+    search_stats: bool = False,
+    memo_stats: bool = False,
+) -> PartResult:
+    module = load_day(day)
+    solve = getattr(module, f"part{part}", None)
+    if solve is None:
+        raise ValueError(f"Day {day} has no part {part}")
+
+    input_path = Path(input_path) if input_path else default_input(day)
+
+    # Only pass the extra arguments this part takes, so one set of -k flags can
+    # cover several parts
+    params = inspect.signature(solve).parameters
+    kwargs = {k: v for k, v in (kwargs or {}).items() if k in params}
+
+    profile = profile or ProfileSettings.from_env()
+
+    # Days that only stream their input have no parse_input to time. Their
+    # stream_input is wrapped just to count calls: it returns a generator, and the
+    # records are parsed as the solver goes through them.
+    parse_input = getattr(module, "parse_input", None)
+    stream_input = getattr(module, "stream_input", None)
+    timer, streams = ParseTimer(parse_input), ParseTimer(stream_input)
+    if parse_input:
+        module.parse_input = phase("parse")(timer) if profile else timer
+    if stream_input:
+        module.stream_input = streams
+
+    if trace_memory:
+        tracemalloc.start()
+    memos = memo.snapshot() if memo_stats else None
+
+    try:
+        with (
+            profiling(profile) if profile else contextlib.nullcontext() as profiler,
+            search.collecting() if search_stats else contextlib.nullcontext() as stats,
+        ):
+            wall, cpu = time.perf_counter(), time.process_time()
+            with phase("solve"):
+                answer = solve(str(input_path), **kwargs)
+            total = Timing(time.perf_counter() - wall, time.process_time() - cpu)
+    finally:
+        if parse_input:
+            module.parse_input = parse_input
+        if stream_input:
+            module.stream_input = stream_input
+        if trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    if not trace_memory:
+        peak_memory = peak_rss()
+
+    result = PartResult(
+        day,
+        part,
+        answer,
+        timer.timing,
+        total - timer.timing,
+        peak_memory,
+        streamed=bool(streams.calls) and not timer.calls,
+    )
+    if profiler:
+        result.phases = list(profiler.phases.values())
+        result.profile_files = profiler.dump(f"day{day}-part{part}")
+    if stats:
+        result.search_stats = stats
+    if memos is not None:
+        result.memo_stats = memo.changes(memo.snapshot(), memos)
+    return result
+
+
+def format_memory(num_bytes: int) -> str:
+    for unit in ["B", "KiB", "MiB"]:
+        if num_bytes < 1024:
+            return (
+                f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+            )
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GiB"
+
+
+def format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}"
+
+
+def format_results(results: list[PartResult], memory_label: str = "peak rss") -> str:
+    header = [
+        "day",
+        "part",
+        "answer",
+        "parse ms",
+        "parse cpu",
+        "solve ms",
+        "solve cpu",
+        memory_label,
+    ]
+    rows = [header]
+    for r in results:
+        rows.append(
+            [
+                str(r.day),
+                str(r.part),
+                f"error: {r.error}" if r.error else str(r.answer),
+                PARSE_IN_SOLVE if r.streamed else format_ms(r.parse.wall),
+                PARSE_IN_SOLVE if r.streamed else format_ms(r.parse.cpu),
+                format_ms(r.solve.wall),
+                format_ms(r.solve.cpu),
+                format_memory(r.peak_memory),
+            ]
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = []
+    for row in rows:
+        # Left-align text columns, right-align numbers
+        cells = [
+            cell.ljust(w) if i == 2 else cell.rjust(w)
+            for i, (cell, w) in enumerate(zip(row, widths))
+        ]
+        lines.append("  ".join(cells))
+    return "\n".join(lines)
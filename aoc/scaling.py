@@ -0,0 +1,164 @@
+import math
+import statistics
+
+from aoc import difftest
+from aoc.bench import BenchResult, run_ladder
+from aoc.generators import generate
+from aoc.runner import format_ms
+
+# Exponent k in time ~ bytes^k that a solver is expected to stay within, keyed
+# "day-part" for whole parts and by case name for the functions in
+# aoc/difftest.py. Anything not listed is expected to be linear.
+EXPECTED: dict[str, float] = {
+    # Every update is checked against every ordering rule
+    "5-1": 2.0,
+    "5-2": 2.0,
+    # Every design tries every towel pattern
+    "19-1": 2.0,
+    "19-2": 2.0,
+    # Every lock is tried against every key
+    "25-1": 2.0,
+    # Rescans the blocks for free space for every file
+    "day9.defrag_files_reference": 2.0,
+}
+
+DEFAULT_EXPECTED = 1.0
+
+# How far over its expected exponent a fit may come before it's flagged. Fits
+# over a few points are noisy, and n log n fits a little over 1.
+DEFAULT_TOLERANCE = 0.25
+
+# Runs shorter than this are mostly process and interpreter overhead, which
+# doesn't grow with the input and would flatten the fit
+MIN_TIME = 0.01
+
+MIN_POINTS = 3
+
+# Fits explaining less of the variation than this are mostly timing noise, and
+# aren't held to the expected exponent
+MIN_R_SQUARED = 0.8
+
+
+def geometric_ladder(start: float, factor: float, steps: int) -> list[float]:
+    return [start * factor**i for i in range(steps)]
+
+
+def fit_exponent(points: list[tuple[int, float]]) -> tuple[float, float] | None:
+    # Least squares fit of log(time) = k * log(bytes) + c, as (k, r squared), or
+    # None without enough points that took long enough to measure
+    points = [(size, time) for size, time in points if time >= MIN_TIME and size > 0]
+    if len({size for size, _ in points}) < MIN_POINTS:
+        return None
+
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(time) for _, time in points]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+
+    k = sxy / sxx
+    r_squared = sxy * sxy / (sxx * syy) if syy > 0 else 1.0
+    return (k, r_squared)
+
+
+class Scaling:
+    # How one solver's time grew over a ladder of input sizes
+    def __init__(
+        self,
+        name: str,
+        points: list[tuple[int, float]],
+        error: str | None = None,
+    ):
+        self.name = name
+        # (input bytes, median seconds) for each size that finished
+        self.points = points
+        # Why the ladder stopped early, if it did
+        self.error = error
+        self.expected = EXPECTED.get(name, DEFAULT_EXPECTED)
+        self.fit = fit_exponent(points)
+
+    @property
+    def noisy(self) -> bool:
+        return self.fit is not None and self.fit[1] < MIN_R_SQUARED
+
+    def exceeds(self, tolerance: float = DEFAULT_TOLERANCE) -> bool:
+        if self.fit is None or self.noisy:
+            return False
+        return self.fit[0] > self.expected + tolerance
+
+
+def scale_part(
+    day: int,
+    part: int,
+    scales: list[float],
+    seed: int = 0,
+    repeat: int = 1,
+    timeout: float = 10.0,
+    on_result=None,
+) -> Scaling:
+    results: list[BenchResult] = run_ladder(
+        day, part, scales, seed, repeat, timeout, on_result
+    )
+    points = [(r.input_bytes, r.median) for r in results if not r.error]
+    errors = [r.error for r in results if r.error]
+    return Scaling(f"{day}-{part}", points, errors[0] if errors else None)
+
+
+def scale_case(
+    case: difftest.Case,
+    scales: list[float],
+    seed: int = 0,
+    repeat: int = 1,
+    timeout: float = 10.0,
+) -> tuple[Scaling, Scaling]:
+    # A difftest case's reference and optimized functions over the same ladder,
+    # timed in this process. The ladder stops once a size takes longer than the
+    # timeout, though that size itself can't be cut short.
+    reference, optimized = [], []
+    error = None
+    for scale in sorted(scales):
+        result = difftest.run_case(case, range(seed, seed + repeat), scale)
+        if result.mismatches:
+            error = f"scale {scale:g}: {result.mismatches[0][1]}"
+            break
+
+        size = len(generate(case.day, scale, seed)[0])
+        reference.append((size, statistics.median(result.reference_times)))
+        optimized.append((size, statistics.median(result.optimized_times)))
+        if max(result.reference_times + result.optimized_times) > timeout:
+            break
+
+    return (
+        Scaling(f"day{case.day}.{case.reference}", reference, error),
+        Scaling(case.name, optimized, error),
+    )
+
+
+def format_scaling_header() -> str:
+    return (
+        f"{'solver':<46}  {'points':>6}  {'smallest':>10}  {'largest':>10}  "
+        f"{'exponent':>8}  {'r^2':>5}  {'expected':>8}  result"
+    )
+
+
+def format_scaling(s: Scaling, tolerance: float = DEFAULT_TOLERANCE) -> str:
+    line = f"{s.name:<46}  {len(s.points):>6}  "
+    if s.points:
+        line += f"{format_ms(s.points[0][1]):>10}  {format_ms(s.points[-1][1]):>10}  "
+    else:
+        line += f"{'':>10}  {'':>10}  "
+
+    if s.fit:
+        exponent, r_squared = s.fit
+        line += f"{exponent:>8.2f}  {r_squared:>5.2f}  {s.expected:>8g}  "
+        if s.noisy:
+            line += "noisy fit"
+        else:
+            line += "WORSE THAN EXPECTED" if s.exceeds(tolerance) else "ok"
+    else:
+        line += f"{'':>8}  {'':>5}  {s.expected:>8g}  too few timed points"
+
+    if s.error:
+        line += f" (stopped: {s.error})"
+    return line
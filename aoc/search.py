@@ -0,0 +1,302 @@
+import contextlib
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable
+
+# Callbacks a search is built from. Nodes can be anything hashable: grid points,
+# (point, heading) states, packed ints, ...
+type Goal[T] = Callable[[T], bool]
+type Heuristic[T] = Callable[[T], float]
+type Neighbors[T] = Callable[[T], Iterable[T]]
+type WeightedNeighbors[T] = Callable[[T], Iterable[tuple[T, float]]]
+type OnExpand[T] = Callable[[T], None]
+
+
+class SearchStats:
+    # Counters a search fills in when one is passed to it. Each search only counts
+    # what applies to it: memoized recursions count cache hits and misses, heap
+    # searches pushes and pops, and so on.
+    def __init__(self):
+        # Times a search was run with these stats, see stats()
+        self.searches = 0
+        self.expanded = 0
+        self.pushed = 0
+        self.popped = 0
+        self.decreased = 0
+        self.hits = 0
+        self.misses = 0
+        # Largest the queue, stack or recursion depth got
+        self.max_frontier = 0
+
+    def frontier(self, size: int):
+        if size > self.max_frontier:
+            self.max_frontier = size
+
+    def counts(self) -> dict[str, int]:
+        return dict(vars(self))
+
+    def __repr__(self):
+        counts = ", ".join(f"{k}={v}" for k, v in self.counts().items())
+        return f"SearchStats({counts})"
+
+
+# Stats of the searches run inside collecting(), by name
+_collected: dict[str, SearchStats] | None = None
+
+
+def stats(name: str) -> SearchStats | None:
+    # The stats a named search adds to, or None unless something is collecting.
+    # Searches fetch them once per run and only count when they aren't None, so
+    # they cost next to nothing otherwise:
+    #
+    #     stats = search.stats("day10.trailhead_score")
+    #     ...
+    #     if stats is not None:
+    #         stats.expanded += 1
+    if _collected is None:
+        return None
+
+    named = _collected.get(name)
+    if named is None:
+        named = _collected[name] = SearchStats()
+    named.searches += 1
+    return named
+
+
+@contextlib.contextmanager
+def collecting():
+    # Collect the stats of every search run inside the block
+    global _collected
+    collected: dict[str, SearchStats] = {}
+    previous, _collected = _collected, collected
+    try:
+        yield collected
+    finally:
+        _collected = previous
+
+
+def format_search_stats(collected: dict[str, SearchStats]) -> str:
+    columns = list(SearchStats().counts())
+    width = max([len("search")] + [len(name) for name in collected])
+    lines = [
+        f"  {'search':<{width}}  "
+        + "  ".join(f"{c.replace('_', ' '):>12}" for c in columns)
+    ]
+    for name, s in collected.items():
+        counts = s.counts()
+        lines.append(
+            f"  {name:<{width}}  " + "  ".join(f"{counts[c]:>12}" for c in columns)
+        )
+    return "\n".join(lines)
+
+
+class SearchResult[T: Hashable]:
+    def __init__(
+        self,
+        start: T,
+        cost: dict[T, float],
+        parent: dict[T, T],
+        goal: T | None,
+    ):
+        self.start = start
+        self.cost = cost
+        self.parent = parent
+        self.goal = goal
+
+    @property
+    def found(self) -> bool:
+        return self.goal is not None
+
+    def path(self, node: T | None = None) -> list[T]:
+        # Start-to-node path rebuilt from parent pointers, or [] if node was never
+        # reached. Defaults to the goal the search stopped at.
+        node = self.goal if node is None else node
+        if node is None or node not in self.cost:
+            return []
+
+        path = [node]
+        while node in self.parent:
+            node = self.parent[node]
+            path.append(node)
+        return path[::-1]
+
+
+class IndexedHeap[T: Hashable]:
+    # Binary min-heap that tracks where each item sits, so an item already in the
+    # queue can have its priority lowered in place (decrease-key). Compared to
+    # heapq with lazy deletion, the queue never holds stale duplicates and
+    # membership checks are a dict lookup. Only priorities are ever compared.
+    def __init__(self):
+        self.entries: list[tuple[float, T]] = []
+        self.positions: dict[T, int] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self.positions
+
+    def priority(self, item: T) -> float:
+        return self.entries[self.positions[item]][0]
+
+    def push(self, item: T, priority: float) -> bool:
+        # Insert item, or lower its priority if it is already queued. Returns
+        # whether the item was already queued.
+        i = self.positions.get(item)
+        if i is None:
+            self.entries.append((priority, item))
+            self._sift_up(len(self.entries) - 1)
+            return False
+
+        if priority < self.entries[i][0]:
+            self.entries[i] = (priority, item)
+            self._sift_up(i)
+        return True
+
+    def pop(self) -> tuple[T, float]:
+        last = self.entries.pop()
+        if not self.entries:
+            del self.positions[last[1]]
+            return (last[1], last[0])
+
+        priority, item = self.entries[0]
+        del self.positions[item]
+        self.entries[0] = last
+        self._sift_down(0)
+        return (item, priority)
+
+    def _sift_up(self, i: int):
+        entries, positions = self.entries, self.positions
+        entry = entries[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            parent_entry = entries[parent]
+            if entry[0] >= parent_entry[0]:
+                break
+            entries[i] = parent_entry
+            positions[parent_entry[1]] = i
+            i = parent
+        entries[i] = entry
+        positions[entry[1]] = i
+
+    def _sift_down(self, i: int):
+        entries, positions = self.entries, self.positions
+        n = len(entries)
+        entry = entries[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and entries[child + 1][0] < entries[child][0]:
+                child += 1
+            if entries[child][0] >= entry[0]:
+                break
+            entries[i] = entries[child]
+            positions[entries[i][1]] = i
+            i = child
+        entries[i] = entry
+        positions[entry[1]] = i
+
+
+def bfs[T: Hashable](
+    start: T,
+    neighbors: Neighbors[T],
+    goal: Goal[T] | None = None,
+    stats: SearchStats | None = None,
+    on_expand: OnExpand[T] | None = None,
+) -> SearchResult[T]:
+    # Unit-cost search. Without a goal, every reachable node gets a distance.
+    cost = {start: 0}
+    parent: dict[T, T] = {}
+
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if stats is not None:
+            stats.popped += 1
+            stats.expanded += 1
+        if on_expand is not None:
+            on_expand(node)
+
+        if goal is not None and goal(node):
+            return SearchResult(start, cost, parent, node)
+
+        next_cost = cost[node] + 1
+        for neighbor in neighbors(node):
+            if neighbor in cost:
+                continue
+
+            cost[neighbor] = next_cost
+            parent[neighbor] = node
+            queue.append(neighbor)
+            if stats is not None:
+                stats.pushed += 1
+
+        if stats is not None:
+            stats.frontier(len(queue))
+
+    return SearchResult(start, cost, parent, None)
+
+
+def a_star[T: Hashable](
+    start: T,
+    neighbors: WeightedNeighbors[T],
+    goal: Goal[T] | None = None,
+    heuristic: Heuristic[T] | None = None,
+    stats: SearchStats | None = None,
+    on_expand: OnExpand[T] | None = None,
+) -> SearchResult[T]:
+    # Best-first search over non-negative edge costs. The heuristic must be
+    # consistent, since nodes are closed the first time they are popped.
+    cost = {start: 0}
+    parent: dict[T, T] = {}
+    closed: set[T] = set()
+
+    open_set = IndexedHeap()
+    open_set.push(start, heuristic(start) if heuristic else 0)
+    while open_set:
+        node, _ = open_set.pop()
+        closed.add(node)
+        if stats is not None:
+            stats.popped += 1
+            stats.expanded += 1
+        if on_expand is not None:
+            on_expand(node)
+
+        if goal is not None and goal(node):
+            return SearchResult(start, cost, parent, node)
+
+        node_cost = cost[node]
+        for neighbor, step_cost in neighbors(node):
+            if neighbor in closed:
+                continue
+
+            tentative_cost = node_cost + step_cost
+            if tentative_cost < cost.get(neighbor, float("inf")):
+                cost[neighbor] = tentative_cost
+                parent[neighbor] = node
+
+                priority = tentative_cost
+                if heuristic:
+                    priority += heuristic(neighbor)
+
+                queued = open_set.push(neighbor, priority)
+                if stats is not None:
+                    if queued:
+                        stats.decreased += 1
+                    else:
+                        stats.pushed += 1
+
+        if stats is not None:
+            stats.frontier(len(open_set))
+
+    return SearchResult(start, cost, parent, None)
+
+
+def dijkstra[T: Hashable](
+    start: T,
+    neighbors: WeightedNeighbors[T],
+    goal: Goal[T] | None = None,
+    stats: SearchStats | None = None,
+    on_expand: OnExpand[T] | None = None,
+) -> SearchResult[T]:
+    return a_star(start, neighbors, goal, None, stats, on_expand)
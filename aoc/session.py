@@ -0,0 +1,58 @@
+import contextlib
+import functools
+
+# The session shared steps are memoized in, if one is open
+_session: "Session | None" = None
+
+
+class Session:
+    # Results of @shared steps, kept while both parts of a day run on one input
+    def __init__(self):
+        self.values: dict[tuple, object] = {}
+        self.hits = 0
+        self.misses = 0
+
+
+@contextlib.contextmanager
+def session():
+    # Share the results of @shared steps between everything run inside the block.
+    # Sessions don't nest; an inner one shares with the outer.
+    global _session
+    if _session is not None:
+        yield _session
+        return
+
+    _session = Session()
+    try:
+        yield _session
+    finally:
+        _session = None
+
+
+def shared(func):
+    # Mark a step both parts of a day need, e.g. parsing plus a simulation:
+    #
+    #     @shared
+    #     def guard_path(f: str) -> tuple[Grid, Grid]: ...
+    #
+    # Inside a session, the first call computes the result and later calls with
+    # the same arguments return it as is, so parts must not modify it. Outside a
+    # session every call computes a fresh result, like an undecorated function.
+    @functools.wraps(func)
+    def wrapper(*args):
+        current = _session
+        if current is None:
+            return func(*args)
+
+        key = (func.__module__, func.__qualname__, args)
+        try:
+            value = current.values[key]
+        except KeyError:
+            current.misses += 1
+            value = current.values[key] = func(*args)
+            return value
+
+        current.hits += 1
+        return value
+
+    return wrapper
@@ -0,0 +1,24 @@
+from collections.abc import Callable, Iterator
+
+
+def lines(f: str) -> Iterator[str]:
+    # The non-blank lines of f one at a time, stripped. Only the current line is
+    # ever held in memory.
+    with open(f, "r") as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def records[T](f: str, parse_line: Callable[[str], T]) -> Iterator[T]:
+    # f parsed a line at a time, for solvers that need each record only once:
+    #
+    #     def stream_input(f: str) -> Iterator[list[int]]:
+    #         return records(f, parse_report)
+    #
+    #     num_safe = sum(1 for report in stream_input(f) if is_safe(report))
+    #
+    # Records aren't cached like parse_input's results, and parsing them counts
+    # as solve time in the runner, since it happens as the solver goes.
+    return map(parse_line, lines(f))
@@ -0,0 +1,230 @@
+import math
+import multiprocessing
+import sys
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any
+
+from aoc import output
+from aoc.checkpoint import Checkpoint
+from aoc.parallel import default_workers, pool_context
+
+# first: the match at the lowest index, checking no candidates past it once found
+# min: the match with the smallest key, ties going to the lowest index
+# all: every match, in candidate order
+REDUCTIONS = ("first", "min", "all")
+
+# Workers when a sweep isn't given a number, e.g. AOC_SWEEP_JOBS=4
+ENV_VAR = "AOC_SWEEP_JOBS"
+
+# Chunks are at most this many candidates, so progress, checkpoints and
+# cancellation aren't held up by one huge chunk
+MAX_CHUNK = 4096
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 1.0
+
+# Checks a candidate, returning None if it isn't a match
+type Check = Callable[[Any], Any]
+# (candidate index, value the check returned)
+type Match = tuple[int, Any]
+
+# What the workers sweep over. Forked workers inherit these rather than having
+# them pickled, so checks can be closures over the solver's state, and each
+# chunk is sent as just its start and stop.
+_candidates: Sequence = ()
+_check: Check | None = None
+_key: Callable[[Any], Any] | None = None
+# Index no worker needs to check past, lowered as earlier first matches are found
+_stop = None
+
+
+def better(a: Match | None, b: Match) -> bool:
+    # Whether b beats a for min, earlier candidates winning ties
+    return a is None or (_key(b[1]), b[0]) < (_key(a[1]), a[0])
+
+
+def check_chunk(start: int, stop: int, reduce: str) -> list[Match]:
+    # Matches found in candidates[start:stop], reduced as far as this chunk allows
+    matches: list[Match] = []
+    for i in range(start, stop):
+        if reduce == "first" and i >= _stop.value:
+            break
+
+        value = _check(_candidates[i])
+        if value is None:
+            continue
+
+        match = (i, value)
+        if reduce == "first":
+            return [match]
+        if reduce == "all":
+            matches.append(match)
+        elif not matches or better(matches[0], match):
+            matches[:] = [match]
+    return matches
+
+
+class Progress:
+    # Candidates checked so far and a linear estimate of the time left, printed to
+    # stderr with the solvers' other diagnostics
+    def __init__(self, name: str, total: int, done: int = 0):
+        self.name = name
+        self.total = total
+        self.done = done
+        self.resumed = done
+        self.started = time.monotonic()
+        self.last_report = self.started
+
+    @property
+    def eta(self) -> float | None:
+        checked = self.done - self.resumed
+        if not checked:
+            return None
+        elapsed = time.monotonic() - self.started
+        return elapsed / checked * (self.total - self.done)
+
+    def advance(self, checked: int):
+        self.done += checked
+        now = time.monotonic()
+        if output.enabled() and now - self.last_report >= PROGRESS_INTERVAL:
+            self.last_report = now
+            print(self, file=sys.stderr, flush=True)
+
+    def __str__(self):
+        eta = self.eta
+        return (
+            f"{self.name}: {self.done}/{self.total} "
+            f"({self.done / self.total if self.total else 1:.1%}), "
+            f"{time.monotonic() - self.started:.1f}s elapsed"
+            + (f", about {eta:.1f}s left" if eta is not None else "")
+        )
+
+
+class Accumulator:
+    # Chunks finish out of order, so their matches are folded in only once every
+    # chunk before them has finished. What's folded in so far is all a checkpoint
+    # needs to resume from.
+    def __init__(self, reduce: str, start: int, matches: list[Match]):
+        self.reduce = reduce
+        self.folded_to = start
+        self.matches = matches
+        self.pending: dict[int, tuple[int, list[Match]]] = {}
+
+    def add(self, start: int, stop: int, matches: list[Match]):
+        self.pending[start] = (stop, matches)
+        while self.folded_to in self.pending:
+            stop, matches = self.pending.pop(self.folded_to)
+            self.fold(matches)
+            self.folded_to = stop
+
+    def fold(self, matches: list[Match]):
+        if self.reduce == "all":
+            self.matches.extend(matches)
+        elif self.reduce == "first":
+            self.matches = self.matches or matches
+        elif matches and (not self.matches or better(self.matches[0], matches[0])):
+            self.matches = matches
+
+    def finish(self) -> list[Match]:
+        # Chunks left pending were cancelled after a first match, and can only
+        # hold matches past it
+        for start in sorted(self.pending):
+            self.fold(self.pending[start][1])
+        return self.matches
+
+
+def sweep(
+    candidates: Sequence,
+    check: Check,
+    reduce: str = "first",
+    key: Callable[[Any], Any] | None = None,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    checkpoint: Checkpoint | None = None,
+    name: str = "sweep",
+) -> list[Match]:
+    # Check every candidate in a sequence (a list, a range, ...) over a pool of
+    # processes, a chunk of consecutive candidates at a time:
+    #
+    #     def check(pair):
+    #         return pair if run_graph(swapped(graph, *pair), signals) == 64 else None
+    #
+    #     for i, pair in sweep(pairs, check, reduce="all", workers=jobs):
+    #         ...
+    #
+    # Returns the (index, value) of each match the reduction keeps: at most one for
+    # first and min (compared by key(value)), all of them for all. workers=1 checks
+    # in this process. A checkpoint saves the matches of every chunk finished so
+    # far, and a resumed sweep starts after them.
+    global _candidates, _check, _key, _stop
+    if reduce not in REDUCTIONS:
+        raise ValueError(
+            f"Unknown reduction {reduce!r}, expected {', '.join(REDUCTIONS)}"
+        )
+
+    total = len(candidates)
+    # Checks can't be sent to spawned workers, only inherited by forked ones
+    workers = (workers or default_workers(ENV_VAR)) if pool_context() else 1
+    chunk_size = chunk_size or max(1, min(MAX_CHUNK, math.ceil(total / (workers * 8))))
+    checkpoint = checkpoint or Checkpoint(name, on=False)
+    start, matches = checkpoint.load((0, []))
+
+    _candidates, _check, _key = candidates, check, key or (lambda value: value)
+    # Shared with the workers without a lock: it only ever goes down, and a
+    # worker reading a stale value just checks a few more candidates
+    _stop = multiprocessing.RawValue("q", total)
+    if reduce == "first" and matches:
+        _stop.value = matches[0][0]
+
+    progress = Progress(name, total, start)
+    accumulator = Accumulator(reduce, start, matches)
+    chunks = ((i, min(i + chunk_size, total)) for i in range(start, total, chunk_size))
+
+    def done(start: int, stop: int, matches: list[Match]):
+        if reduce == "first" and matches:
+            _stop.value = min(_stop.value, matches[0][0])
+        accumulator.add(start, stop, matches)
+        progress.advance(stop - start)
+        if checkpoint.due():
+            checkpoint.save((accumulator.folded_to, accumulator.matches))
+
+    try:
+        if workers == 1:
+            for chunk in chunks:
+                if chunk[0] >= _stop.value:
+                    break
+                done(*chunk, check_chunk(*chunk, reduce))
+        else:
+            sweep_pool(chunks, reduce, workers, done)
+        matches = accumulator.finish()
+    finally:
+        _candidates, _check, _key = (), None, None
+
+    checkpoint.clear()
+    return matches
+
+
+def sweep_pool(chunks, reduce: str, workers: int, done):
+    # Keep a couple of chunks per worker queued, submitting more in order as they
+    # finish, so nothing past a first match is ever started
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as pool:
+        running: dict[Future, tuple[int, int]] = {}
+
+        def submit() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None or chunk[0] >= _stop.value:
+                return False
+            running[pool.submit(check_chunk, *chunk, reduce)] = chunk
+            return True
+
+        while len(running) < workers * 2 and submit():
+            pass
+
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done(*running.pop(future), future.result())
+            while len(running) < workers * 2 and submit():
+                pass
@@ -0,0 +1,57 @@
+_set = object.__setattr__
+
+
+class Vector2D:
+    # Immutable, so vectors can be shared freely and used as dict/set keys
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: int, y: int):
+        _set(self, "x", x)
+        _set(self, "y", y)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Vector2D is immutable")
+
+    def __add__(self, other):
+        return Vector2D(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other):
+        return Vector2D(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, scalar):
+        return Vector2D(self.x * scalar, self.y * scalar)
+
+    def __eq__(self, other):
+        if not isinstance(other, Vector2D):
+            return NotImplemented
+
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __reduce__(self):
+        return (Vector2D, (self.x, self.y))
+
+    def __repr__(self):
+        return f"({self.x}, {self.y})"
+
+    def pack(self, width: int) -> int:
+        return pack(self.x, self.y, width)
+
+    @classmethod
+    def unpack(cls, index: int, width: int) -> "Vector2D":
+        return cls(*unpack(index, width))
+
+
+# Packed coordinates encode a point on a grid `width` columns wide as the single
+# int y * width + x, the same flat index Grid uses. Hot loops can add packed
+# offsets (dy * width + dx) instead of allocating a Vector2D per step, as long as
+# they never step off the grid, which would wrap into a neighboring row.
+def pack(x: int, y: int, width: int) -> int:
+    return y * width + x
+
+
+def unpack(index: int, width: int) -> tuple[int, int]:
+    y, x = divmod(index, width)
+    return (x, y)
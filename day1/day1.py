@@ -1,32 +1,48 @@
 from typing import List, Tuple
 
-def parse_input() -> Tuple[List[int], List[int]]:
-    with open("input.txt", "r") as file:
-        lines = file.readlines()
-        
-    left = []
-    right = []
-    for line in lines:
-        parts = line.split()
-        
-        left.append(int(parts[0]))
-        right.append(int(parts[1]))
+from aoc.backend import choose
+from aoc.cache import cached_parse
+from aoc.ints import read_ints
+from aoc.runner import default_input
+from aoc.session import session, shared
+
+@cached_parse(version=2)
+def parse_input(f: str) -> Tuple[List[int], List[int]]:
+    left, right = read_ints(f).table(2).T
+    return [left.tolist(), right.tolist()]
 
+@shared
+def sorted_lists(f: str) -> Tuple[List[int], List[int]]:
+    left, right = parse_input(f)
     left.sort()
     right.sort()
-    return [left, right]
+    return (left, right)
+
+@shared
+def sorted_arrays(f: str):
+    import numpy as np
+
+    left, right = parse_input(f)
+    return (np.sort(np.array(left)), np.sort(np.array(right)))
+
+def part1(f: str = "input.txt", backend: str = "auto"):
+    if choose(1, 1, f, backend) == "numpy":
+        left, right = sorted_arrays(f)
+        return int(abs(left - right).sum())
 
-def part1():    
-    left, right = parse_input()
+    left, right = sorted_lists(f)
     total_diff = 0
     for i in range(len(left)):
         diff = abs(left[i] - right[i])
         total_diff += diff
 
-    print(total_diff)
+    return total_diff
     
-def part2():
-    left, right = parse_input()
+def part2(f: str = "input.txt", backend: str = "auto"):
+    if choose(1, 2, f, backend) == "numpy":
+        return similarity_numpy(*sorted_arrays(f))
+
+    left, right = sorted_lists(f)
     
     right_frequency_map = {}
     for r in right:
@@ -40,4 +56,23 @@ def part2():
         similarity_score = l * right_frequency_map[l] if l in right_frequency_map else 0
         total_similarity += similarity_score
     
-    print(total_similarity)
\ No newline at end of file
+    return total_similarity
+
+def similarity_numpy(left, right) -> int:
+    import numpy as np
+
+    values, counts = np.unique(right, return_counts=True)
+    if not len(values):
+        return 0
+
+    # Index of each left number among the distinct right ones, if it's there at all
+    idx = np.minimum(np.searchsorted(values, left), len(values) - 1)
+    found = values[idx] == left
+    return int((left[found] * counts[idx[found]]).sum())
+
+
+if __name__ == "__main__":
+    f = default_input(1)
+    with session():
+        print(part1(f))
+        print(part2(f))
@@ -1,49 +1,32 @@
-from copy import deepcopy
-from enum import Enum
 from typing import List, Tuple
 
-type Grid = List[List[int]]
+from aoc import search
+from aoc.cache import cached_parse
+from aoc.grid import Grid
+from aoc.output import emit
+from aoc.runner import default_input
+
 type Location = Tuple[int, int]
 
+# Heights are read straight from the character bytes. Impassable "." tiles come
+# out negative, so they never continue a trail.
+ZERO = ord("0")
 
-def debug_path(map, path):
-    def map_str(map: Grid):
-        s = ""
-        for row in map:
-            for col in row:
-                s += str(col)
-            s += "\n"
-        return s
 
-    path_map = [["." for _ in r] for r in map]
-    for i, p in enumerate(path):
-        path_map[p[0]][p[1]] = map[p[0]][p[1]]
-    print(map_str(path_map))
+def debug_path(map: Grid, path):
+    path_map = Grid.full(map.shape, ".")
+    for p in path:
+        path_map[p] = map[p]
+    emit(path_map)
 
 
+@cached_parse()
 def parse_input(f) -> Grid:
-    with open(f, "r") as file:
-        lines = file.readlines()
-
-    map = [[int(c) if c != "." else -1 for c in line.strip()] for line in lines]
-    return map
-
-
-def in_bounds(loc: Location, grid: Grid) -> bool:
-    rows, cols = len(grid), len(grid[0])
-    return 0 <= loc[0] < rows and 0 <= loc[1] < cols
+    return Grid.from_file(f)
 
 
 def find_trailheads(map: Grid) -> List[Location]:
-    trailheads: List[Location] = []
-
-    rows, cols = len(map), len(map[0])
-    for i in range(rows):
-        for j in range(cols):
-            if map[i][j] == 0:
-                trailheads.append((i, j))
-
-    return trailheads
+    return map.find_all("0")
 
 
 def trailhead_score(map: Grid, trailhead: Location, unique: bool = False) -> int:
@@ -56,19 +39,22 @@ def trailhead_score(map: Grid, trailhead: Location, unique: bool = False) -> int
 
     visited = set()
     score = 0
+    stats = search.stats("day10.trailhead_score")
 
     def recurse(loc, prev_height, path) -> int:
         nonlocal score
 
         # Already visited
         if loc in visited:
+            if stats is not None:
+                stats.hits += 1
             return
 
         # Out of bounds
-        if not in_bounds(loc, map):
+        if not map.in_bounds(loc):
             return
 
-        height = map[loc[0]][loc[1]]
+        height = map.view[loc] - ZERO
 
         # Must be increasing by 1 each step
         if height - prev_height != 1:
@@ -76,6 +62,9 @@ def trailhead_score(map: Grid, trailhead: Location, unique: bool = False) -> int
 
         visited.add(loc)
         path.append(loc)
+        if stats is not None:
+            stats.expanded += 1
+            stats.frontier(len(path))
 
         # Reached the goal
         if height == 9:
@@ -94,31 +83,33 @@ def trailhead_score(map: Grid, trailhead: Location, unique: bool = False) -> int
     return score
 
 
-def part1():
-    map = parse_input("input.txt")
+def part1(f: str = "input.txt"):
+    map = parse_input(f)
     trailheads = find_trailheads(map)
 
     total_score = 0
-    print(f"Trailheads: {len(trailheads)}")
+    emit("Trailheads: {}", len(trailheads))
     for trailhead in trailheads:
         score = trailhead_score(map, trailhead)
         total_score += score
 
-    print(f"Total score: {total_score}")
+    return total_score
 
 
-def part2():
-    map = parse_input("input.txt")
+def part2(f: str = "input.txt"):
+    map = parse_input(f)
     trailheads = find_trailheads(map)
 
     total_rating = 0
-    print(f"Trailheads: {len(trailheads)}")
+    emit("Trailheads: {}", len(trailheads))
     for trailhead in trailheads:
         rating = trailhead_score(map, trailhead, unique=True)
         total_rating += rating
 
-    print(f"Total score: {total_rating}")
+    return total_rating
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    f = default_input(10)
+    print(f"Total score: {part1(f)}")
+    print(f"Total score: {part2(f)}")
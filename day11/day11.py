@@ -1,8 +1,12 @@
-import functools
 from copy import deepcopy
 from typing import List
 
+from aoc.cache import cached_parse
+from aoc.memo import memoize
+from aoc.runner import default_input
 
+
+@cached_parse()
 def parse_input(f):
     with open(f, "r") as file:
         input = file.readline()
@@ -11,7 +15,9 @@ def parse_input(f):
     return arrangement
 
 
-@functools.cache
+# Blinking quickly settles into a few thousand distinct stones, so only that many
+# need remembering
+@memoize(policy="lru", max_size=1 << 12)
 def apply_rules(stone: int) -> List[int]:
     if stone == 0:
         return [1]
@@ -34,17 +40,17 @@ def blink(arrangement: List[int]):
     return next_arrangement
 
 
-def part1():
-    input = parse_input("input.txt")
+def part1(f: str = "input.txt"):
+    input = parse_input(f)
 
     arrangement = deepcopy(input)
     for _ in range(25):
         arrangement = blink(arrangement)
 
-    print(len(arrangement))
+    return len(arrangement)
 
 
-@functools.cache
+@memoize()
 def num_stones(stone: int, blinks: int) -> int:
     if blinks == 0:
         return 1
@@ -63,13 +69,19 @@ def num_stones(stone: int, blinks: int) -> int:
     return num_stones(2024 * stone, blinks - 1)
 
 
-def part2():
-    input = parse_input("input.txt")
+def part2(f: str = "input.txt"):
+    input = parse_input(f)
 
     l = sum(num_stones(stone, 75) for stone in input)
 
-    print(l)
+    # Counts are shared between the input's stones, but there are hundreds of
+    # thousands of them and nothing needs them after this
+    num_stones.clear()
+
+    return l
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    f = default_input(11)
+    print(part1(f))
+    print(part2(f))
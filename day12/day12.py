@@ -1,33 +1,46 @@
-type Grid = list[list[str]]
+import numpy as np
+
+from aoc.dsu import label_grid
+from aoc.grid import Grid
+from aoc.instrument import phase
+from aoc.output import emit
+from aoc.runner import default_input
+from aoc.session import session, shared
+
 type Location = tuple[int, int]
 type Region = list[tuple[Location, int]]
 
 
 def parse_input(f: str) -> Grid:
-    with open(f, "r") as file:
-        lines = file.readlines()
+    return Grid.map_file(f)
 
-    grid: Grid = [[c for c in line.strip()] for line in lines]
-    return grid
 
+DIRECTIONS = [
+    (0, 1),  # Right
+    (0, -1),  # Left
+    (1, 0),  # Down
+    (-1, 0),  # Up
+]
 
-def in_bounds(loc: Location, grid: Grid) -> bool:
-    rows, cols = len(grid), len(grid[0])
-    return 0 <= loc[0] < rows and 0 <= loc[1] < cols
 
+def cell_perimeters(grid: Grid):
+    # Pre-compute perimeters for the whole grid.
+    # Every location starts with a perimeter of 4. Subtract 1 for each neighbor of same id.
+    perimeters = np.full(grid.shape, 4, dtype=np.uint8)
+    for d in DIRECTIONS:
+        perimeters -= grid.shifted(d) == grid.cells
+    return perimeters
 
-def find_regions(grid: Grid) -> dict[str, Region]:
-    directions = [
-        (0, 1),  # Right
-        (0, -1),  # Left
-        (1, 0),  # Down
-        (-1, 0),  # Up
-    ]
+
+def find_regions_reference(grid: Grid) -> dict[str, Region]:
+    directions = DIRECTIONS
     regions: dict[str, Region] = {}
     grid_visited: set[Location] = set()
 
+    perimeter_view = memoryview(cell_perimeters(grid))
+
     def get_region(start: Location) -> tuple[str, Region]:
-        start_id = grid[start[0]][start[1]]
+        start_id = grid.view[start]
         region_visited: set[Location] = set()
         region: list[tuple[Location, int]] = []
         bfs = [start]
@@ -40,30 +53,17 @@ def find_regions(grid: Grid) -> dict[str, Region]:
 
             region_visited.add(loc)
 
-            id = grid[loc[0]][loc[1]]
-            if id != start_id:
-                continue
-
-            perimeter = 4
             for d in directions:
                 d_loc: Location = (loc[0] + d[0], loc[1] + d[1])
-                if not in_bounds(d_loc, grid):
-                    continue
-
-                # Pre-compute perimeter while iterating neighbors.
-                # Every location starts with a perimeter of 4. Subtract 1 for each neighbor of same id.
-                d_id = grid[d_loc[0]][d_loc[1]]
-                if d_id == start_id:
-                    perimeter -= 1
-
-                bfs.append(d_loc)
+                if grid.in_bounds(d_loc) and grid.view[d_loc] == start_id:
+                    bfs.append(d_loc)
 
             grid_visited.add(loc)
-            region.append((loc, perimeter))
+            region.append((loc, perimeter_view[loc]))
 
-        return (start_id, region)
+        return (chr(start_id), region)
 
-    rows, cols = len(grid), len(grid[0])
+    rows, cols = grid.shape
     for row in range(rows):
         for col in range(cols):
             loc = (row, col)
@@ -78,15 +78,47 @@ def find_regions(grid: Grid) -> dict[str, Region]:
     return regions
 
 
+@phase("find_regions")
+def find_regions(grid: Grid) -> dict[str, Region]:
+    # Same regions as find_regions_reference, in the same order, but labeled all
+    # at once by joining equal neighbors in a disjoint set instead of searched
+    # out cell by cell. Each region's cells are in (row, col) order.
+    labels = label_grid(grid.cells).ravel()
+    if not len(labels):
+        return {}
+
+    order = np.argsort(labels, kind="stable")
+    rows, cols = np.divmod(order, grid.cols)
+    locations = list(zip(rows.tolist(), cols.tolist()))
+    perimeters = cell_perimeters(grid).ravel()[order].tolist()
+    ids = grid.cells.ravel()[order].tolist()
+
+    bounds = (np.flatnonzero(np.diff(labels[order])) + 1).tolist()
+    regions: dict[str, Region] = {}
+    for start, end in zip([0] + bounds, bounds + [len(order)]):
+        region = list(zip(locations[start:end], perimeters[start:end]))
+        regions.setdefault(chr(ids[start]), []).append(region)
+
+    return regions
+
+
+@shared
+def grid_regions(f: str) -> tuple[Grid, dict[str, Region]]:
+    grid = parse_input(f)
+    return (grid, find_regions(grid))
+
+
 def compute_area(region: Region) -> int:
     return len(region)
 
 
+@phase("compute_perimeter")
 def compute_perimeter(region: Region) -> int:
     # perimeter is pre-computed in region tuple
     return sum([r[1] for r in region])
 
 
+@phase("compute_sides")
 def compute_sides(region: Region, grid: Grid) -> int:
     # Sides are equivlanet to corners. To calculate a corner, check how many
     # adjacent grid locations share a vertex. Corners have an odd number of shared locations.
@@ -122,9 +154,8 @@ def compute_sides(region: Region, grid: Grid) -> int:
     return num_sides
 
 
-def part1():
-    grid = parse_input("input.txt")
-    regions = find_regions(grid)
+def part1(f: str = "input.txt"):
+    grid, regions = grid_regions(f)
 
     total_price = 0
     for region_id in regions:
@@ -134,13 +165,12 @@ def part1():
             perimeter = compute_perimeter(region)
             price = area * perimeter
             total_price += price
-            print(f"{region_id}: {area} * {perimeter} = {price}")
+            emit("{}: {} * {} = {}", region_id, area, perimeter, price)
     return total_price
 
 
-def part2():
-    grid = parse_input("input.txt")
-    regions = find_regions(grid)
+def part2(f: str = "input.txt"):
+    grid, regions = grid_regions(f)
 
     total_price = 0
     for region_id in regions:
@@ -150,5 +180,12 @@ def part2():
             sides = compute_sides(region, grid)
             price = area * sides
             total_price += price
-            print(f"{region_id}: {area} * {sides} = {price}")
+            emit("{}: {} * {} = {}", region_id, area, sides, price)
     return total_price
+
+
+if __name__ == "__main__":
+    f = default_input(12)
+    with session():
+        print(part1(f))
+        print(part2(f))
@@ -1,73 +1,89 @@
-import numpy as np
-import re
+from typing import TYPE_CHECKING
 
+from aoc.backend import choose
+from aoc.cache import cached_parse
+from aoc.ints import read_ints
+from aoc.runner import default_input
 
-def parse_input(f):
-    with open(f, "r") as file:
-        parts = file.read().split("\n\n")
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
-    machines = []
 
-    button_pattern = re.compile(r"Button [\w]: X([\+\-\d]+), Y([\+\-\d]+)")
-    prize_pattern = re.compile(r"Prize: X=([\+\-\d]+), Y=([\+\-\d]+)")
+# Machines as rows of A's x and y, B's x and y, then the prize's x and y
+@cached_parse(version=2)
+def parse_input(f) -> "NDArray":
+    return read_ints(f).table(2).reshape(-1, 6)
 
-    for part in parts:
-        lines = part.splitlines()
-        a_match = button_pattern.match(lines[0]).groups()
-        a_xy = [int(a) for a in a_match]
-        b_match = button_pattern.match(lines[1]).groups()
-        b_xy = [int(b) for b in b_match]
-        prize_match = prize_pattern.match(lines[2]).groups()
-        prize_xy = [int(p) for p in prize_match]
 
-        machines.append((a_xy, b_xy, prize_xy))
+# Button presses (a, b) that land exactly on the prize, by Cramer's rule, or None if
+# there's no whole number of presses that does (or the buttons are parallel)
+def solve_machine(ax, ay, bx, by, px, py) -> tuple[int, int] | None:
+    det = ax * by - ay * bx
+    if det == 0:
+        return None
 
-    return machines
+    a, a_rem = divmod(px * by - py * bx, det)
+    b, b_rem = divmod(ax * py - ay * px, det)
+    if a_rem or b_rem:
+        return None
 
+    return (a, b)
 
-def part1():
-    machines = parse_input("input.txt")
 
-    sum = 0
-    for a_xy, b_xy, prize_xy in machines:
-        coeff = np.array([[a_xy[0], b_xy[0]], [a_xy[1], b_xy[1]]])
-        p = np.array(prize_xy)
-        solution = np.linalg.solve(coeff, p)
+# The same for every machine at once: presses of A and B, and which machines have
+# a solution at all
+def solve_machines(
+    machines: "NDArray", offset: int = 0
+) -> "tuple[NDArray, NDArray, NDArray]":
+    import numpy as np
 
-        is_solution = np.all(np.isclose(np.round(solution), solution))
-        if not is_solution:
-            continue
-
-        if np.any(np.greater_equal(solution, 100)):
-            continue
+    ax, ay, bx, by, px, py = machines.T
+    px, py = px + offset, py + offset
 
-        token_cost = np.multiply(solution, [3, 1])
-        token_sum = np.sum(token_cost)
-        sum += token_sum
+    det = ax * by - ay * bx
+    solvable = det != 0
+    det = np.where(solvable, det, 1)
 
-    return int(sum)
+    a_num = px * by - py * bx
+    b_num = ax * py - ay * px
+    solvable &= (a_num % det == 0) & (b_num % det == 0)
 
+    return (a_num // det, b_num // det, solvable)
 
-def part2():
-    machines = parse_input("input.txt")
 
-    sum = 0
-    for a_xy, b_xy, prize_xy in machines:
-        coeff = np.array([[a_xy[0], b_xy[0]], [a_xy[1], b_xy[1]]])
-        p = np.array(np.add(prize_xy, 10000000000000))
+def token_cost(
+    machines: "NDArray", offset: int, max_presses: int | None, backend: str
+) -> int:
+    if backend == "numpy":
+        a, b, solvable = solve_machines(machines, offset)
+        if max_presses is not None:
+            solvable &= (a < max_presses) & (b < max_presses)
+        return int((3 * a + b)[solvable].sum())
 
-        solution = np.linalg.solve(coeff, p)
-        solution_rounded = np.astype(np.round(solution), np.int64)
+    total = 0
+    for ax, ay, bx, by, px, py in machines.tolist():
+        solution = solve_machine(ax, ay, bx, by, px + offset, py + offset)
+        if solution is None:
+            continue
 
-        is_solution = np.all(np.isclose(solution_rounded, solution, rtol=0, atol=1e-4))
-        if not is_solution:
+        a, b = solution
+        if max_presses is not None and (a >= max_presses or b >= max_presses):
             continue
 
-        token_cost = np.multiply(solution_rounded, [3, 1])
-        token_sum = np.sum(token_cost)
-        sum += token_sum
+        total += 3 * a + b
+
+    return total
+
+
+def part1(f: str = "input.txt", backend: str = "auto"):
+    return token_cost(parse_input(f), 0, 100, choose(13, 1, f, backend))
+
 
-    return sum
+def part2(f: str = "input.txt", backend: str = "auto"):
+    return token_cost(parse_input(f), 10000000000000, None, choose(13, 2, f, backend))
 
 
-print(part2())
+if __name__ == "__main__":
+    f = default_input(13)
+    print(part1(f))
+    print(part2(f))
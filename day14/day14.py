@@ -1,128 +1,173 @@
-import re
-import numpy as np
-from numpy.typing import ArrayLike, NDArray
+from typing import TYPE_CHECKING
 
-type RobotState = tuple[ArrayLike, ArrayLike]
-type Grid = NDArray
+from aoc.backend import choose
+from aoc.cache import cached_parse
+from aoc.ints import read_ints
+from aoc.output import emit
+from aoc.runner import default_input
 
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
 
-def parse_input(f: str):
-    with open(f, "r") as file:
-        lines = file.readlines()
+# One row per robot: x, y, vx, vy
+type Robots = NDArray
+type Grid = NDArray
 
-    robot_states: list[RobotState] = []
-    robot_pattern = re.compile(r"p=(-?\d+,-?\d+)\s+v=(-?\d+,-?\d+)")
 
-    for line in lines:
-        match = robot_pattern.match(line)
-        p, v = match.groups()
-        p_arr, v_arr = np.fromstring(p, sep=",", dtype=np.int32), np.fromstring(
-            v, sep=",", dtype=np.int32
-        )
-        robot_states.append((p_arr, v_arr))
+@cached_parse(version=2)
+def parse_input(f: str) -> Robots:
+    return read_ints(f).table(4)
 
-    return robot_states
 
+# Robots as separate x, y, vx, vy lists
+def robot_columns(robots: Robots) -> list[list[int]]:
+    return robots.T.tolist()
 
-def step(robot_states: list[RobotState], grid: Grid):
-    next_grid = np.copy(grid)
-    height, width = grid.shape
-    for r in range(len(robot_states)):
-        p, v = robot_states[r]
-        px, py = p
 
-        next_grid[py][px] -= 1
+def robot_arrays(robots: Robots) -> "tuple[NDArray, NDArray]":
+    return (robots[:, :2], robots[:, 2:])
 
-        next_p = np.mod(p + v, (width, height))
-        next_grid[next_p[1]][next_p[0]] += 1
 
-        robot_states[r] = (next_p, v)
+def robot_grid(xs: "ArrayLike", ys: "ArrayLike", dim: tuple[int, int]) -> Grid:
+    import numpy as np
 
-    return next_grid
+    grid = np.zeros(dim, dtype=np.int64)
+    np.add.at(grid, (np.asarray(ys), np.asarray(xs)), 1)
+    return grid
 
 
-def compute_safety_factor(grid: Grid) -> int:
-    rows, cols = grid.shape
+# Robots wrap around, so each one's position after t seconds is (p + v * t) mod
+# the grid size and there's no need to step through every second in between
+def safety_factor(robots: Robots, dim, seconds: int) -> int:
+    rows, cols = dim
     row_center = rows // 2
     col_center = cols // 2
 
-    top_left = grid[:row_center, :col_center]
-    top_right = grid[:row_center, col_center + 1 :]
-    bottom_left = grid[row_center + 1 :, :col_center]
-    bottom_right = grid[row_center + 1 :, col_center + 1 :]
+    quadrants = [0, 0, 0, 0]
+    for x, y, vx, vy in zip(*robot_columns(robots)):
+        x = (x + vx * seconds) % cols
+        y = (y + vy * seconds) % rows
+        if x == col_center or y == row_center:
+            continue
+        quadrants[(y > row_center) * 2 + (x > col_center)] += 1
 
-    sum_top_left = np.sum(top_left)
-    sum_top_right = np.sum(top_right)
-    sum_bottom_left = np.sum(bottom_left)
-    sum_bottom_right = np.sum(bottom_right)
+    return quadrants[0] * quadrants[1] * quadrants[2] * quadrants[3]
 
-    return sum_top_left * sum_top_right * sum_bottom_left * sum_bottom_right
 
+def safety_factor_numpy(robots: Robots, dim, seconds: int) -> int:
+    import numpy as np
 
-def part1():
-    # config = ("test.txt", (7, 11))
-    config = ("input.txt", (103, 101))
+    rows, cols = dim
+    row_center = rows // 2
+    col_center = cols // 2
 
-    robot_states = parse_input(config[0])
-    grid = np.zeros(config[1], dtype=np.int64)
+    p, v = robot_arrays(robots)
+    x, y = ((p + v * seconds) % (cols, rows)).T
+    counted = (x != col_center) & (y != row_center)
+    quadrants = np.bincount(
+        ((y > row_center) * 2 + (x > col_center))[counted], minlength=4
+    )
 
-    # initialize grid
-    for robot in robot_states:
-        px, py = robot[0]
-        grid[py][px] += 1
+    return int(np.prod(quadrants))
 
-    # iterate
-    for _ in range(100):
-        grid = step(robot_states, grid)
 
-    return compute_safety_factor(grid)
+# Grid dimensions are (rows, cols). The test input uses dim=(7, 11)
+def part1(
+    f: str = "input.txt", dim: tuple[int, int] = (103, 101), backend: str = "auto"
+):
+    robots = parse_input(f)
+    if choose(14, 1, f, backend) == "numpy":
+        return safety_factor_numpy(robots, dim, 100)
+    return safety_factor(robots, dim, 100)
 
 
-def print_grid(grid: Grid):
-    rows, cols = grid.shape
-    s = ""
-    for i in range(rows):
-        for j in range(cols):
-            s += "█" if grid[i][j] != 0 else "."
-        s += "\n"
-    print(s)
+def grid_str(grid: Grid) -> str:
+    return "".join(
+        "".join("█" if count else "." for count in row) + "\n" for row in grid.tolist()
+    )
 
 
-def middle_percent(grid: Grid) -> float:
-    rows, cols = grid.shape
+# The tree is assumed to be in the middle of the image, so it's the second with
+# the most robots in the middle quarter of the grid
+def middle_bounds(dim) -> tuple[int, int, int, int]:
+    rows, cols = dim
     row_center = rows // 2
     col_center = cols // 2
+    return (
+        row_center - row_center // 2,
+        row_center + row_center // 2,
+        col_center - col_center // 2,
+        col_center + col_center // 2,
+    )
+
+
+def middle_counts(robots: Robots, dim, seconds: int) -> list[int]:
+    rows, cols = dim
+    top, bottom, left, right = middle_bounds(dim)
+    xs, ys, vxs, vys = robot_columns(robots)
+
+    counts = []
+    for _ in range(seconds):
+        xs = [(x + vx) % cols for x, vx in zip(xs, vxs)]
+        ys = [(y + vy) % rows for y, vy in zip(ys, vys)]
+        counts.append(
+            sum(top <= y < bottom and left <= x < right for x, y in zip(xs, ys))
+        )
+
+    return counts
+
+
+def middle_counts_numpy(
+    robots: Robots, dim, seconds: int, chunk: int = 1000
+) -> list[int]:
+    import numpy as np
+
+    rows, cols = dim
+    top, bottom, left, right = middle_bounds(dim)
+    p, v = robot_arrays(robots)
+
+    # Positions at a block of seconds at once, one row per second
+    counts = []
+    for start in range(1, seconds + 1, chunk):
+        t = np.arange(start, min(start + chunk, seconds + 1))[:, None]
+        x = (p[:, 0] + v[:, 0] * t) % cols
+        y = (p[:, 1] + v[:, 1] * t) % rows
+        middle = (top <= y) & (y < bottom) & (left <= x) & (x < right)
+        counts.extend(np.count_nonzero(middle, axis=1).tolist())
+
+    return counts
+
+
+def tree_grid(robots: Robots, dim, seconds: int) -> Grid:
+    rows, cols = dim
+    p, v = robot_arrays(robots)
+    x, y = ((p + v * seconds) % (cols, rows)).T
+    return robot_grid(x, y, dim)
+
+
+def part2(
+    f: str = "input.txt", dim: tuple[int, int] = (103, 101), backend: str = "auto"
+):
+    robots = parse_input(f)
+    if choose(14, 2, f, backend) == "numpy":
+        counts = middle_counts_numpy(robots, dim, 10000)
+    else:
+        counts = middle_counts(robots, dim, 10000)
+
+    # The first second with the most, if any robot ever gets there
+    most = max(counts)
+    if not most:
+        return 0
+    seconds = counts.index(most) + 1
+
+    top, bottom, left, right = middle_bounds(dim)
+    emit(lambda: (most / ((bottom - top) * (right - left)), seconds))
+    emit(lambda: grid_str(tree_grid(robots, dim, seconds)))
+
+    return seconds
+
 
-    middle = grid[
-        row_center - row_center // 2 : row_center + row_center // 2,
-        col_center - col_center // 2 : col_center + col_center // 2,
-    ]
-
-    return np.sum(middle) / middle.size
-
-
-def part2():
-    config = ("input.txt", (103, 101))
-
-    max_percent = (0.0, 0)
-    for _ in range(2):
-        robot_states = parse_input(config[0])
-        grid = np.zeros(config[1], dtype=np.int64)
-
-        # Initialize grid
-        for robot in robot_states:
-            px, py = robot[0]
-            grid[py][px] += 1
-
-        if max_percent[1] == 0:
-            # Find highest concentration in the middle of the image, assuming the tree is there
-            for i in range(10000):
-                grid = step(robot_states, grid)
-                pct = middle_percent(grid)
-                if pct > max_percent[0]:
-                    max_percent = (pct, i + 1)
-            print(max_percent)
-        else:
-            for _ in range(max_percent[1]):
-                grid = step(robot_states, grid)
-            print_grid(grid)
+if __name__ == "__main__":
+    f = default_input(14)
+    print(part1(f))
+    print(part2(f))
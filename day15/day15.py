@@ -1,10 +1,15 @@
+from collections import deque
 from enum import Enum
-from vector2d import Vector2D
-from copy import deepcopy
-from os import system
-from time import sleep
 
-type Grid = list[list[str]]
+import numpy as np
+
+from aoc.cache import cached_parse
+from aoc.grid import Grid
+from aoc.instrument import phase
+from aoc.output import emit
+from aoc.render import Renderer
+from aoc.runner import default_input
+from aoc.vector2d import Vector2D
 
 
 class Tile(Enum):
@@ -25,6 +30,7 @@ class RobotState:
         return f"{self.pos}, {self.dir}, {self.length}"
 
 
+@cached_parse()
 def parse_input(f: str) -> tuple[Grid, list[tuple[str, Vector2D]]]:
     with open(f, "r") as file:
         text = file.read()
@@ -42,7 +48,7 @@ def parse_input(f: str) -> tuple[Grid, list[tuple[str, Vector2D]]]:
 
     map_str, move_str = text.split("\n\n")
 
-    map: Grid = [[c for c in line.strip()] for line in map_str.split()]
+    map = Grid.from_lines(map_str.split())
     moves: list[Vector2D] = []
     for m in move_str.strip():
         move = move_dir(m)
@@ -52,61 +58,53 @@ def parse_input(f: str) -> tuple[Grid, list[tuple[str, Vector2D]]]:
     return (map, moves)
 
 
-def map_str(map: Grid):
-    rows, cols = len(map), len(map[0])
-    s = ""
-    for i in range(rows):
-        for j in range(cols):
-            s += map[i][j]
-        s += "\n"
-    return s
-
-
-def in_bounds(pos: Vector2D, map: Grid) -> bool:
-    rows, cols = len(map), len(map[0])
-    if not (0 <= pos.y < rows and 0 <= pos.x < cols):
-        return False
-
-    tile = map[pos.y][pos.x]
-    if tile == Tile.WALL.value:
-        return False
-
-    return True
+def find_start(map: Grid) -> Vector2D | None:
+    start = map.find(Tile.ROBOT.value)
+    if start is None:
+        return None
 
+    return Vector2D(start[1], start[0])
 
-def find_start(map: Grid) -> Vector2D | None:
-    rows, cols = len(map), len(map[0])
-    for i in range(rows):
-        for j in range(cols):
-            if map[i][j] == Tile.ROBOT.value:
-                return Vector2D(j, i)
 
-    return None
+WALL, BOX, BOX_LEFT, BOX_RIGHT, ROBOT, EMPTY = (
+    ord(t.value)
+    for t in (
+        Tile.WALL,
+        Tile.BOX,
+        Tile.BOX_LEFT,
+        Tile.BOX_RIGHT,
+        Tile.ROBOT,
+        Tile.EMPTY,
+    )
+)
 
 
+@phase("apply_move")
 def apply_move(move: Vector2D, state: RobotState, map: Grid) -> tuple[RobotState, Grid]:
-    next_map = deepcopy(map)
-    next_state = deepcopy(state)
+    next_map = map.copy()
+    next_state = RobotState(state.pos + move, move)
 
-    next_state.pos = state.pos + move
-    next_state.dir = move
+    # Search over packed positions so the BFS doesn't allocate a vector per step.
+    # The warehouse is walled in, so a step never wraps into another row.
+    tiles, next_tiles = map.flat, next_map.flat
+    step = move.pack(map.cols)
 
-    visited: set[Vector2D] = set()
-    group_tiles: list[Vector2D] = []
+    visited: set[int] = set()
+    group_tiles: list[int] = []
 
-    bfs = [state.pos]
+    bfs = deque([state.pos.pack(map.cols)])
     while len(bfs) > 0:
-        test_pos = bfs.pop(0)
+        test_pos = bfs.popleft()
 
         if test_pos in visited:
             continue
 
-        tile = map[test_pos.y][test_pos.x]
+        tile = tiles[test_pos]
         is_box, is_box_left, is_box_right, is_robot = (
-            tile == Tile.BOX.value,
-            tile == Tile.BOX_LEFT.value,
-            tile == Tile.BOX_RIGHT.value,
-            tile == Tile.ROBOT.value,
+            tile == BOX,
+            tile == BOX_LEFT,
+            tile == BOX_RIGHT,
+            tile == ROBOT,
         )
 
         if not (is_box or is_box_left or is_box_right or is_robot):
@@ -117,110 +115,88 @@ def apply_move(move: Vector2D, state: RobotState, map: Grid) -> tuple[RobotState
 
         # Start BFS in direction of movement next to robot
         if is_robot:
-            bfs.append(test_pos + next_state.dir)
+            bfs.append(test_pos + step)
             continue
 
         # For a box, check if there is another box adjacent to this point in the movement direction.
         # If so, add that box and test from its extents next.
-        bfs.append(test_pos + next_state.dir)
+        bfs.append(test_pos + step)
 
         # Also check the other side of the current box to search for other adjacent boxes.
         if is_box_left or is_box_right:
-            next_side_dir = Vector2D(1 if is_box_left else -1, 0)
-            bfs.append(test_pos + next_side_dir)
+            bfs.append(test_pos + (1 if is_box_left else -1))
 
-    # Check for boundary collision. If hit, roll back
+    # Check for wall collision. If hit, roll back
     for t in group_tiles:
-        if not in_bounds(t + next_state.dir, map):
+        if tiles[t + step] == WALL:
             return (state, map)
 
     # Clear previous cells
     for t in group_tiles:
-        next_map[t.y][t.x] = Tile.EMPTY.value
+        next_tiles[t] = EMPTY
 
     # Move cells in grid to new position
     for t in group_tiles:
-        dest_pos = t + next_state.dir
-        next_map[dest_pos.y][dest_pos.x] = map[t.y][t.x]
+        next_tiles[t + step] = tiles[t]
 
     return (next_state, next_map)
 
 
 def calculate_box_gps_sum(map: Grid) -> int:
-    rows, cols = len(map), len(map[0])
-    gps_sum = 0
-    for i in range(rows):
-        for j in range(cols):
-            if map[i][j] in [Tile.BOX.value, Tile.BOX_LEFT.value]:
-                gps_score = 100 * i + j
-                gps_sum += gps_score
-    return gps_sum
+    rows, cols = np.nonzero(map.mask(Tile.BOX.value + Tile.BOX_LEFT.value))
+    return int(np.sum(100 * rows + cols))
+
+
+# Each tile becomes two tiles in the wide map
+WIDE_TILES = np.zeros((256, 2), dtype=np.uint8)
+for tile, wide_tile in [("#", "##"), ("O", "[]"), (".", ".."), ("@", "@.")]:
+    WIDE_TILES[ord(tile)] = np.frombuffer(wide_tile.encode(), dtype=np.uint8)
 
 
+@phase("widen_map")
 def widen_map(map: Grid) -> Grid:
-    rows, cols = len(map), len(map[0])
-    wide_map = []
-    for row in range(rows):
-        wide_row = []
-        for col in range(cols):
-            tile = map[row][col]
-            match tile:
-                case "#":
-                    wide_row.extend(["#", "#"])
-                case "O":
-                    wide_row.extend(["[", "]"])
-                case ".":
-                    wide_row.extend([".", "."])
-                case "@":
-                    wide_row.extend(["@", "."])
-        wide_map.append(wide_row)
-
-    return wide_map
-
-
-def part1():
-    map, moves = parse_input("input.txt")
-    print(f"Start\n{map_str(map)}")
+    return Grid(WIDE_TILES[map.cells].reshape(map.rows, map.cols * 2))
 
+
+def run_moves(map: Grid, moves: list[tuple[str, Vector2D]], renderer: Renderer) -> Grid:
     pos = find_start(map)
     state = RobotState(pos, Vector2D(0, 0))
-    while len(moves) > 0:
-        c, move = moves.pop(0)
+    for i, (c, move) in enumerate(moves):
         state, map = apply_move(move, state, map)
 
-        # ANIM_DELAY = 0.1
-        # system("clear")
-        # print(c)
-        # print(state)
-        # print(map_str(map))
-        # sleep(ANIM_DELAY)
+        if renderer:
+            status = f"move {i + 1}/{len(moves)} {c} robot {state.pos}"
+            renderer.draw(map, status, force=i == len(moves) - 1)
+
+    return map
+
+
+def part1(f: str = "input.txt", animate: float = 0, record: str | None = None):
+    map, moves = parse_input(f)
+    emit("Start\n{}", map)
+
+    with Renderer(animate, record) as renderer:
+        map = run_moves(map, moves, renderer)
 
-    print(f"End\n{map_str(map)}")
+    emit("End\n{}", map)
     gps_sum = calculate_box_gps_sum(map)
     return gps_sum
 
 
-def part2():
-    map, moves = parse_input("test2.txt")
+def part2(f: str = "input.txt", animate: float = 0, record: str | None = None):
+    map, moves = parse_input(f)
     map = widen_map(map)
-    print(f"Start\n{map_str(map)}")
-
-    pos = find_start(map)
-    state = RobotState(pos, Vector2D(0, 0))
-    while len(moves) > 0:
-        c, move = moves.pop(0)
-        state, map = apply_move(move, state, map)
+    emit("Start\n{}", map)
 
-        # ANIM_DELAY = 0.03
-        # system("clear")
-        # print(c)
-        # print(state)
-        # print(map_str(map))
-        # sleep(ANIM_DELAY)
+    with Renderer(animate, record) as renderer:
+        map = run_moves(map, moves, renderer)
 
-    print(f"End\n{map_str(map)}")
+    emit("End\n{}", map)
     gps_sum = calculate_box_gps_sum(map)
     return gps_sum
 
 
-print(part2())
+if __name__ == "__main__":
+    f = default_input(15)
+    print(part1(f))
+    print(part2(f))
@@ -1,25 +0,0 @@
-class Vector2D:
-    def __init__(self, x: int, y: int):
-        self.x = x
-        self.y = y
-
-    def __add__(self, other):
-        return Vector2D(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other):
-        return Vector2D(self.x - other.x, self.y - other.y)
-
-    def __mul__(self, scalar):
-        return Vector2D(self.x * scalar, self.y * scalar)
-
-    def __eq__(self, other):
-        if not isinstance(other, Vector2D):
-            return NotImplemented
-
-        return self.x == other.x and self.y == other.y
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def __repr__(self):
-        return f"({self.x}, {self.y})"
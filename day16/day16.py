@@ -2,6 +2,18 @@ import heapq
 from collections import defaultdict
 from enum import Enum
 
+import numpy as np
+
+from aoc import search
+from aoc.cache import cached_parse
+from aoc.grid import Grid
+from aoc.output import emit
+from aoc.render import Renderer
+from aoc.runner import default_input
+from aoc.search import dijkstra
+
+WALL = ord("#")
+
 
 class Direction(Enum):
     EAST = (0, 1)
@@ -14,42 +26,27 @@ class Direction(Enum):
             return self.value[0] < other.value[0] and self.value[1] < other.value[1]
 
 
-type Grid = list[list[str]]
 type Point = tuple[int, int]
 type CellState = tuple[Point, Direction]
 
 
+@cached_parse()
 def parse_input(f: str) -> tuple[Grid, Point, Point]:
-    with open(f, "r") as file:
-        lines = file.readlines()
-
-    grid = [[c for c in line.strip()] for line in lines]
-    for i, row in enumerate(grid):
-        for j, col in enumerate(row):
-            if col == "S":
-                start = (i, j)
-            elif col == "E":
-                end = (i, j)
+    grid = Grid.from_file(f)
+    start, end = grid.find("S"), grid.find("E")
 
     return (grid, start, end)
 
 
 def grid_str(grid: Grid, path: set[Point]):
-    rows, cols = len(grid), len(grid[0])
-    s = ""
-    for i in range(rows):
-        for j in range(cols):
-            s += grid[i][j] if (i, j) not in path else "█"
-        s += "\n"
-    return s
+    rows = [list(line) for line in str(grid).splitlines()]
+    for i, j in path:
+        rows[i][j] = "█"
+    return "".join("".join(row) + "\n" for row in rows)
 
 
 def can_move_to(grid: Grid, pos: Point) -> bool:
-    rows, cols = len(grid), len(grid[0])
-    if not (0 <= pos[0] < rows and 0 <= pos[1] < cols):
-        return False
-
-    return grid[pos[0]][pos[1]] != "#"
+    return grid.in_bounds(pos) and grid.view[pos] != WALL
 
 
 def get_neighbors(grid: Grid, pos: Point) -> list[CellState]:
@@ -62,46 +59,66 @@ def get_neighbors(grid: Grid, pos: Point) -> list[CellState]:
     return neighbors
 
 
+# Stepping ahead costs 1, plus 1000 for each 90 degree turn before it, so turning
+# around is two turns
+def move_cost(heading: Direction, direction: Direction) -> int:
+    if direction == heading:
+        return 1
+    reverse = (-heading.value[0], -heading.value[1])
+    return 2001 if direction.value == reverse else 1001
+
+
 def find_path(
-    grid: Grid, start: Point, end: Point, initial_heading: Direction
+    grid: Grid,
+    start: Point,
+    end: Point,
+    initial_heading: Direction,
+    renderer: Renderer | None = None,
 ) -> tuple[int, set[Point]]:
-    # Dijkstra's algorithm
-    visited: set[Point] = set()
-    q = [(0, start, initial_heading, {start})]
-    while q:
-        score, pos, heading, path = heapq.heappop(q)
-
-        if pos in visited:
-            continue
+    def neighbors(state: CellState):
+        pos, heading = state
+        for neighbor in get_neighbors(grid, pos):
+            yield (neighbor, move_cost(heading, neighbor[1]))
 
-        visited.add(pos)
+    # Show the cells the search has expanded so far
+    on_expand = None
+    if renderer:
+        frame = grid.copy()
 
-        # system("clear")
-        # print(grid_str(grid, path))
-        # sleep(0.03)
+        def on_expand(state: CellState):
+            frame[state[0]] = "o"
+            renderer.draw(frame)
 
-        if pos == end:
-            return (score, path)
+    result = dijkstra(
+        (start, initial_heading),
+        neighbors,
+        goal=lambda state: state[0] == end,
+        stats=search.stats("day16.find_path"),
+        on_expand=on_expand,
+    )
+    if not result.found:
+        return (0, {})
 
-        for neighbor, direction in get_neighbors(grid, pos):
-            pos_score = 1 if direction == heading else 1001
-            heapq.heappush(
-                q, (score + pos_score, neighbor, direction, path | {neighbor})
-            )
+    path = {pos for pos, _ in result.path()}
+    if renderer:
+        for pos in path:
+            frame[pos] = "*"
+        renderer.draw(frame, f"cost {result.cost[result.goal]}", force=True)
 
-    return (0, {})
+    return (result.cost[result.goal], path)
 
 
-def part1():
-    grid, start, end = parse_input("input.txt")
-    score, path = find_path(grid, start, end, Direction.EAST)
+def part1(f: str = "input.txt", animate: float = 0, record: str | None = None):
+    grid, start, end = parse_input(f)
+    with Renderer(animate, record) as renderer:
+        score, path = find_path(grid, start, end, Direction.EAST, renderer)
 
-    print(grid_str(grid, path))
+    emit(grid_str, grid, path)
 
     return score
 
 
-def find_all_shortest_path_nodes(
+def find_all_shortest_path_nodes_reference(
     grid: Grid, start: Point, end: Point, initial_heading: Direction
 ) -> set[Point]:
     min_scores: dict[CellState, int] = defaultdict()
@@ -114,7 +131,7 @@ def find_all_shortest_path_nodes(
 
         for neighbor in get_neighbors(grid, pos):
             neighbor_direction = neighbor[1]
-            direction_score = 1 if neighbor_direction == heading else 1001
+            direction_score = move_cost(heading, neighbor_direction)
             neighbor_score = score + direction_score
 
             if neighbor_score < min_scores.get(neighbor, float("inf")):
@@ -142,9 +159,80 @@ def find_all_shortest_path_nodes(
     return unique_points
 
 
-def part2():
-    grid, start, end = parse_input("test.txt")
+HEADINGS = list(Direction)
+# move_cost by how many quarter turns clockwise the move is from the heading
+TURN_COSTS = [1, 1001, 2001, 1001]
+
+
+def find_all_shortest_path_nodes(
+    grid: Grid, start: Point, end: Point, initial_heading: Direction
+) -> set[Point]:
+    # Same search as find_all_shortest_path_nodes_reference, over states packed
+    # as cell * 4 + heading on a copy of the grid padded with walls, so moves need
+    # no bounds checks. Best paths are collected by walking parent states back
+    # from the end once each, rather than enumerating every path.
+    cols = grid.cols + 2
+    walls = np.pad(grid.cells == WALL, 1, constant_values=True).ravel().tolist()
+    steps = [d.value[0] * cols + d.value[1] for d in HEADINGS]
+
+    def pack(pos: Point, heading: Direction) -> int:
+        return ((pos[0] + 1) * cols + pos[1] + 1) * 4 + HEADINGS.index(heading)
+
+    start_state = pack(start, initial_heading)
+    min_scores = {start_state: 0}
+    parent_states: dict[int, list[int]] = {}
+    stats = search.stats("day16.find_all_shortest_path_nodes")
+
+    q = [(0, start_state)]
+    while q:
+        if stats is not None:
+            stats.popped += 1
+            stats.frontier(len(q))
+        score, state = heapq.heappop(q)
+        if score > min_scores[state]:
+            continue
+        if stats is not None:
+            stats.expanded += 1
+
+        cell, heading = divmod(state, 4)
+        for d, step in enumerate(steps):
+            neighbor_cell = cell + step
+            if walls[neighbor_cell]:
+                continue
+
+            neighbor = neighbor_cell * 4 + d
+            neighbor_score = score + TURN_COSTS[(d - heading) % 4]
+            best = min_scores.get(neighbor)
+            if best is None or neighbor_score < best:
+                min_scores[neighbor] = neighbor_score
+                parent_states[neighbor] = [state]
+                heapq.heappush(q, (neighbor_score, neighbor))
+                if stats is not None:
+                    stats.pushed += 1
+            elif neighbor_score == best:
+                parent_states[neighbor].append(state)
+
+    end_state = pack(end, Direction.NORTH)
+    visited = {end_state}
+    reverse_dfs = [end_state]
+    while reverse_dfs:
+        for parent in parent_states.get(reverse_dfs.pop(), []):
+            if parent not in visited:
+                visited.add(parent)
+                reverse_dfs.append(parent)
+
+    return {divmod(state // 4 - cols - 1, cols) for state in visited}
+
+
+def part2(f: str = "input.txt"):
+    grid, start, end = parse_input(f)
 
     all_points = find_all_shortest_path_nodes(grid, start, end, Direction.EAST)
 
     return len(all_points)
+
+
+if __name__ == "__main__":
+    f = default_input(16)
+    print(part1(f))
+    print(part2(f))
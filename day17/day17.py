@@ -1,3 +1,9 @@
+from aoc.cache import cached_parse
+from aoc.checkpoint import Checkpoint
+from aoc.runner import default_input
+from aoc.sweep import sweep
+
+
 class CPUState:
     def __init__(self, a: int, b: int, c: int):
         self.a = a
@@ -10,6 +16,7 @@ class CPUState:
         return f"a={self.a}, b={self.b}, c={self.c}, pc={self.pc}, out={",".join([str(o) for o in self.out])}"
 
 
+@cached_parse()
 def parse_input(f: str):
     with open(f, "r") as file:
         lines = [l for l in file.readlines() if l != "\n"]
@@ -73,36 +80,67 @@ def run_program(program: list[int], state: CPUState) -> CPUState:
     return state
 
 
-def part1():
-    a, b, c, program = parse_input("input.txt")
+def part1(f: str = "input.txt"):
+    a, b, c, program = parse_input(f)
     state = CPUState(a, b, c)
 
-    return run_program(program, state)
+    return ",".join(str(o) for o in run_program(program, state).out)
 
 
-def part2():
-    program = parse_input("input.txt")[3]
+def next_step(out: list[int], program: list[int], step: int) -> int:
+    for i in range(len(program)):
+        if out[i] == program[i]:
+            step = max(step, 8 ** (i - 1))
+        else:
+            break
+    return step
 
-    # Start with 16 octal digits
-    count = 0o1000000000000000
-    step = 1
-    # Find sequential matched digits, increasing speed each match
-    while True:
-        run = run_program(program, CPUState(count, 0, 0))
 
-        if run.out == program:
-            return count
+def part2(f: str = "input.txt", jobs: int | None = None):
+    program = parse_input(f)[3]
+    checkpoint = Checkpoint("day17-part2", f)
 
-        if len(run.out) > len(program):
+    # Start with 16 octal digits
+    count, step = checkpoint.load((0o1000000000000000, 1))
+
+    # Only a candidate that matches more digits than the step allows for changes
+    # anything. The ones before it are checked in parallel.
+    def check(a: int):
+        out = run_program(program, CPUState(a, 0, 0)).out
+        if out == program:
+            return out
+        return out if next_step(out, program, step) > step else None
+
+    # Find sequential matched digits, increasing speed each match. Past the last
+    # candidate the output is longer than the program.
+    while True:
+        if checkpoint.due():
+            checkpoint.save((count, step))
+
+        candidates = range(count, 8 ** len(program), step)
+        matches = sweep(
+            candidates,
+            check,
+            workers=jobs,
+            checkpoint=Checkpoint(f"day17-part2-{count}-{step}", f),
+            name="day17 part2",
+        )
+        if not matches:
+            checkpoint.clear()
             return None
 
-        for i in range(len(program)):
-            if run.out[i] == program[i]:
-                step = max(step, 8 ** (i - 1))
-            else:
-                break
+        i, out = matches[0]
+        count = candidates[i]
+
+        if out == program:
+            checkpoint.clear()
+            return count
 
+        step = next_step(out, program, step)
         count += step
 
 
-print(part2())
+if __name__ == "__main__":
+    f = default_input(17)
+    print(part1(f))
+    print(part2(f))
@@ -1,9 +1,17 @@
 from enum import Enum
-import heapq
 
-type Grid = list[list[str]]
+from aoc import search
+from aoc.cache import cached_parse
+from aoc.dsu import grid_sets
+from aoc.grid import ORTHOGONAL, Grid
+from aoc.ints import read_ints
+from aoc.output import emit
+from aoc.runner import default_input
+
 type Point = tuple[int, int]
 
+WALL = ord("#")
+
 
 class Direction(Enum):
     EAST = (0, 1)
@@ -12,35 +20,20 @@ class Direction(Enum):
     NORTH = (-1, 0)
 
 
-def parse_input(f) -> Grid:
-    with open(f, "r") as file:
-        lines = file.readlines()
-
-    positions: list[Point] = []
-    for line in lines:
-        x, y = line.strip().split(",")
-        positions.append((int(x), int(y)))
-
-    return positions
+@cached_parse()
+def parse_input(f) -> list[Point]:
+    return [(x, y) for x, y in read_ints(f).table(2).tolist()]
 
 
 def grid_str(grid: Grid, path: set[Point]):
-    rows, cols = len(grid), len(grid[0])
-    s = ""
-    for i in range(rows):
-        for j in range(cols):
-            s += grid[i][j] if (i, j) not in path else "O"
-        s += "\n"
-    return s
+    path_grid = grid.copy()
+    for p in path:
+        path_grid[p] = "O"
+    return str(path_grid)
 
 
 def can_move_to(pos: Point, grid: Grid) -> bool:
-    rows, cols = len(grid), len(grid[0])
-
-    if not (0 <= pos[0] < rows and 0 <= pos[1] < cols):
-        return False
-
-    return grid[pos[0]][pos[1]] != "#"
+    return grid.in_bounds(pos) and grid.view[pos] != WALL
 
 
 def heuristic(a: Point, b: Point) -> int:
@@ -59,66 +52,39 @@ def get_neighbors(grid: Grid, pos: Point) -> list[Point]:
 
 
 def a_star(grid: Grid, start: Point, end: Point) -> list[Point]:
-    open_set: tuple[int, Point] = []
-    heapq.heappush(open_set, (0, start))
-
-    came_from: dict[Point, Point] = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, end)}
-
-    while open_set:
-        _, current = heapq.heappop(open_set)
-
-        if current == end:
-            path: list[Point] = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            return path[::-1]
-
-        for neighbor in get_neighbors(grid, current):
-            tentative_g_score = g_score[current] + 1
-
-            if tentative_g_score < g_score.get(neighbor, float("inf")):
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor, end)
-
-                if neighbor not in [item[1] for item in open_set]:
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-
-    return []
-
-
-def part1():
-    # dim, num_bytes, f = (6, 12, "test.txt")
-    dim, num_bytes, f = (70, 1024, "input.txt")
-    grid = [["." for _ in range(dim + 1)] for _ in range(dim + 1)]
+    result = search.a_star(
+        start,
+        lambda pos: ((neighbor, 1) for neighbor in get_neighbors(grid, pos)),
+        goal=lambda pos: pos == end,
+        heuristic=lambda pos: heuristic(pos, end),
+        stats=search.stats("day18.a_star"),
+    )
+    return result.path()
+
+
+# The test input uses dim=6, num_bytes=12
+def part1(f: str = "input.txt", dim: int = 70, num_bytes: int = 1024):
+    grid = Grid.full((dim + 1, dim + 1), ".")
     positions = parse_input(f)
 
-    for i, (x, y) in enumerate(positions):
-        if i < num_bytes:
-            grid[y][x] = "#"
+    for x, y in positions[:num_bytes]:
+        grid[y, x] = "#"
 
     path = a_star(grid, (0, 0), (dim, dim))
 
-    print(grid_str(grid, path))
+    emit(grid_str, grid, path)
 
     return len(path) - 1
 
 
-def part2():
-    # dim, f = (6, "test.txt")
-    dim, f = (70, "input.txt")
-    grid = [["." for _ in range(dim + 1)] for _ in range(dim + 1)]
-    positions = parse_input(f)
+def first_blocking_byte_reference(positions: list[Point], dim: int):
+    grid = Grid.full((dim + 1, dim + 1), ".")
 
     # Slightly better than brute force. See if incoming bytes
     # were on the previous path. If not, the last path is still valid
     prev_path = []
     for x, y in positions:
-        grid[y][x] = "#"
+        grid[y, x] = "#"
         if not prev_path or (y, x) in prev_path:
             path = a_star(grid, (0, 0), (dim, dim))
             if len(path) == 0:
@@ -126,3 +92,50 @@ def part2():
             prev_path = path
 
     return None
+
+
+def first_blocking_byte(positions: list[Point], dim: int):
+    # Same answer as first_blocking_byte_reference, found backwards: with every
+    # byte fallen, free the cells again from the last byte to the first, joining
+    # each to its free neighbors in a disjoint set. The byte whose cell joins the
+    # corners is the first that cut them off. A cell hit more than once is only
+    # free again once its first byte is lifted.
+    grid = Grid.full((dim + 1, dim + 1), ".")
+    first_byte: dict[Point, int] = {}
+    for i, (x, y) in enumerate(positions):
+        grid[y, x] = "#"
+        first_byte.setdefault((y, x), i)
+
+    # The search starts from the corner even if a byte falls on it
+    grid[0, 0] = "."
+    free = grid.cells != WALL
+    sets = grid_sets(free, free)
+    start, end = grid.index((0, 0)), grid.index((dim, dim))
+    if sets.connected(start, end):
+        return None
+
+    for i in range(len(positions) - 1, -1, -1):
+        x, y = positions[i]
+        if first_byte[(y, x)] != i:
+            continue
+
+        grid[y, x] = "."
+        for dr, dc in ORTHOGONAL:
+            neighbor = (y + dr, x + dc)
+            if can_move_to(neighbor, grid):
+                sets.union(grid.index((y, x)), grid.index(neighbor))
+
+        if sets.connected(start, end):
+            return (x, y)
+
+    return None
+
+
+def part2(f: str = "input.txt", dim: int = 70):
+    return first_blocking_byte(parse_input(f), dim)
+
+
+if __name__ == "__main__":
+    f = default_input(18)
+    print(part1(f))
+    print(part2(f))
@@ -1,6 +1,10 @@
-from functools import cache
+from aoc import search
+from aoc.cache import cached_parse
+from aoc.memo import memoize
+from aoc.runner import default_input
 
 
+@cached_parse()
 def parse_input(f) -> tuple[set[str], list[str]]:
     with open(f, "r") as file:
         parts = file.read().split("\n\n")
@@ -11,8 +15,26 @@ def parse_input(f) -> tuple[set[str], list[str]]:
     return (set(patterns), designs)
 
 
+def search_design(name: str, recurse, design: str):
+    stats = search.stats(name)
+    if stats is None:
+        with recurse.scope():
+            return recurse(design)
+
+    # Every miss is a suffix the recursion actually had to work out
+    before = recurse.stats()
+    with recurse.scope():
+        result = recurse(design)
+    calls = recurse.stats() - before
+    stats.hits += calls.hits
+    stats.misses += calls.misses
+    stats.expanded += calls.misses
+    return result
+
+
+# Suffixes are only worth remembering while checking the design they came from
 def is_valid_design(design: str, patterns: set[str]):
-    @cache
+    @memoize(policy="scoped")
     def recurse(design):
         if design == "":
             return True
@@ -24,11 +46,11 @@ def is_valid_design(design: str, patterns: set[str]):
 
         return False
 
-    return recurse(design)
+    return search_design("day19.is_valid_design", recurse, design)
 
 
-def part1():
-    patterns, designs = parse_input("input.txt")
+def part1(f: str = "input.txt"):
+    patterns, designs = parse_input(f)
 
     total_valid = 0
     for design in designs:
@@ -38,7 +60,7 @@ def part1():
 
 
 def num_valid_combinations(design: str, patterns: set[str]) -> int:
-    @cache
+    @memoize(policy="scoped")
     def recurse(design):
         if design == "":
             return 1
@@ -50,11 +72,11 @@ def num_valid_combinations(design: str, patterns: set[str]) -> int:
 
         return combinations
 
-    return recurse(design)
+    return search_design("day19.num_valid_combinations", recurse, design)
 
 
-def part2():
-    patterns, designs = parse_input("input.txt")
+def part2(f: str = "input.txt"):
+    patterns, designs = parse_input(f)
 
     total_combos = 0
     for design in designs:
@@ -62,3 +84,9 @@ def part2():
         total_combos += combos
 
     return total_combos
+
+
+if __name__ == "__main__":
+    f = default_input(19)
+    print(part1(f))
+    print(part2(f))
@@ -1,16 +1,14 @@
-from typing import List
+from typing import Iterator, List
+
+from aoc.runner import default_input
+from aoc.stream import records
+
+def parse_report(line: str) -> List[int]:
+    return [int(val) for val in line.split()]
+
+def stream_input(f: str) -> Iterator[List[int]]:
+    return records(f, parse_report)
 
-def parse_input():
-    with open("input.txt", "r") as file:
-        lines = file.readlines()
-        
-    vals = []
-    for line in lines:
-        line_vals = [int(val) for val in line.split()]
-        vals.append(line_vals)
-        
-    return vals
-    
 def is_safe(report: List[int]) -> bool:
     prev_diff = 0
     
@@ -27,11 +25,10 @@ def is_safe(report: List[int]) -> bool:
     return True
 
 
-def part1():    
-    reports = parse_input()
-    
+def part1(f: str = "input.txt"):
+    # Each report is checked once, so they're read one at a time
     num_safe = 0
-    for report in reports:
+    for report in stream_input(f):
         if is_safe(report):
             num_safe += 1
         
@@ -47,14 +44,16 @@ def is_safe_with_tolerance(report: List[int]) -> bool:
         
     return False
     
-def part2():
-    reports = parse_input()
-    
+def part2(f: str = "input.txt"):
     num_safe = 0
-    for report in reports:
+    for report in stream_input(f):
         if is_safe_with_tolerance(report):
             num_safe += 1
         
     return num_safe
 
-print(part2())
\ No newline at end of file
+
+if __name__ == "__main__":
+    f = default_input(2)
+    print(part1(f))
+    print(part2(f))
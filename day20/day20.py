@@ -1,8 +1,13 @@
-from copy import deepcopy
 from enum import Enum
-import heapq
 
-type Grid = list[list[str]]
+from aoc import search
+from aoc.grid import Grid
+from aoc.runner import default_input
+from aoc.search import bfs
+from aoc.session import session, shared
+
+WALL = ord("#")
+
 type Point = tuple[int, int]
 type Dim = tuple[int, int]
 
@@ -15,36 +20,20 @@ class Direction(Enum):
 
 
 def parse_input(f: str) -> tuple[Grid, Dim, Point, Point]:
-    with open(f, "r") as file:
-        lines = file.readlines()
-
-    grid = [[c for c in line.strip()] for line in lines]
-    for i, row in enumerate(grid):
-        for j, col in enumerate(row):
-            if col == "S":
-                start = (i, j)
-            elif col == "E":
-                end = (i, j)
-
-    dim = (len(grid), len(grid[0]))
+    grid = Grid.map_file(f)
+    start, end = grid.find("S"), grid.find("E")
 
-    return (grid, dim, start, end)
+    return (grid, grid.shape, start, end)
 
 
 def grid_str(grid: Grid, paths: list[tuple[set[Point], str]]) -> str:
-    rows, cols = len(grid), len(grid[0])
-    debug_grid = deepcopy(grid)
+    debug_grid = grid.copy()
 
     for points, char in paths:
-        for pi, pj in points:
-            debug_grid[pi][pj] = char
+        for p in points:
+            debug_grid[p] = char
 
-    s = ""
-    for i in range(rows):
-        for j in range(cols):
-            s += debug_grid[i][j]
-        s += "\n"
-    return s
+    return str(debug_grid)
 
 
 def can_move_to(pos: Point, grid: Grid, dim: Dim) -> bool:
@@ -53,11 +42,7 @@ def can_move_to(pos: Point, grid: Grid, dim: Dim) -> bool:
     if not in_bounds:
         return False
 
-    return grid[pos[0]][pos[1]] != "#"
-
-
-def manhattan_dist(a: Point, b: Point) -> int:
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+    return grid.view[pos] != WALL
 
 
 def get_neighbors(pos: Point, grid: Grid, dim: Dim) -> list[Point]:
@@ -70,44 +55,20 @@ def get_neighbors(pos: Point, grid: Grid, dim: Dim) -> list[Point]:
     return neighbors
 
 
-def a_star(
+def find_path(
     grid: Grid, dim: Dim, start: Point, end: Point
 ) -> tuple[list[Point], dict[Point, int]]:
-    open_set: tuple[int, Point] = []
-    heapq.heappush(open_set, (0, start))
-
-    came_from: dict[Point, Point] = {}
-    g_score = {start: 0}
-    f_score = {start: manhattan_dist(start, end)}
-
-    while open_set:
-        _, current = heapq.heappop(open_set)
-
-        if current == end:
-            path: list[Point] = []
-            dist_to = {start: 0}
-            path_len = len(came_from)
-            i = 0
-            while current in came_from:
-                path.append(current)
-                dist_to[current] = path_len - i
-                current = came_from[current]
-                i += 1
-            path.append(start)
-            return (path[::-1], dist_to)
-
-        for neighbor in get_neighbors(current, grid, dim):
-            tentative_g_score = g_score[current] + 1
-
-            if tentative_g_score < g_score.get(neighbor, float("inf")):
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + manhattan_dist(neighbor, end)
-
-                if neighbor not in [item[1] for item in open_set]:
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-
-    return ([], {})
+    # The race track is a single lane, so plain BFS finds the path and the
+    # distance to every point on it
+    result = bfs(
+        start,
+        lambda pos: get_neighbors(pos, grid, dim),
+        goal=lambda pos: pos == end,
+        stats=search.stats("day20.find_path"),
+    )
+    path = result.path()
+    dist_to = {p: i for i, p in enumerate(path)}
+    return (path, dist_to)
 
 
 # Get all points within Manhattan distance of current point
@@ -156,22 +117,28 @@ def run_cheats(
     return over_min
 
 
-def part1():
-    grid, dim, start, end = parse_input("input.txt")
+@shared
+def race_path(f: str) -> tuple[list[Point], dict[Point, int]]:
+    grid, dim, start, end = parse_input(f)
+    return find_path(grid, dim, start, end)
 
-    path, dist_to = a_star(grid, dim, start, end)
 
-    return sum(run_cheats(p, path, dist_to, 2, 100) for p in path)
+def part1(f: str = "input.txt"):
+    path, dist_to = race_path(f)
 
+    return sum(run_cheats(p, path, dist_to, 2, 100) for p in path)
 
-def part2():
-    grid, dim, start, end = parse_input("input.txt")
 
-    path, dist_to = a_star(grid, dim, start, end)
+def part2(f: str = "input.txt"):
+    path, dist_to = race_path(f)
 
     total = sum(run_cheats(p, path, dist_to, 20, 100) for p in path)
 
     return total
 
 
-print(f"Total: {part2()}")
+if __name__ == "__main__":
+    f = default_input(20)
+    with session():
+        print(f"Total: {part1(f)}")
+        print(f"Total: {part2(f)}")
@@ -1,6 +1,10 @@
 from enum import Enum
-from functools import cache
-from paths import (
+
+from aoc.cache import cached_parse
+from aoc.memo import memoize
+from aoc.runner import default_input
+
+from .paths import (
     min_numpad_paths,
     numpad_start_point,
     numpad_locations,
@@ -42,6 +46,7 @@ DIRECTIONAL_BUTTONS = [
 ]
 
 
+@cached_parse()
 def parse_input(f: str):
     with open(f, "r") as file:
         lines = file.readlines()
@@ -60,7 +65,7 @@ def button_path(
     button_locations: dict[str, Point],
     max_depth: int,
 ):
-    @cache
+    @memoize(policy="scoped")
     def recurse(btns: str, depth: int):
         if depth == 0:
             return btns
@@ -76,7 +81,8 @@ def button_path(
 
         return result
 
-    return recurse(buttons, max_depth)
+    with recurse.scope():
+        return recurse(buttons, max_depth)
 
 
 def button_path_length(
@@ -86,7 +92,7 @@ def button_path_length(
     button_locations: dict[str, Point],
     max_depth: int,
 ):
-    @cache
+    @memoize(policy="scoped")
     def recurse(btns: str, depth: int):
         if depth == 0:
             return len(btns)
@@ -102,10 +108,12 @@ def button_path_length(
 
         return result
 
-    return recurse(buttons, max_depth)
+    with recurse.scope():
+        return recurse(buttons, max_depth)
 
 
 def simulate(
+    numpad_instructions: list[str],
     iterations: int,
     numpad_paths: dict[Point, dict[Point, list[Move]]],
     numpad_start_point: Point,
@@ -113,10 +121,8 @@ def simulate(
     directional_paths: dict[Point, dict[Point, list[Move]]],
     directional_start_point: Point,
     directional_locations: dict[str, Point],
-    dbg: bool = False,
 ):
     complexity = []
-    numpad_instructions = parse_input("test.txt" if dbg else "input.txt")
     directional_instructions: list[str] = []
     for instruction in numpad_instructions:
         complexity.append(int(instruction[:-1]))
@@ -139,8 +145,9 @@ def simulate(
     return sum(complexity)
 
 
-def part1():
+def part1(f: str = "input.txt"):
     complexity = simulate(
+        parse_input(f),
         2,
         min_numpad_paths,
         numpad_start_point,
@@ -148,13 +155,13 @@ def part1():
         min_directional_paths,
         directional_start_point,
         directional_locations,
-        dbg=False,
     )
     return complexity
 
 
-def part2():
+def part2(f: str = "input.txt"):
     complexity = simulate(
+        parse_input(f),
         25,
         min_numpad_paths,
         numpad_start_point,
@@ -162,6 +169,11 @@ def part2():
         min_directional_paths,
         directional_start_point,
         directional_locations,
-        dbg=False,
     )
     return complexity
+
+
+if __name__ == "__main__":
+    f = default_input(21)
+    print(part1(f))
+    print(part2(f))
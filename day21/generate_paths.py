@@ -1,7 +1,12 @@
-import heapq
-from copy import deepcopy
 from itertools import permutations
-from day21 import (
+from pathlib import Path
+
+from aoc.checkpoint import Checkpoint
+from aoc.runner import default_input
+from aoc.search import dijkstra
+from aoc.sweep import sweep
+
+from .day21 import (
     Point,
     Grid,
     Move,
@@ -14,6 +19,7 @@ from day21 import (
     TURN,
     NUMERIC_BUTTONS,
     DIRECTIONAL_BUTTONS,
+    parse_input,
     simulate,
 )
 
@@ -27,47 +33,36 @@ def can_move_to(pos: Point, grid: Grid) -> bool:
 
 
 def find_paths(start: Point, grid: Grid, costs: dict[str, int]):
-    def get_neighbors(p: Point):
-        neighbors: list[Move] = []
+    # Search over (point, direction moved to get there) so turn costs are exact.
+    # The states along a path are exactly the moves it makes.
+    def neighbors(state: Move):
+        pos, direction = state
         for d in Direction:
             offset, symbol = d.value
-            d_pos = (offset[0] + p[0], offset[1] + p[1])
+            d_pos = (offset[0] + pos[0], offset[1] + pos[1])
             if not can_move_to(d_pos, grid):
                 continue
-            neighbors.append((d_pos, symbol))
-        return neighbors
+
+            turn_cost = costs[TURN] if direction and direction != symbol else 0
+            yield ((d_pos, symbol), 1 + turn_cost + costs[symbol])
 
     # Dijkstra's algorithm
-    distances: dict[Point, int] = {start: 0}
-    paths: dict[Point, list[Move]] = {start: []}
-    q = [(0, start, "", [(start, "")])]
-    while q:
-        dist, pos, direction, path = heapq.heappop(q)
-
-        for neighbor in get_neighbors(pos):
-            neighbor_point, neighbor_direction = neighbor
-            neighbor_path = path + [(neighbor_point, neighbor_direction)]
-
-            turn_cost = (
-                costs[TURN] if direction and direction != neighbor_direction else 0
-            )
-
-            neighbor_cost = costs[neighbor_direction]
-            neighbor_score = dist + 1 + turn_cost + neighbor_cost
-
-            if neighbor_score < distances.get(neighbor_point, float("inf")):
-                distances[neighbor_point] = neighbor_score
-                paths[neighbor_point] = neighbor_path
-                heapq.heappush(
-                    q,
-                    (
-                        neighbor_score,
-                        neighbor_point,
-                        neighbor_direction,
-                        neighbor_path,
-                    ),
-                )
+    result = dijkstra((start, ""), neighbors)
+
+    # Keep the cheapest way into each point. Where moves tie, the one the search
+    # reached first wins. The old search kept one path per point, pricing turns
+    # from whichever move got there first, so some of its paths cost more than
+    # they had to, and its ties went by heap order: both can differ from these.
+    best: dict[Point, Move] = {}
+    for state, cost in result.cost.items():
+        point = state[0]
+        if point not in best or cost < result.cost[best[point]]:
+            best[point] = state
 
+    paths: dict[Point, list[Move]] = {start: []}
+    for point, state in best.items():
+        if point != start:
+            paths[point] = result.path(state)
     return paths
 
 
@@ -79,36 +74,16 @@ def get_button_locations(grid: Grid):
     return locations
 
 
-def precompute_paths(
-    grid: Grid, costs: dict[str, int], prev_paths: dict[Point, dict[Point, list[Move]]]
-):
-    def num_turns(moves: list[Move]):
-        turns, heading = 0, ""
-        for move in moves:
-            _, d = move
-            if d != heading:
-                turns += 1
-            heading = d
-        return turns
-
+def precompute_paths(grid: Grid, costs: dict[str, int]):
     # For each point, generate path to all other points
-    paths = prev_paths
+    paths: dict[Point, dict[Point, list[Move]]] = {}
     for i in range(len(grid)):
         for j in range(len(grid[i])):
             if grid[i][j] == EMPTY:
                 continue
 
             point = (i, j)
-            paths_from_point = find_paths(point, grid, costs)
-
-            # Store path with fewest turns
-            for other_point, path in paths_from_point.items():
-                if point in prev_paths and num_turns(
-                    prev_paths[point][other_point]
-                ) < num_turns(path):
-                    paths_from_point[other_point] = prev_paths[point][other_point]
-
-            paths[point] = paths_from_point
+            paths[point] = find_paths(point, grid, costs)
 
     return paths
 
@@ -116,27 +91,28 @@ def precompute_paths(
 # Precompute min paths and points of interest.
 # Run this and dump the contents to files so we don't need to
 # recalculate every time.
-def find_minimal_paths(iterations: int):
-    min_numpad_paths, min_directional_paths = {}, {}
-    min_complexity = float("inf")
-
-    numpad_paths = {}
+def find_minimal_paths(
+    iterations: int,
+    numpad_instructions: list[str],
+    checkpoint: Checkpoint | None = None,
+    jobs: int | None = None,
+):
     numpad_locations = get_button_locations(NUMERIC_BUTTONS)
     numpad_start_point = numpad_locations["A"]
 
-    directional_paths = {}
     directional_locations = get_button_locations(DIRECTIONAL_BUTTONS)
     directional_start_point = directional_locations["A"]
 
-    # Tune Dijkstra parameters to find min paths
-    for l, r, d, u, t in permutations(range(10), 5):
+    # Tune Dijkstra parameters to find min paths. Each set of costs gets paths of
+    # its own, so the best set is the same however the sweep splits them up.
+    def check(cost_vector: tuple[int, ...]):
+        l, r, d, u, t = cost_vector
         costs = {LEFT: l, RIGHT: r, UP: u, DOWN: d, TURN: t}
 
-        numpad_paths = precompute_paths(NUMERIC_BUTTONS, costs, numpad_paths)
-        directional_paths = precompute_paths(
-            DIRECTIONAL_BUTTONS, costs, directional_paths
-        )
+        numpad_paths = precompute_paths(NUMERIC_BUTTONS, costs)
+        directional_paths = precompute_paths(DIRECTIONAL_BUTTONS, costs)
         complexity = simulate(
+            numpad_instructions,
             iterations,
             numpad_paths,
             numpad_start_point,
@@ -146,11 +122,18 @@ def find_minimal_paths(iterations: int):
             directional_locations,
         )
 
-        if complexity < min_complexity:
-            min_numpad_paths = deepcopy(numpad_paths)
-            min_directional_paths = deepcopy(directional_paths)
-            min_complexity = complexity
-            print("Min complexity", min_complexity)
+        return (complexity, numpad_paths, directional_paths)
+
+    [(_, (min_complexity, min_numpad_paths, min_directional_paths))] = sweep(
+        list(permutations(range(10), 5)),
+        check,
+        reduce="min",
+        key=lambda found: found[0],
+        workers=jobs,
+        checkpoint=checkpoint,
+        name="day21 paths",
+    )
+    print("Min complexity", min_complexity)
 
     return (
         min_numpad_paths,
@@ -162,7 +145,7 @@ def find_minimal_paths(iterations: int):
     )
 
 
-def generate_min_path_file(iterations: int):
+def generate_min_path_file(iterations: int, f: str = "input.txt"):
     (
         min_numpad_paths,
         numpad_locations,
@@ -170,9 +153,11 @@ def generate_min_path_file(iterations: int):
         min_directional_paths,
         directional_locations,
         directional_start_point,
-    ) = find_minimal_paths(iterations)
+    ) = find_minimal_paths(
+        iterations, parse_input(f), Checkpoint(f"day21-paths-{iterations}", f)
+    )
 
-    with open("paths.py", "w") as file:
+    with open(Path(__file__).with_name("paths.py"), "w") as file:
         file.write(f"min_numpad_paths = {min_numpad_paths}\n")
         file.write(f"numpad_locations = {numpad_locations}\n")
         file.write(f"numpad_start_point = {numpad_start_point}\n")
@@ -181,5 +166,6 @@ def generate_min_path_file(iterations: int):
         file.write(f"directional_start_point = {directional_start_point}\n")
 
 
-# Tune this number to get optimal paths
-generate_min_path_file(5)
+if __name__ == "__main__":
+    # Tune this number to get optimal paths
+    generate_min_path_file(5, default_input(21))
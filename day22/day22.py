@@ -1,11 +1,21 @@
 from collections import defaultdict, deque
+from collections.abc import Iterator
 
+from aoc.backend import choose
+from aoc.cache import cached_parse
+from aoc.ints import read_ints
+from aoc.runner import default_input
+from aoc.session import session, shared
+from aoc.stream import records
 
-def parse_input(f: str):
-    with open(f, "r") as file:
-        lines = file.readlines()
 
-    return [int(line.strip()) for line in lines]
+def stream_input(f: str) -> Iterator[int]:
+    return records(f, int)
+
+
+@cached_parse()
+def parse_input(f: str):
+    return read_ints(f).values.tolist()
 
 
 def generate_secret_number(secret: int, iterations: int):
@@ -17,33 +27,80 @@ def generate_secret_number(secret: int, iterations: int):
     return secret
 
 
-def part1():
-    initial_numbers = parse_input("input.txt")
+def generate_prices(secret: int, iterations: int) -> tuple[int, list[int]]:
+    # The final secret along with the price (ones digit) at every step
+    ones = [secret % 10]
+    for _ in range(iterations):
+        secret = ((secret << 6) ^ secret) & 0xFFFFFF
+        secret = ((secret >> 5) ^ secret) & 0xFFFFFF
+        secret = ((secret << 11) ^ secret) & 0xFFFFFF
+        ones.append(secret % 10)
+
+    return (secret, ones)
+
+
+@shared
+def buyer_arrays(f: str):
+    # Every buyer's secrets evolve in lockstep, so evolve them all at once: the
+    # final secrets, and a (buyers, iterations + 1) array of prices
+    import numpy as np
+
+    secrets = np.array(parse_input(f), dtype=np.int64)
+    prices = np.empty((len(secrets), 2001), dtype=np.int8)
+    prices[:, 0] = secrets % 10
+    for i in range(1, 2001):
+        secrets = ((secrets << 6) ^ secrets) & 0xFFFFFF
+        secrets = ((secrets >> 5) ^ secrets) & 0xFFFFFF
+        secrets = ((secrets << 11) ^ secrets) & 0xFFFFFF
+        prices[:, i] = secrets % 10
 
-    total = sum(generate_secret_number(i, 2000) for i in initial_numbers)
+    return (secrets, prices)
+
+
+def part1(f: str = "input.txt", backend: str = "auto"):
+    if choose(22, 1, f, backend) == "numpy":
+        secrets, _ = buyer_arrays(f)
+        return int(secrets.sum())
+
+    # Buyers are independent, so each one's secrets are generated as it's read
+    # and nothing is kept once it's done
+    total = sum(generate_secret_number(secret, 2000) for secret in stream_input(f))
     return total
 
 
-def generate_prices(secret: int, iterations: int):
-    ones = []
-    for _ in range(iterations + 1):
-        ones.append(secret % 10)
-        secret = ((secret << 6) ^ secret) & 0xFFFFFF
-        secret = ((secret >> 5) ^ secret) & 0xFFFFFF
-        secret = ((secret << 11) ^ secret) & 0xFFFFFF
+def best_sequence_numpy(prices) -> int:
+    import numpy as np
+
+    # Each run of 4 changes as a single base-19 number, for the price it ends at
+    changes = np.diff(prices.astype(np.int64), axis=1) + 9
+    keys = (
+        (changes[:, :-3] * 19 + changes[:, 1:-2]) * 19 + changes[:, 2:-1]
+    ) * 19 + changes[:, 3:]
+    sells = prices[:, 4:]
+
+    # Monkeys sell at the first time a buyer's prices change that way
+    buyers = np.arange(len(prices))[:, None]
+    _, first = np.unique((buyers * 19**4 + keys).ravel(), return_index=True)
 
-    return ones
+    totals = np.bincount(
+        keys.ravel()[first], weights=sells.ravel()[first], minlength=19**4
+    )
+    return int(totals.max()) if len(first) else 0
 
 
-def part2():
-    initial_numbers = parse_input("input.txt")
+def part2(f: str = "input.txt", backend: str = "auto"):
+    if choose(22, 2, f, backend) == "numpy":
+        _, prices = buyer_arrays(f)
+        return best_sequence_numpy(prices)
 
-    buyer_prices = defaultdict(dict)  # buyer_idx -> {subseq: max_price}
-    subseq_to_buyers = defaultdict(set)  # subseq -> set(buyer_idx)
+    # Bananas each run of 4 changes earns over the buyers so far. It's all that's
+    # kept between buyers, and there are at most 19^4 runs.
+    totals = defaultdict(int)
 
-    for buyer_idx, initial_secret in enumerate(initial_numbers):
+    for secret in stream_input(f):
+        _, prices = generate_prices(secret, 2000)
+        seen = set()
         last_4_changes = deque(maxlen=4)
-        prices = generate_prices(initial_secret, 2000)
 
         prev_price = prices[0]
         for price_idx in range(1, len(prices)):
@@ -51,18 +108,19 @@ def part2():
             change = price - prev_price
             last_4_changes.append(change)
             if len(last_4_changes) == 4:
+                # Monkeys sell the first time they see a run
                 subseq_tuple = tuple(last_4_changes)
-                if subseq_tuple not in buyer_prices[buyer_idx]:
-                    buyer_prices[buyer_idx][subseq_tuple] = price
-
-                subseq_to_buyers[subseq_tuple].add(buyer_idx)
+                if subseq_tuple not in seen:
+                    seen.add(subseq_tuple)
+                    totals[subseq_tuple] += price
 
             prev_price = price
 
-    return max(
-        sum(buyer_prices[buyer_idx].get(subseq, 0) for buyer_idx in buyers)
-        for subseq, buyers in subseq_to_buyers.items()
-    )
+    return max(totals.values())
 
 
-print(part2())
+if __name__ == "__main__":
+    f = default_input(22)
+    with session():
+        print(part1(f))
+        print(part2(f))
@@ -1,3 +1,11 @@
+from aoc import search
+from aoc.cache import cached_parse
+from aoc.dsu import DisjointSet
+from aoc.runner import default_input
+from aoc.search import SearchStats
+from aoc.stream import records
+
+
 class Node:
     def __init__(self, value: str):
         self.value = value
@@ -10,11 +18,9 @@ class Node:
 type Graph = dict[str, Node]
 
 
+@cached_parse()
 def parse_input(f: str):
-    with open(f, "r") as file:
-        lines = file.readlines()
-
-    return [line.strip().split("-") for line in lines]
+    return list(records(f, lambda line: line.split("-")))
 
 
 def build_graph(adjacencies: list[list[str]]):
@@ -28,7 +34,7 @@ def build_graph(adjacencies: list[list[str]]):
     return nodes
 
 
-def get_cycles_of_length(graph: Graph, length: int):
+def get_cycles_of_length_reference(graph: Graph, length: int):
     def recurse(cur: Node, root: Node, path: set[Node], all_paths: set[Node]):
         if len(path) == length:
             if cur == root:
@@ -44,6 +50,30 @@ def get_cycles_of_length(graph: Graph, length: int):
     return cycles
 
 
+def get_cycles_of_length(graph: Graph, length: int):
+    # Same cycles as get_cycles_of_length_reference, but each cycle is only walked
+    # from its lowest ranked node and through higher ranked ones, so it is found
+    # twice (once per direction) instead of twice from every node on it
+    rank = {node: i for i, node in enumerate(graph.values())}
+    cycles = set[frozenset]()
+
+    def recurse(cur: Node, root_rank: int, path: list[Node]):
+        if len(path) == length:
+            if path[0] in cur.children:
+                cycles.add(frozenset(path))
+            return
+
+        for child in cur.children:
+            if rank[child] > root_rank and child not in path:
+                path.append(child)
+                recurse(child, root_rank, path)
+                path.pop()
+
+    for node in graph.values():
+        recurse(node, rank[node], [node])
+    return cycles
+
+
 def find_chief(cycles: set[frozenset[Node]]):
     has_t = 0
     for cycle in cycles:
@@ -58,8 +88,8 @@ def password_str(cycle: set[Node]):
     return ",".join(sorted([v.value for v in cycle]))
 
 
-def part1(dbg: bool = False):
-    adjacencies = parse_input("input.txt")
+def part1(f: str = "input.txt", dbg: bool = False):
+    adjacencies = parse_input(f)
     graph = build_graph(adjacencies)
     cycles = get_cycles_of_length(graph, 3)
 
@@ -70,26 +100,69 @@ def part1(dbg: bool = False):
 
 
 def bron_kerbosch(
-    R: set[Node], P: set[Node], X: set[Node], graph: Graph, cliques: list[set]
+    R: set[Node],
+    P: set[Node],
+    X: set[Node],
+    graph: Graph,
+    cliques: list[set],
+    stats: SearchStats | None = None,
 ):
+    if stats is not None:
+        stats.expanded += 1
+        stats.frontier(len(R))
+
     if not P and not X:
         cliques.append(R)
         return
 
     for node in list(P):
-        bron_kerbosch(R | {node}, P & node.children, X & node.children, graph, cliques)
+        bron_kerbosch(
+            R | {node}, P & node.children, X & node.children, graph, cliques, stats
+        )
         P.remove(node)
         X.add(node)
 
 
-def find_largest_clique(graph: Graph):
-    cliques = []
-    bron_kerbosch(set(), set(graph.values()), set(), graph, cliques)
-    return max(cliques, key=len) if cliques else set()
+def connected_components(graph: Graph) -> list[list[Node]]:
+    nodes = list(graph.values())
+    ids = {node: i for i, node in enumerate(nodes)}
+    sets = DisjointSet(len(nodes))
+    sets.union_all(
+        [ids[node] for node in nodes for _ in node.children],
+        [ids[child] for node in nodes for child in node.children],
+    )
+
+    components: list[list[Node]] = [[] for _ in range(sets.sets)]
+    for node, label in zip(nodes, sets.labels().tolist()):
+        components[label].append(node)
+    return components
 
 
-def part2():
-    adjacencies = parse_input("input.txt")
+def find_largest_clique(graph: Graph):
+    # A clique never spans components, so each is searched on its own, largest
+    # first, and any too small to beat the best clique so far is skipped
+    largest = set()
+    stats = search.stats("day23.bron_kerbosch")
+    for component in sorted(connected_components(graph), key=len, reverse=True):
+        if len(component) <= len(largest):
+            break
+
+        cliques = []
+        bron_kerbosch(set(), set(component), set(), graph, cliques, stats)
+        clique = max(cliques, key=len)
+        if len(clique) > len(largest):
+            largest = clique
+    return largest
+
+
+def part2(f: str = "input.txt"):
+    adjacencies = parse_input(f)
     graph = build_graph(adjacencies)
     largest_clique = find_largest_clique(graph)
     return password_str(largest_clique)
+
+
+if __name__ == "__main__":
+    f = default_input(23)
+    print(part1(f))
+    print(part2(f))
@@ -1,30 +1,37 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-
-
-with open("input.txt", "r") as file:
-    lines = file.readlines()
-
-edges = [line.strip().split("-") for line in lines]
-
-# Create a graph
-G = nx.Graph()
-G.add_edges_from(edges)
-
-# Draw the graph
-plt.figure(figsize=(10, 8))
-pos = nx.spring_layout(G, seed=42)  # Layout for positioning nodes
-nx.draw(
-    G,
-    pos,
-    with_labels=True,
-    node_color="skyblue",
-    edge_color="gray",
-    node_size=2000,
-    font_size=10,
-    font_weight="bold",
-)
-
-# Show the plot
-plt.title("Graph Visualization")
-plt.show()
+from aoc.runner import default_input
+
+from .day23 import parse_input
+
+
+def draw(f: str = "input.txt"):
+    # Plotting libraries are slow to import and only needed here
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
+    edges = parse_input(f)
+
+    # Create a graph
+    G = nx.Graph()
+    G.add_edges_from(edges)
+
+    # Draw the graph
+    plt.figure(figsize=(10, 8))
+    pos = nx.spring_layout(G, seed=42)  # Layout for positioning nodes
+    nx.draw(
+        G,
+        pos,
+        with_labels=True,
+        node_color="skyblue",
+        edge_color="gray",
+        node_size=2000,
+        font_size=10,
+        font_weight="bold",
+    )
+
+    # Show the plot
+    plt.title("Graph Visualization")
+    plt.show()
+
+
+if __name__ == "__main__":
+    draw(default_input(23))
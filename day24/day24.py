@@ -2,9 +2,17 @@ import re
 from copy import deepcopy
 from itertools import combinations, permutations
 
+from aoc import search
+from aoc.cache import cached_parse
+from aoc.checkpoint import Checkpoint
+from aoc.output import emit
+from aoc.runner import default_input
+from aoc.sweep import sweep
+
 type Graph = dict[str, tuple[str, str, str]]
 
 
+@cached_parse()
 def parse_input(f: str):
     with open(f, "r") as file:
         parts = file.read().split("\n\n")
@@ -46,17 +54,24 @@ def apply_operation(val1: int, val2: int, op: str):
 def evaluate_graph(graph: Graph, inputs: dict[str, int]):
     values = inputs.copy()
     visited = set()
+    stats = search.stats("day24.evaluate_graph")
 
     def compute(var):
         if var in values:
+            if stats is not None:
+                stats.hits += 1
             return values[var]
 
         if var in visited:
             return None
 
         visited.add(var)
+        if stats is not None:
+            stats.misses += 1
 
         if var in graph:
+            if stats is not None:
+                stats.expanded += 1
             var1, var2, op = graph[var]
             values[var] = apply_operation(compute(var1), compute(var2), op)
 
@@ -68,8 +83,8 @@ def evaluate_graph(graph: Graph, inputs: dict[str, int]):
     return values
 
 
-def part1():
-    signals, gates = parse_input("input.txt")
+def part1(f: str = "input.txt"):
+    signals, gates = parse_input(f)
 
     graph: Graph = {}
     for var1, var2, op, output in gates:
@@ -141,14 +156,22 @@ def run_graph(graph, signals, dbg=False):
     return z_val
 
 
-def part2(dbg=False):
-    signals, gates = parse_input("test3.txt" if dbg else "input.txt")
+# The swaps already found in the real input, by looking at the wrong bits
+SWAPS = [("z18", "fvw"), ("z36", "nwq"), ("z22", "mdb")]
+
+
+def part2(
+    f: str = "input.txt",
+    dbg=False,
+    jobs: int | None = None,
+    swaps: list[tuple[str, str]] = SWAPS,
+):
+    signals, gates = parse_input(f)
 
     graph: Graph = {}
     for var1, var2, op, output in gates:
         graph[output] = (var1, var2, op)
 
-    swaps = [("z18", "fvw"), ("z36", "nwq"), ("z22", "mdb")]
     for a, b in swaps:
         graph[a], graph[b] = graph[b], graph[a]
 
@@ -156,39 +179,56 @@ def part2(dbg=False):
     for a, b in swaps:
         locked_outputs.update([a, b])
 
-    correct = run_graph(graph, signals, dbg=True)
-    print(correct)
-
-    test_signals = signals.copy()
+    correct = run_graph(graph, signals, dbg=dbg)
+    if dbg:
+        print(correct)
 
-    for i in range(45):
-        test_signals[f"x{i:02d}"] = 0
-        test_signals[f"y{i:02d}"] = 0
+    xs = sorted(k for k in signals if k.startswith("x"))
+    ys = sorted(k for k in signals if k.startswith("y"))
 
-    test_signals["x00"] = 1
-    test_signals["x01"] = 1
-    test_signals["x02"] = 1
-    test_signals["x03"] = 1
-    test_signals["x04"] = 1
-    test_signals["x05"] = 1
-    test_signals["y00"] = 1
+    def adding(x: int, y: int) -> dict[str, int]:
+        test_signals = dict.fromkeys(signals, 0)
+        for i in range(6):
+            test_signals[xs[i]] = (x >> i) & 1
+            test_signals[ys[i]] = (y >> i) & 1
+        return test_signals
 
-    # for i in range(6):
-    #     test_signals[f"x{i:02d}"] = 1
-    #     print(run_graph(graph, test_signals, dbg=True))
-    #     pass
+    # Sums that carry through the lowest six bits, with every other input 0.
+    # 63 + 1 on its own also passes swaps of wires that happen to hold the same
+    # values for it.
+    tests = [(x + y, adding(x, y)) for x, y in [(63, 1), (42, 21), (63, 63), (27, 45)]]
 
     # Brute force the last one
-    for o1, o2 in combinations(graph.keys(), 2):
-        if o1 in locked_outputs or o2 in locked_outputs:
-            continue
-
+    pairs = [
+        (o1, o2)
+        for o1, o2 in combinations(graph.keys(), 2)
+        if o1 not in locked_outputs and o2 not in locked_outputs
+    ]
+
+    def check(pair: tuple[str, str]):
+        o1, o2 = pair
         test_graph = graph.copy()
         test_graph[o1], test_graph[o2] = test_graph[o2], test_graph[o1]
+        if all(run_graph(test_graph, s) == total for total, s in tests):
+            return pair
+        return None
 
-        test_result = run_graph(test_graph, test_signals)
-        if test_result == 64:
-            print("CORRECT", o1, o2, test_result)
-
-
-part2(dbg=False)
+    found_swaps = []
+    for _, (o1, o2) in sweep(
+        pairs,
+        check,
+        reduce="all",
+        workers=jobs,
+        checkpoint=Checkpoint("day24-part2", f),
+        name="day24 part2",
+    ):
+        emit("CORRECT {} {}", o1, o2)
+        found_swaps.append((o1, o2))
+
+    return ",".join(sorted(locked_outputs.union(*found_swaps)))
+
+
+if __name__ == "__main__":
+    f = default_input(24)
+    print(part1(f))
+    print(part2(f))
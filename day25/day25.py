@@ -1,3 +1,8 @@
+from aoc.cache import cached_parse
+from aoc.runner import default_input
+
+
+@cached_parse()
 def parse_input(f: str):
     with open(f, "r") as file:
         parts = file.read().split("\n\n")
@@ -32,8 +37,8 @@ def fits(lock, key):
     return True
 
 
-def part1():
-    locks, keys = parse_input("input.txt")
+def part1(f: str = "input.txt"):
+    locks, keys = parse_input(f)
 
     num_fits = 0
     for lock in locks:
@@ -42,4 +47,6 @@ def part1():
     return num_fits
 
 
-print(part1())
+if __name__ == "__main__":
+    f = default_input(25)
+    print(part1(f))
@@ -1,14 +1,16 @@
 import re
 
-def parse_input() -> str:
-    with open("input.txt", "r") as file:
+from aoc.runner import default_input
+
+def parse_input(f: str) -> str:
+    with open(f, "r") as file:
         buf = file.read()
         
     return buf
 
 
-def part1():
-    buf = parse_input()
+def part1(f: str = "input.txt"):
+    buf = parse_input(f)
     
     pattern = re.compile(r"mul\((\d+),(\d+)\)")
     result = pattern.findall(buf)
@@ -19,8 +21,8 @@ def part1():
         
     return sum
     
-def part2():
-    buf = parse_input()
+def part2(f: str = "input.txt"):
+    buf = parse_input(f)
     
     pattern = re.compile(r"(?:(?:(do|don't)\(\))|mul\((\d+),(\d+)\))")
     result = pattern.findall(buf)
@@ -37,3 +39,9 @@ def part2():
             sum += (int(a) * int(b))
         
     return sum
+
+
+if __name__ == "__main__":
+    f = default_input(3)
+    print(part1(f))
+    print(part2(f))
@@ -1,95 +1,58 @@
-def parse_input() -> str:
-    lines = []
-    
-    with open("input.txt", "r") as file:
-        lines = file.readlines()
-      
-    rows = []  
-    for line in lines:
-        cur_row = []
-        for c in line:
-            if c != "\n":
-                cur_row.append(c)
-        rows.append(cur_row)
-        
-    return rows
-
-def find_word_in_word_search(board, word):
-    count = 0
-    
-    def backtrack(r, c, index, dir):
-        nonlocal count
-        
-        if index == len(word):
-            count += 1
-            return
-        
-        if r < 0 or r >= rows or c < 0 or c >= cols or board[r][c] != word[index]:
-            return
+import numpy as np
 
-        # Mark the cell as visited
-        prev_val, board[r][c] = board[r][c], "."
+from aoc.grid import Grid, ORTHOGONAL, DIAGONAL
+from aoc.runner import default_input
 
-        dr, dc = dir
-        backtrack(r + dr, c + dc, index + 1, dir)
+def parse_input(f: str) -> Grid:
+    return Grid.map_file(f)
 
-        board[r][c] = prev_val
-
-    rows, cols = len(board), len(board[0])
-    directions = [
-        (0, 1),   # Right
-        (0, -1),  # Left
-        (1, 0),   # Down
-        (-1, 0),  # Up
-        (1, 1),   # Diagonal down-right
-        (1, -1),  # Diagonal down-left
-        (-1, 1),  # Diagonal up-right
-        (-1, -1), # Diagonal up-left
-    ]
-
-    for r in range(rows):
-            for c in range(cols):
-                if board[r][c] == word[0]:
-                    for dir in directions:
-                        backtrack(r, c, 0, dir)
+def find_word_in_word_search(board: Grid, word: str):
+    # Shift the whole board once per letter and direction, then AND the matches.
+    # A cell is counted for every direction where the word starts there.
+    count = 0
+    for dr, dc in ORTHOGONAL + DIAGONAL:
+        matches = np.ones(board.shape, dtype=bool)
+        for index, letter in enumerate(word):
+            matches &= board.shifted((dr * index, dc * index)) == ord(letter)
+        count += int(np.count_nonzero(matches))
 
     return count
 
-def find_patterns_in_word_search(board, patterns):
-    rows, cols = len(board), len(board[0])
+def find_patterns_in_word_search(board: Grid, patterns):
+    rows, cols = board.shape
     
-    def matches_pattern(r, c, pattern):
+    def matches_pattern(pattern):
         pattern_rows, pattern_cols = len(pattern), len(pattern[0])
         
+        # Every top-left corner where the pattern fits on the board
+        match_rows = max(0, rows - pattern_rows + 1)
+        match_cols = max(0, cols - pattern_cols + 1)
+        matches = np.ones((match_rows, match_cols), dtype=bool)
         for r_pattern in range(0, pattern_rows):
             for c_pattern in range(0, pattern_cols):                
-                board_r, board_c = r+r_pattern, c+c_pattern
-                if board_r >= rows or board_c >= cols:
-                    return False
+                # Filled in pattern cells must match the board
+                if pattern[r_pattern][c_pattern] == '.':
+                    continue
                 
-                # No match if pattern is filled in and different than board
-                if pattern[r_pattern][c_pattern] != '.' and pattern[r_pattern][c_pattern] != board[board_r][board_c]:
-                    return False
+                window = board.cells[r_pattern:r_pattern + match_rows, c_pattern:c_pattern + match_cols]
+                matches &= window == ord(pattern[r_pattern][c_pattern])
         
-        return True
+        return int(np.count_nonzero(matches))
             
 
     count = 0
-    for r in range(rows):
-        for c in range(cols):
-            for pattern in patterns:
-                if matches_pattern(r, c, pattern):
-                    count += 1
+    for pattern in patterns:
+        count += matches_pattern(pattern)
 
     return count
 
-def part1(): 
-    rows = parse_input()
+def part1(f: str = "input.txt"):
+    rows = parse_input(f)
     matches = find_word_in_word_search(rows, "XMAS")
-    print(f"Matches: {matches}")
+    return matches
 
-def part2():
-    rows = parse_input()
+def part2(f: str = "input.txt"):
+    rows = parse_input(f)
     patterns = [
         ['M.M',
          '.A.',
@@ -105,6 +68,10 @@ def part2():
          'M.M']
     ]
     matches = find_patterns_in_word_search(rows, patterns)
-    print(f"Matches: {matches}")
-    
-part2()
\ No newline at end of file
+    return matches
+
+
+if __name__ == "__main__":
+    f = default_input(4)
+    print(f"Matches: {part1(f)}")
+    print(f"Matches: {part2(f)}")
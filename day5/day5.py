@@ -1,5 +1,9 @@
 from functools import cmp_to_key
 
+from aoc.cache import cached_parse
+from aoc.output import emit
+from aoc.runner import default_input
+
 class Node:
     def __init__(self, value):
         self.value = value
@@ -21,10 +25,11 @@ class Node:
             
         return None
     
-def parse_input():
+@cached_parse()
+def parse_input(f: str):
     order = []
     update = []
-    with open("input.txt", "r") as file:
+    with open(f, "r") as file:
         lines = file.readlines()
       
     split_index = lines.index("\n")
@@ -61,8 +66,8 @@ def is_correct_update(update, root):
         
     return True
     
-def part1():
-    order, update = parse_input()
+def part1(f: str = "input.txt"):
+    order, update = parse_input(f)
     
     # Find correct updates
     correct_updates = []
@@ -77,7 +82,7 @@ def part1():
         if is_correct_update(u, root):
             correct_updates.append(u)
             
-    print(f"Correct: {len(correct_updates)} of {len(update)}")
+    emit("Correct: {} of {}", len(correct_updates), len(update))
     
     # Sum middle elements
     middle_sum = 0
@@ -99,8 +104,8 @@ def fix_update(update, root):
         
     return sorted(update, key=cmp_to_key(compare))
 
-def part2():
-    order, update = parse_input()
+def part2(f: str = "input.txt"):
+    order, update = parse_input(f)
     
     fixed_updates = []
     for u in update:
@@ -123,3 +128,9 @@ def part2():
         middle_sum += middle
     
     return middle_sum
+
+
+if __name__ == "__main__":
+    f = default_input(5)
+    print(part1(f))
+    print(part2(f))
@@ -1,12 +1,15 @@
-from typing import List, Tuple
+from typing import Tuple
 from enum import Enum
-from copy import deepcopy
 
-from os import system
-from time import sleep
+import numpy as np
 
-type Point = Tuple[int, int]
-type Grid = List[str]
+from aoc.grid import Grid, Point
+from aoc.instrument import phase
+from aoc.render import Renderer
+from aoc.runner import default_input
+from aoc.session import session, shared
+
+BLOCKED = (ord("#"), ord("O"))
 
 
 class Direction(Enum):
@@ -16,33 +19,12 @@ class Direction(Enum):
     NORTH = (-1, 0)
 
 
-def parse_input():
-    with open("input.txt", "r") as file:
-        lines = file.readlines()
-
-    grid = []
-    for line in lines:
-        row = []
-        for c in line.strip():
-            row.append(c)
-        grid.append(row)
-
-    return grid
+def parse_input(f: str) -> Grid:
+    return Grid.map_file(f)
 
 
 def find_start(grid: Grid) -> Point | None:
-    rows, cols = len(grid), len(grid[0])
-    for i in range(rows):
-        for j in range(cols):
-            if grid[i][j] == "^":
-                return (i, j)
-
-    return None
-
-
-def in_bounds(pos: Point, grid: Grid) -> bool:
-    rows, cols = len(grid), len(grid[0])
-    return 0 <= pos[0] < rows and 0 <= pos[1] < cols
+    return grid.find("^")
 
 
 def rotate_right(dir: Direction) -> Direction:
@@ -63,15 +45,13 @@ def step(pos: Point, dir: Direction, grid: Grid) -> Tuple[Point, Direction, bool
     # Turn right when hitting a wall
     turn_count = 0
     while (
-        in_bounds(next_pos, grid)
-        and grid[next_pos[0]][next_pos[1]] in ["#", "O"]
-        and turn_count < 4
+        grid.in_bounds(next_pos) and grid.view[next_pos] in BLOCKED and turn_count < 4
     ):
         next_dir = rotate_right(next_dir)
         next_pos = (pos[0] + next_dir.value[0], pos[1] + next_dir.value[1])
         turn_count += 1
 
-    is_in_bounds = in_bounds(next_pos, grid)
+    is_in_bounds = grid.in_bounds(next_pos)
 
     return [next_pos, next_dir, is_in_bounds]
 
@@ -87,81 +67,77 @@ def dir_string(dir: Direction) -> str:
         return "^"
 
 
-def grid_string(grid: Grid):
-    s = ""
-    for row in grid:
-        for col in row:
-            s += col
-        s += "\n"
-    return s
-
-
-def part1():
-    grid = parse_input()
-
+@phase("simulate_guard")
+def simulate_guard(grid: Grid, renderer: Renderer | None = None) -> Grid:
     pos, dir, can_continue = find_start(grid), Direction.NORTH, True
-    next_grid = deepcopy(grid)
+    next_grid = grid.copy()
 
     while can_continue:
         prev_pos = pos
         pos, dir, can_continue = step(pos, dir, grid)
 
-        next_grid[prev_pos[0]][prev_pos[1]] = "X"
+        next_grid[prev_pos] = "X"
         if can_continue:
-            next_grid[pos[0]][pos[1]] = dir_string(dir)
+            next_grid[pos] = dir_string(dir)
+
+        if renderer:
+            renderer.draw(next_grid, force=not can_continue)
+
+    return next_grid
+
+
+@shared
+def guard_path(f: str) -> tuple[Grid, Grid]:
+    grid = parse_input(f)
+    return (grid, simulate_guard(grid))
+
 
-        # Crude animation
-        # system("clear")
-        # print(grid_string(next_grid))
-        # sleep(0.1)
+def count_visited(grid: Grid) -> int:
+    return grid.count("X")
 
-    def count_visited():
-        count = 0
-        for row in next_grid:
-            for col in row:
-                if col == "X":
-                    count += 1
-        return count
 
-    return (next_grid, count_visited())
+def part1(f: str = "input.txt", animate: float = 0, record: str | None = None):
+    with Renderer(animate, record) as renderer:
+        if renderer:
+            return count_visited(simulate_guard(parse_input(f), renderer))
 
+    _, visited = guard_path(f)
+    return count_visited(visited)
 
-def part2():
-    grid = parse_input()
-    rows, cols = len(grid), len(grid[0])
 
+def part2(f: str = "input.txt"):
     # Get all points the guard will visit
-    all_visited = []
-    base_case = part1()
-    for i in range(rows):
-        for j in range(cols):
-            if base_case[0][i][j] == "X" and grid[i][j] == ".":
-                all_visited.append((i, j))
+    grid, base_case = guard_path(f)
+    all_visited = np.argwhere((base_case.cells == ord("X")) & (grid.cells == ord(".")))
 
     start_pos = find_start(grid)
     loop_count = 0
 
     # Insert obstruction along path and look for a loop
-    for i, j in all_visited:
-        test_grid = deepcopy(grid)
-        test_grid[i][j] = "O"
+    with phase("find_loops"):
+        for i, j in all_visited:
+            test_grid = grid.copy()
+            test_grid[i, j] = "O"
 
-        pos, dir, can_continue = start_pos, Direction.NORTH, True
-        next_grid = deepcopy(test_grid)
+            pos, dir, can_continue = start_pos, Direction.NORTH, True
 
-        visited = set()
-        while can_continue:
-            # A loop occurs when the same position and orientation have been visited
-            if (pos[0], pos[1], dir) in visited:
-                loop_count += 1
-                # print(grid_string(test_grid))
-                break
+            visited = set()
+            while can_continue:
+                # A loop occurs when the same position and orientation have been visited
+                if (pos[0], pos[1], dir) in visited:
+                    loop_count += 1
+                    # print(test_grid)
+                    break
 
-            visited.add((pos[0], pos[1], dir))
+                visited.add((pos[0], pos[1], dir))
 
-            pos, dir, can_continue = step(pos, dir, test_grid)
+                pos, dir, can_continue = step(pos, dir, test_grid)
 
     return loop_count
 
 
-part2()
+if __name__ == "__main__":
+    f = default_input(6)
+    with session():
+        print(part1(f))
+        print(part2(f))
@@ -1,38 +1,55 @@
-def parse_input(f):
-    with open(f, "r") as file:
-        lines = file.readlines()
+from collections.abc import Iterator
 
-    equations = []
-    for line in lines:
-        parts = line.split(":")
-        total = int(parts[0])
-        nums = [int(num) for num in parts[1].strip().split()]
-        equations.append((total, nums))
+from aoc.output import emit
+from aoc.runner import default_input
+from aoc.stream import records
 
-    return equations
+
+def parse_equation(line: str) -> tuple[int, list[int]]:
+    parts = line.split(":")
+    total = int(parts[0])
+    nums = [int(num) for num in parts[1].strip().split()]
+    return (total, nums)
+
+
+def stream_input(f: str) -> Iterator[tuple[int, list[int]]]:
+    return records(f, parse_equation)
+
+
+# Operators are chained as (previous ops, op) pairs while recursing, which is
+# cheaper than building the expression string at every step
+def expression_str(total, nums, ops):
+    op_list = []
+    while ops:
+        ops, op = ops
+        op_list.append(op)
+
+    return f"{total} = " + "".join(
+        f"{op}{num}" for op, num in zip(reversed(op_list), nums)
+    )
 
 
 def num_valid(total, nums):
-    def recurse(t, n, valid, s):
+    def recurse(t, n, valid, ops):
         if t == total and len(n) == 0:
-            print(s)
+            emit(expression_str, total, nums, ops)
             return valid + 1
 
         if len(n) == 0:
             return valid
 
         cur = n.pop(0)
-        return recurse(t + cur, n[:], valid, f"{s}+{cur}") + recurse(
-            t * cur, n[:], valid, f"{s}*{cur}"
+        return recurse(t + cur, n[:], valid, (ops, "+")) + recurse(
+            t * cur, n[:], valid, (ops, "*")
         )
 
-    return recurse(0, nums[:], 0, f"{total} = ")
+    return recurse(0, nums[:], 0, ())
 
 
 def num_valid_with_concat(total, nums):
-    def recurse(t, n, valid, s):
+    def recurse(t, n, valid, ops):
         if t == total and len(n) == 0:
-            print(s)
+            emit(expression_str, total, nums, ops)
             return valid + 1
 
         if len(n) == 0:
@@ -40,42 +57,34 @@ def num_valid_with_concat(total, nums):
 
         cur = n.pop(0)
         return (
-            recurse(t + cur, n[:], valid, f"{s}+{cur}")
-            + recurse(t * cur, n[:], valid, f"{s}*{cur}")
-            + recurse(int(f"{t}{cur}"), n[:], valid, f"{s}|{cur}")
+            recurse(t + cur, n[:], valid, (ops, "+"))
+            + recurse(t * cur, n[:], valid, (ops, "*"))
+            + recurse(int(f"{t}{cur}"), n[:], valid, (ops, "|"))
         )
 
-    return recurse(0, nums[:], 0, f"{total} = ")
-
+    return recurse(0, nums[:], 0, ())
 
-def part1():
-    equations = parse_input("test.txt")
 
-    results = []
-    for total, nums in equations:
+# Each equation is checked once, so they're read one at a time
+def part1(f: str = "input.txt"):
+    sum = 0
+    for total, nums in stream_input(f):
         valid = num_valid(total, nums)
         if valid > 0:
-            results.append(total)
-
-    sum = 0
-    for r in results:
-        sum += r
+            sum += total
     return sum
 
 
-def part2():
-    equations = parse_input("input.txt")
-
-    results = []
-    for total, nums in equations:
+def part2(f: str = "input.txt"):
+    sum = 0
+    for total, nums in stream_input(f):
         valid = num_valid_with_concat(total, nums)
         if valid > 0:
-            results.append(total)
-
-    sum = 0
-    for r in results:
-        sum += r
+            sum += total
     return sum
 
 
-print(f"Total: {part2()}")
+if __name__ == "__main__":
+    f = default_input(7)
+    print(f"Total: {part1(f)}")
+    print(f"Total: {part2(f)}")
@@ -1,35 +1,29 @@
-from copy import deepcopy
 from typing import Dict, List, Tuple
-from vector2d import Vector2D
 
-type Grid = List[List[str]]
+import numpy as np
 
+from aoc.cache import cached_parse
+from aoc.grid import Grid
+from aoc.output import emit
+from aoc.runner import default_input
+from aoc.vector2d import Vector2D, pack
 
-def parse_input(f) -> Grid:
-    with open(f, "r") as file:
-        lines = file.readlines()
+EMPTY, ANTINODE = ord("."), ord("#")
 
-    grid = []
-    for line in lines:
-        row = [char for char in line.strip()]
-        grid.append(row)
 
-    return grid
+@cached_parse()
+def parse_input(f) -> Grid:
+    return Grid.from_file(f)
 
 
 def find_frequencies(grid: Grid) -> Dict[str, List[Vector2D]]:
-    rows, cols = len(grid), len(grid[0])
     frequencies = {}
-    for i in range(rows):
-        for j in range(cols):
-            char = grid[i][j]
-            if char == ".":
-                continue
-
-            if char not in frequencies:
-                frequencies[char] = []
+    for i, j in np.argwhere(grid.cells != EMPTY):
+        char = grid[i, j]
+        if char not in frequencies:
+            frequencies[char] = []
 
-            frequencies[char].append(Vector2D(i, j))
+        frequencies[char].append(Vector2D(int(j), int(i)))
 
     return frequencies
 
@@ -44,40 +38,26 @@ def all_pairs(points: List[Vector2D]) -> List[Tuple[Vector2D, Vector2D]]:
 
 def find_antinodes(
     points: Tuple[Vector2D, Vector2D], grid: Grid, extent: range
-) -> List[Vector2D]:
+) -> List[int]:
     diff = points[0] - points[1]
 
-    # Starting from each antenna location, extend outward to add points
+    # Starting from each antenna location, extend outward to add points. Antinodes
+    # are returned packed (see Grid.index) so no vectors are built along the way.
+    # Once a point leaves the grid the ones further out do too.
     antinodes = []
-    for pos in extent:
-        pos_point = points[0] + (diff * pos)
-        if in_bounds(pos_point, grid):
-            antinodes.append(pos_point)
-    for neg in extent:
-        neg_point = points[1] - (diff * neg)
-        if in_bounds(neg_point, grid):
-            antinodes.append(neg_point)
+    for start, sign in ((points[0], 1), (points[1], -1)):
+        for n in extent:
+            x, y = start.x + sign * diff.x * n, start.y + sign * diff.y * n
+            if not grid.in_bounds((y, x)):
+                break
+            antinodes.append(pack(x, y, grid.cols))
 
     return antinodes
 
 
-def in_bounds(pos: Vector2D, grid: Grid) -> bool:
-    rows, cols = len(grid), len(grid[0])
-    return 0 <= pos.x < rows and 0 <= pos.y < cols
-
-
-def grid_string(grid: Grid):
-    s = ""
-    for row in grid:
-        for col in row:
-            s += col
-        s += "\n"
-    return s
-
-
-def part1():
-    grid = parse_input("input.txt")
-    antinode_grid = deepcopy(grid)
+def part1(f: str = "input.txt"):
+    grid = parse_input(f)
+    antinode_grid = grid.copy()
 
     # Get all groups of frequencies, pair them off, then calculate
     # antinodes between them. Use range(1, 2) to only calculate the 1st
@@ -89,25 +69,24 @@ def part1():
         for pair in pairs:
             antinodes = find_antinodes(pair, grid, range(1, 2))
             for antinode in antinodes:
-                antinode_grid[antinode.x][antinode.y] = "#"
+                antinode_grid.flat[antinode] = ANTINODE
 
                 # Only count unique locations
-                if grid[antinode.x][antinode.y] == ".":
+                if grid.flat[antinode] == EMPTY:
                     unique_antinodes += 1
 
-    print(grid_string(antinode_grid))
-    print(f"Unique antinodes: {unique_antinodes}")
+    emit(antinode_grid)
+    return unique_antinodes
 
 
-def part2():
-    grid = parse_input("input.txt")
-    antinode_grid = deepcopy(grid)
+def part2(f: str = "input.txt"):
+    grid = parse_input(f)
+    antinode_grid = grid.copy()
 
     # Same as Part 1, but modify extent to {0, dim}, where
     # dim is the max of rows or colums. This is the most we
     # would ever need to extrude
-    rows, cols = len(grid), len(grid[0])
-    dim = max(rows, cols)
+    dim = max(grid.shape)
     unique_antinodes = 0
     frequencies = find_frequencies(grid)
 
@@ -117,9 +96,15 @@ def part2():
             antinodes = find_antinodes(pair, grid, range(0, dim))
             for antinode in antinodes:
                 # Prevent double-counting
-                if antinode_grid[antinode.x][antinode.y] != "#":
+                if antinode_grid.flat[antinode] != ANTINODE:
                     unique_antinodes += 1
-                    antinode_grid[antinode.x][antinode.y] = "#"
+                    antinode_grid.flat[antinode] = ANTINODE
+
+    emit(antinode_grid)
+    return unique_antinodes
+
 
-    print(grid_string(antinode_grid))
-    print(f"Unique antinodes: {unique_antinodes}")
+if __name__ == "__main__":
+    f = default_input(8)
+    print(f"Unique antinodes: {part1(f)}")
+    print(f"Unique antinodes: {part2(f)}")
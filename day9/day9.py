@@ -1,21 +1,27 @@
+import heapq
 from typing import List, Tuple
 
+from aoc.cache import cached_parse
+from aoc.output import emit
+from aoc.runner import default_input
+
 type BlockList = List[str]
 type DiskMapList = List[int]
 
 EMPTY_BLOCK = "."
 
 
+@cached_parse()
 def parse_input(f) -> DiskMapList:
     with open(f, "r") as file:
         input = file.readline()
 
-    disk_map = [int(c) for c in input]
+    disk_map = [int(c) for c in input.strip()]
     return disk_map
 
 
-def print_blocks(blocks: BlockList):
-    print("".join([str(int(b) % 10) if b != EMPTY_BLOCK else "." for b in blocks]))
+def blocks_str(blocks: BlockList) -> str:
+    return "".join([str(int(b) % 10) if b != EMPTY_BLOCK else "." for b in blocks])
 
 
 def get_blocks(disk_map: DiskMapList) -> BlockList:
@@ -82,7 +88,7 @@ def find_first_empty_block(blocks: BlockList, block_size, bounds: range) -> int:
     return -1
 
 
-def defrag_files(disk_map: DiskMapList, blocks: BlockList) -> BlockList:
+def defrag_files_reference(disk_map: DiskMapList, blocks: BlockList) -> BlockList:
     defragged = blocks[:]
 
     tail = len(blocks) - 1
@@ -116,33 +122,86 @@ def defrag_files(disk_map: DiskMapList, blocks: BlockList) -> BlockList:
     return defragged
 
 
+def defrag_files(disk_map: DiskMapList, blocks: BlockList) -> BlockList:
+    defragged = blocks[:]
+
+    # Same moves as defrag_files_reference, but free spans are kept in one heap
+    # of start positions per span length instead of being found by rescanning the
+    # blocks, so each file takes O(log n) rather than O(n). Gaps either side of an
+    # empty file form one span.
+    runs: list[tuple[int, int]] = []
+    run_start = run_end = 0
+    for disk_map_idx, size in enumerate(disk_map):
+        if disk_map_idx % 2 == 0 and size > 0:
+            if run_end > run_start:
+                runs.append((run_start, run_end - run_start))
+            run_start = run_end + size
+        run_end += size
+
+    longest = max((size for _, size in runs), default=0)
+    spans: list[list[int]] = [[] for _ in range(longest + 1)]
+    for start, size in runs:
+        spans[size].append(start)
+
+    tail = len(blocks) - 1
+    for disk_map_idx in range(len(disk_map) - 1, -1, -2):
+        file_size = disk_map[disk_map_idx]
+        file_start = tail - file_size + 1
+
+        # Leftmost span the file fits in. The reference only sees spans that end
+        # before the file's last block, so a file of size 1 never moves into the
+        # span right next to it.
+        best_size, best_start = 0, tail
+        for size in range(file_size, len(spans)):
+            if spans[size] and spans[size][0] < best_start:
+                best_size, best_start = size, spans[size][0]
+
+        if file_size > 0 and best_size and best_start + best_size < tail:
+            heapq.heappop(spans[best_size])
+            if best_size > file_size:
+                heapq.heappush(spans[best_size - file_size], best_start + file_size)
+
+            for b in range(file_size):
+                defragged[best_start + b] = defragged[tail - b]
+                defragged[tail - b] = EMPTY_BLOCK
+
+        tail = file_start - 1
+        if disk_map_idx > 0:
+            tail -= disk_map[disk_map_idx - 1]
+
+    return defragged
+
+
 def compute_checksum(blocks: BlockList):
     return sum([i * int(n) for i, n in enumerate(blocks) if n != EMPTY_BLOCK])
 
 
-def part1():
-    disk_map = parse_input("input.txt")
+def part1(f: str = "input.txt"):
+    disk_map = parse_input(f)
 
     blocks = get_blocks(disk_map)
-    print_blocks(blocks)
+    emit(blocks_str, blocks)
 
     defragged = defrag_blocks(blocks)
-    print_blocks(defragged)
+    emit(blocks_str, defragged)
 
     checksum = compute_checksum(defragged)
-    print(f"Checksum: {checksum}")
+    return checksum
 
 
-def part2():
-    disk_map = parse_input("input.txt")
+def part2(f: str = "input.txt"):
+    disk_map = parse_input(f)
 
     blocks = get_blocks(disk_map)
 
     defragged = defrag_files(disk_map, blocks)
-    # print_blocks(defragged)
+    # emit(blocks_str, defragged)
 
     checksum = compute_checksum(defragged)
-    print(f"Checksum: {checksum}")
+    return checksum
 
 
-part2()
+if __name__ == "__main__":
+    f = default_input(9)
+    print(f"Checksum: {part1(f)}")
+    print(f"Checksum: {part2(f)}")
@@ -0,0 +1,36 @@
+import unittest
+
+from aoc.runner import day_dir
+from day16.day16 import Direction, find_path, move_cost, parse_input
+
+DAY = day_dir(16)
+
+
+def lowest_score(f: str) -> int:
+    grid, start, end = parse_input.uncached(str(DAY / f))
+    return find_path(grid, start, end, Direction.EAST)[0]
+
+
+class FindPathTest(unittest.TestCase):
+    def test_examples(self):
+        self.assertEqual(lowest_score("test.txt"), 7036)
+        self.assertEqual(lowest_score("test2.txt"), 11048)
+
+    def test_heading_is_part_of_the_state(self):
+        # The best path turns south, west and south again down the left side, for
+        # 3005. The path round the right side reaches the cell above E first, for
+        # 2006 but heading west, and marking cells visited by position alone kept
+        # it there, so another turn took that search to 3007.
+        self.assertEqual(lowest_score("heading.txt"), 3005)
+
+    def test_turning_around_is_two_turns(self):
+        self.assertEqual(move_cost(Direction.EAST, Direction.WEST), 2001)
+        self.assertEqual(move_cost(Direction.EAST, Direction.NORTH), 1001)
+        self.assertEqual(move_cost(Direction.EAST, Direction.EAST), 1)
+
+        # E is behind S, facing east, at the end of a corridor
+        self.assertEqual(lowest_score("dead_end.txt"), 2002)
+
+
+if __name__ == "__main__":
+    unittest.main()
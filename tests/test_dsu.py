@@ -0,0 +1,121 @@
+import random
+import unittest
+
+import numpy as np
+
+from aoc.dsu import DisjointSet, grid_pairs, label_grid, number_by_first
+
+
+def reference_labels(size: int, pairs: list[tuple[int, int]]) -> list[int]:
+    # Sets numbered by their smallest ids, from a plain dict of sets
+    sets = {i: {i} for i in range(size)}
+    for a, b in pairs:
+        if sets[a] is not sets[b]:
+            merged = sets[a] | sets[b]
+            for i in merged:
+                sets[i] = merged
+
+    labels, numbers = [], {}
+    for i in range(size):
+        labels.append(numbers.setdefault(min(sets[i]), len(numbers)))
+    return labels
+
+
+class DisjointSetTest(unittest.TestCase):
+    def test_union_and_find(self):
+        sets = DisjointSet(6)
+
+        self.assertTrue(sets.union(0, 1))
+        self.assertTrue(sets.union(2, 3))
+        self.assertTrue(sets.union(1, 3))
+        self.assertFalse(sets.union(0, 2))
+
+        self.assertTrue(sets.connected(0, 3))
+        self.assertFalse(sets.connected(0, 4))
+        self.assertEqual(sets.sets, 3)
+        self.assertEqual(sets.labels().tolist(), [0, 0, 0, 0, 1, 2])
+
+    def test_union_all_of_nothing(self):
+        sets = DisjointSet(4)
+        sets.union_all([], [])
+
+        self.assertEqual(sets.sets, 4)
+        self.assertEqual(sets.roots().tolist(), [0, 1, 2, 3])
+
+        empty = DisjointSet(0)
+        empty.union_all([], [])
+        self.assertEqual(empty.sets, 0)
+        self.assertEqual(empty.labels().tolist(), [])
+
+    def test_union_all_matches_one_at_a_time(self):
+        rng = random.Random(0)
+        for size in (1, 2, 10, 100):
+            for _ in range(20):
+                pairs = [
+                    (rng.randrange(size), rng.randrange(size))
+                    for _ in range(rng.randrange(2 * size))
+                ]
+                expected = reference_labels(size, pairs)
+
+                together = DisjointSet(size)
+                together.union_all([a for a, _ in pairs], [b for _, b in pairs])
+                self.assertEqual(together.labels().tolist(), expected)
+                self.assertEqual(together.sets, max(expected) + 1)
+
+                one_at_a_time = DisjointSet(size)
+                for a, b in pairs:
+                    one_at_a_time.union(a, b)
+                self.assertEqual(one_at_a_time.labels().tolist(), expected)
+                self.assertEqual(one_at_a_time.sets, together.sets)
+
+    def test_union_after_union_all(self):
+        sets = DisjointSet(6)
+        sets.union_all([0, 2], [1, 3])
+
+        self.assertTrue(sets.union(5, 1))
+        self.assertFalse(sets.union(0, 5))
+        self.assertEqual(sets.sets, 3)
+        self.assertEqual(sets.labels().tolist(), [0, 0, 1, 1, 2, 0])
+
+
+class GridTest(unittest.TestCase):
+    def test_number_by_first(self):
+        values = np.array([7, 3, 7, 9, 3])
+        self.assertEqual(number_by_first(values).tolist(), [0, 1, 0, 2, 1])
+
+    def test_grid_pairs(self):
+        cells = np.array([[1, 1], [2, 1]])
+        a, b = grid_pairs(cells)
+
+        self.assertEqual(sorted(zip(a.tolist(), b.tolist())), [(0, 1), (1, 3)])
+
+    def test_label_grid(self):
+        cells = np.array(
+            [
+                [1, 1, 2, 2],
+                [3, 1, 3, 2],
+                [3, 3, 3, 1],
+            ]
+        )
+
+        self.assertEqual(
+            label_grid(cells).tolist(),
+            [
+                [0, 0, 1, 1],
+                [2, 0, 2, 1],
+                [2, 2, 2, 3],
+            ],
+        )
+
+    def test_label_grid_with_mask(self):
+        cells = np.zeros((2, 3), dtype=np.uint8)
+        mask = np.array([[True, False, True], [True, False, True]])
+
+        self.assertEqual(label_grid(cells, mask).tolist(), [[0, -1, 1], [0, -1, 1]])
+
+    def test_empty_grid(self):
+        self.assertEqual(label_grid(np.zeros((0, 3))).shape, (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
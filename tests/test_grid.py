@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from aoc.grid import Grid
+
+
+def map_text(text: bytes) -> Grid:
+    with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as file:
+        file.write(text)
+    try:
+        grid = Grid.map_file(file.name)
+        return Grid(grid.cells.copy())
+    finally:
+        os.unlink(file.name)
+
+
+class MapFileTest(unittest.TestCase):
+    def test_line_endings(self):
+        expected = Grid.from_text("ab\ncd\n")
+        for text in (b"ab\ncd\n", b"ab\ncd", b"ab\r\ncd\r\n", b"ab\r\ncd"):
+            with self.subTest(text=text):
+                self.assertEqual(map_text(text), expected)
+
+    def test_one_line(self):
+        self.assertEqual(map_text(b"abc").shape, (1, 3))
+        self.assertEqual(map_text(b"abc\n").shape, (1, 3))
+
+    def test_ragged(self):
+        for text in (
+            b"ab\ncd\ne\n",
+            b"ab\ncd\ne",
+            b"ab\ncd\nefg",
+            b"ab\ncd\nef\n\n",
+            b"ab\ncde\nf\n",
+            b"ab\r\ncd\n",
+        ):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    map_text(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from aoc.ints import MAX_DIGITS, parse_ints, read_ints
+
+
+class ParseIntsTest(unittest.TestCase):
+    def test_longest_that_fits(self):
+        largest = "9" * MAX_DIGITS
+        rows = parse_ints(f"{largest} -{largest}\n".encode())
+
+        self.assertEqual(rows.values.tolist(), [int(largest), -int(largest)])
+
+    def test_one_digit_too_many(self):
+        with self.assertRaises(ValueError):
+            parse_ints(("1" * (MAX_DIGITS + 1)).encode())
+
+    def test_mixed_lengths(self):
+        rows = parse_ints(b"p=0,4 v=3,-3\n10 200 3000: 7\n")
+
+        self.assertEqual(rows.values.tolist(), [0, 4, 3, -3, 10, 200, 3000, 7])
+        self.assertEqual(rows[0].tolist(), [0, 4, 3, -3])
+        self.assertEqual(rows[1].tolist(), [10, 200, 3000, 7])
+
+    def test_blank_lines_are_empty_rows(self):
+        rows = parse_ints(b"1 2\n\n3 4\nno numbers\n5")
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows.lengths.tolist(), [2, 0, 2, 0, 1])
+        self.assertEqual(rows.lists(), [[1, 2], [3, 4], [5]])
+
+    def test_empty_input(self):
+        rows = parse_ints(b"")
+
+        self.assertEqual(len(rows), 0)
+        self.assertEqual(rows.values.tolist(), [])
+        self.assertEqual(rows.lists(), [])
+
+    def test_table(self):
+        rows = parse_ints(b"1 2\n3 4\n\n5 6\n")
+
+        self.assertEqual(rows.table(2).tolist(), [[1, 2], [3, 4], [5, 6]])
+        with self.assertRaises(ValueError):
+            parse_ints(b"1 2\n3\n").table(2)
+
+
+class ReadIntsTest(unittest.TestCase):
+    def test_reads_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+            file.write("3   4\n4   3\n")
+        try:
+            self.assertEqual(read_ints(file.name).table(2).tolist(), [[3, 4], [4, 3]])
+        finally:
+            os.unlink(file.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import functools
+import unittest
+
+from aoc import memo
+from aoc.memo import memoize
+
+
+class ScopedTest(unittest.TestCase):
+    def test_cleared_after_outermost_scope(self):
+        @memoize(policy="scoped", name="test_memo.fib")
+        def fib(n: int) -> int:
+            return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+        with fib.scope():
+            self.assertEqual(fib(30), 832040)
+            self.assertEqual(fib.stats().size, 31)
+
+            # Nested scopes keep the cache until the outermost one ends
+            with fib.scope():
+                fib(10)
+            self.assertEqual(fib.stats().size, 31)
+
+        stats = fib.stats()
+        self.assertEqual(stats.size, 0)
+        self.assertEqual(stats.peak_size, 31)
+        self.assertEqual(stats.misses, 31)
+
+    def test_cleared_when_call_raises(self):
+        @memoize(policy="scoped", name="test_memo.fails")
+        def fails(n: int) -> int:
+            if n == 0:
+                raise ValueError("bottom")
+            return fails(n - 1)
+
+        with self.assertRaises(ValueError):
+            with fails.scope():
+                fails(5)
+        self.assertEqual(fails.stats().size, 0)
+
+    def test_recursion_calls_the_cache_directly(self):
+        @memoize(policy="scoped", name="test_memo.direct")
+        def count(n: int) -> int:
+            return 0 if n == 0 else count(n - 1) + 1
+
+        # The name the recursion looks up is functools' own wrapper
+        self.assertTrue(hasattr(count, "cache_info"))
+        with count.scope():
+            count(50)
+            self.assertEqual(count.cache_info().misses, 51)
+
+
+class PolicyTest(unittest.TestCase):
+    def test_lru_keeps_max_size(self):
+        @memoize(policy="lru", max_size=4, name="test_memo.lru")
+        def square(n: int) -> int:
+            return n * n
+
+        for n in range(10):
+            square(n)
+        square(9)
+
+        stats = square.stats()
+        self.assertEqual(stats.size, 4)
+        self.assertEqual(stats.hits, 1)
+        self.assertEqual(stats.misses, 10)
+
+    def test_unbounded_until_cleared(self):
+        @memoize(name="test_memo.unbounded")
+        def double(n: int) -> int:
+            return 2 * n
+
+        for n in range(100):
+            double(n)
+        self.assertEqual(double.stats().size, 100)
+
+        double.clear()
+        self.assertEqual(double.stats().size, 0)
+        self.assertEqual(double.stats().misses, 100)
+
+    def test_counts_survive_redecoration(self):
+        def outer(n: int) -> int:
+            @memoize(name="test_memo.inner")
+            def inner(k: int) -> int:
+                return k
+
+            inner(n)
+            inner(n)
+            return inner
+
+        before = memo.snapshot()
+        outer(1)
+        inner = outer(2)
+
+        stats = memo.changes(memo.snapshot(), before)["test_memo.inner"]
+        self.assertEqual((stats.hits, stats.misses), (2, 2))
+        self.assertIsInstance(inner, functools._lru_cache_wrapper)
+
+    def test_rejects_bad_policies(self):
+        with self.assertRaises(ValueError):
+            memoize(policy="forever")
+        with self.assertRaises(ValueError):
+            memoize(policy="lru")
+
+
+if __name__ == "__main__":
+    unittest.main()
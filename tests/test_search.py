@@ -0,0 +1,97 @@
+import unittest
+
+from aoc.search import IndexedHeap, SearchStats, a_star, bfs, dijkstra
+
+
+class IndexedHeapTest(unittest.TestCase):
+    def test_pops_in_priority_order(self):
+        heap = IndexedHeap()
+        for item, priority in [("c", 3), ("a", 1), ("d", 4), ("b", 2)]:
+            self.assertFalse(heap.push(item, priority))
+
+        self.assertEqual(
+            [heap.pop() for _ in range(len(heap))],
+            [("a", 1), ("b", 2), ("c", 3), ("d", 4)],
+        )
+
+    def test_decrease_key_moves_item_up(self):
+        heap = IndexedHeap()
+        for item, priority in [("a", 1), ("b", 5), ("c", 7), ("d", 9)]:
+            heap.push(item, priority)
+
+        self.assertTrue(heap.push("d", 0))
+        self.assertEqual(heap.priority("d"), 0)
+        self.assertEqual(len(heap), 4)
+        self.assertEqual(heap.pop(), ("d", 0))
+        self.assertEqual(heap.pop(), ("a", 1))
+
+    def test_higher_priority_is_ignored(self):
+        heap = IndexedHeap()
+        heap.push("a", 1)
+        heap.push("b", 2)
+
+        self.assertTrue(heap.push("a", 10))
+        self.assertEqual(heap.priority("a"), 1)
+        self.assertEqual(heap.pop(), ("a", 1))
+
+    def test_positions_follow_items(self):
+        heap = IndexedHeap()
+        for i in range(20):
+            heap.push(i, (i * 7) % 20)
+        for i in range(0, 20, 3):
+            heap.push(i, -i)
+
+        while heap:
+            for item, position in heap.positions.items():
+                self.assertEqual(heap.entries[position][1], item)
+            item, _ = heap.pop()
+            self.assertNotIn(item, heap)
+
+
+def line_neighbors(node: int):
+    # Nodes 0..9 in a line with a shortcut from 0 to 9 that costs more than walking
+    if node > 0:
+        yield (node - 1, 1)
+    if node < 9:
+        yield (node + 1, 1)
+    if node == 0:
+        yield (9, 20)
+
+
+class SearchTest(unittest.TestCase):
+    def test_dijkstra_finds_cheapest_path(self):
+        result = dijkstra(0, line_neighbors, goal=lambda node: node == 9)
+
+        self.assertTrue(result.found)
+        self.assertEqual(result.cost[9], 9)
+        self.assertEqual(result.path(), list(range(10)))
+
+    def test_dijkstra_counts_decrease_key(self):
+        stats = SearchStats()
+        dijkstra(0, line_neighbors, stats=stats)
+
+        # 9 is queued through the shortcut first, then lowered when walked to
+        self.assertEqual(stats.decreased, 1)
+        self.assertEqual(stats.popped, 10)
+
+    def test_a_star_with_heuristic(self):
+        result = a_star(
+            0,
+            line_neighbors,
+            goal=lambda node: node == 9,
+            heuristic=lambda node: 9 - node,
+        )
+
+        self.assertEqual(result.cost[result.goal], 9)
+
+    def test_bfs_without_goal_reaches_everything(self):
+        result = bfs(0, lambda node: [n for n in (node - 1, node + 1) if 0 <= n < 5])
+
+        self.assertFalse(result.found)
+        self.assertEqual(result.cost, {0: 0, 1: 1, 2: 2, 3: 3, 4: 4})
+        self.assertEqual(result.path(4), [0, 1, 2, 3, 4])
+        self.assertEqual(result.path(7), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
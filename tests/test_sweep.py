@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aoc import checkpoint
+from aoc.checkpoint import Checkpoint
+from aoc.sweep import sweep
+
+# Every way of splitting the candidates up that the results mustn't depend on
+SPLITS = [
+    {"workers": workers, "chunk_size": chunk_size}
+    for workers in (1, 2, 4)
+    for chunk_size in (None, 1, 3, 7)
+]
+
+CANDIDATES = range(200)
+
+
+def residue(n: int) -> int | None:
+    # Matches every multiple of 7 with its value mod 5, so several matches share
+    # the smallest key and min has to break the tie by index
+    return n % 5 if n and n % 7 == 0 else None
+
+
+class SweepTest(unittest.TestCase):
+    def test_first_does_not_depend_on_workers(self):
+        for split in SPLITS:
+            with self.subTest(**split):
+                self.assertEqual(sweep(CANDIDATES, residue, "first", **split), [(7, 2)])
+
+    def test_min_does_not_depend_on_workers(self):
+        # 35, 70, 105, ... all have a key of 0, and 35 comes first
+        for split in SPLITS:
+            with self.subTest(**split):
+                self.assertEqual(sweep(CANDIDATES, residue, "min", **split), [(35, 0)])
+
+    def test_min_with_key(self):
+        for split in SPLITS:
+            matches = sweep(CANDIDATES, residue, "min", key=lambda r: -r, **split)
+            with self.subTest(**split):
+                self.assertEqual(matches, [(14, 4)])
+
+    def test_all_in_candidate_order(self):
+        expected = [(n, n % 5) for n in range(7, 200, 7)]
+        for split in SPLITS:
+            with self.subTest(**split):
+                self.assertEqual(sweep(CANDIDATES, residue, "all", **split), expected)
+
+    def test_no_matches(self):
+        for split in SPLITS:
+            for reduce in ("first", "min", "all"):
+                with self.subTest(reduce=reduce, **split):
+                    self.assertEqual(sweep(range(7), residue, reduce, **split), [])
+
+    def test_lazy_candidates(self):
+        big = range(10**12, 10**15, 10**9)
+        matches = sweep(big, lambda n: n, "first", workers=2)
+        self.assertEqual(matches, [(0, 10**12)])
+
+    def test_unknown_reduction(self):
+        with self.assertRaises(ValueError):
+            sweep(CANDIDATES, residue, "max")
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patch = mock.patch.object(checkpoint, "CHECKPOINT_DIR", Path(tmp.name))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_resumes_after_saved_matches(self):
+        checked = []
+
+        def check(n: int):
+            checked.append(n)
+            return residue(n)
+
+        # As if a run had got through the first 100 candidates before stopping
+        saved = Checkpoint("test-sweep", on=True)
+        saved.save((100, [(7, 2), (14, 4)]))
+
+        matches = sweep(
+            CANDIDATES,
+            check,
+            "all",
+            workers=1,
+            checkpoint=Checkpoint("test-sweep", on=True),
+        )
+
+        self.assertEqual(min(checked), 100)
+        self.assertEqual(matches[:3], [(7, 2), (14, 4), (105, 0)])
+        self.assertFalse(saved.path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()